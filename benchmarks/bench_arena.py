@@ -0,0 +1,86 @@
+"""Memory per node of a formula corpus stored as ``Expr`` objects vs. a ``FormulaArena``.
+
+Generates a corpus of random LTL formulas over a small alphabet, builds it as
+plain ``Expr`` trees and as a ``FormulaArena`` (with and without its sharing
+index), and reports the memory allocated per node, alongside the time to
+compute the horizon of every formula with ``Expr.horizon`` and with one
+``FormulaArena.horizons`` pass.
+
+Run with ``python benchmarks/bench_arena.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+
+from logic_asts.arena import FormulaArena
+from logic_asts.base import And, Implies, Not, Or, Variable
+from logic_asts.ltl import Always, Eventually, Next, TimeInterval, Until
+from logic_asts.spec import Expr
+
+
+def random_formula(rng: random.Random, depth: int) -> Expr:
+    if depth == 0 or rng.random() < 0.15:
+        return Variable(f"p{rng.randrange(8)}")
+    op = rng.randrange(7)
+    if op == 0:
+        return Not(random_formula(rng, depth - 1))
+    if op == 1:
+        return And((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 2:
+        return Or((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 3:
+        return Implies(random_formula(rng, depth - 1), random_formula(rng, depth - 1))
+    if op == 4:
+        return Next(random_formula(rng, depth - 1), rng.randrange(1, 4))
+    interval = TimeInterval(0, rng.randrange(1, 10))
+    if op == 5:
+        cls = Always if rng.random() < 0.5 else Eventually
+        return cls(random_formula(rng, depth - 1), interval)
+    return Until(random_formula(rng, depth - 1), random_formula(rng, depth - 1), interval)
+
+
+def _corpus(n: int, seed: int = 0) -> list[Expr]:
+    rng = random.Random(seed)
+    return [random_formula(rng, 8) for _ in range(n)]
+
+
+def main() -> None:
+    print(f"{'formulas':>9} {'nodes':>9} {'Expr B/node':>12} {'arena B/node':>13} {'no index':>9} {'arrays':>7}")
+    for n in (1_000, 10_000, 30_000):
+        tracemalloc.start()
+        corpus = _corpus(n)
+        expr_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        nodes = sum(1 for expr in corpus for _ in expr.iter_subtree())
+
+        tracemalloc.start()
+        arena = FormulaArena()
+        roots = arena.extend(corpus)
+        with_index = tracemalloc.get_traced_memory()[0]
+        arena.drop_index()
+        without_index = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        print(
+            f"{n:>9} {nodes:>9} {expr_bytes / nodes:>12.1f} {with_index / nodes:>13.1f} "
+            f"{without_index / nodes:>9.1f} {arena.nbytes / nodes:>7.1f}"
+        )
+
+        t0 = time.perf_counter()
+        expected = [expr.horizon() for expr in corpus]
+        expr_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        all_horizons = arena.horizons()
+        got = [all_horizons[root] for root in roots]
+        arena_time = time.perf_counter() - t0
+        assert got == expected
+        print(
+            f"{'':>9} horizon: Expr {expr_time * 1e3:.0f} ms, arena.horizons() {arena_time * 1e3:.0f} ms ({len(arena)} distinct nodes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
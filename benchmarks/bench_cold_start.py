@@ -0,0 +1,63 @@
+"""Cold-start parser latency per grammar: compiled from source vs. pre-generated tables.
+
+Each measurement runs in a fresh interpreter so that nothing is cached, and
+times only obtaining the parser plus one parse (imports are excluded).
+
+Run with ``python benchmarks/bench_cold_start.py`` after ``just tables``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+
+from logic_asts.grammars import SupportedGrammars, _tables
+
+_CHILD = """
+import time
+from logic_asts.grammars import _tables
+t0 = time.perf_counter()
+parser = {load}
+parser.parse({sample!r})
+print(time.perf_counter() - t0)
+"""
+
+_SAMPLES = {
+    "base": "a & b",
+    "ltl": "G (a -> F b)",
+    "strel": "everywhere[0,1] a",
+    "stl_go": "in^[0,1]{E}_{c}[1,2] a",
+    "sere": "a ; b[*]",
+    "psl": "{a ; b}[]-> c",
+}
+
+
+def _time(load: str, sample: str, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(load=load, sample=sample)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        runs.append(float(out.stdout))
+    return statistics.median(runs)
+
+
+def main(repeat: int = 5) -> None:
+    print(f"{'grammar':<8} {'compile (ms)':>13} {'tables (ms)':>12} {'speedup':>8}")
+    for syntax in SupportedGrammars:
+        name = str(syntax.value)
+        if not _tables.tables_path(name).exists():
+            print(f"{name:<8} no pre-generated tables; run `just tables`")
+            continue
+        sample = _SAMPLES[name]
+        compiled = _time(f"_tables.compile_grammar({name!r})", sample, repeat)
+        loaded = _time(f"_tables.load_tables({name!r})", sample, repeat)
+        print(f"{name:<8} {compiled * 1e3:>13.1f} {loaded * 1e3:>12.1f} {compiled / loaded:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Time of evaluating a formula many times with ``compile_eval`` and with ``simple_eval``.
+
+``simple_eval`` traverses the formula and dispatches on every node at each
+call; the function generated by ``compile_eval`` evaluates it with native
+``and``/``or``/``not``, with shared subformulas bound to locals. Both are run
+on random propositional formulas over 16 atoms, for a batch of random
+assignments given as sets of true atoms, and the compiled function is also
+timed with assignments given as tuples of truth values. The one-off cost of
+compiling (on a cold cache) is reported separately.
+
+Run with ``python benchmarks/bench_compile_eval.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+
+from logic_asts.base import And, BaseExpr, Equiv, Implies, Not, Or, Variable, Xor, _compile_eval, compile_eval, simple_eval
+
+ATOMS = [f"p{i}" for i in range(16)]
+
+
+def random_formula(rng: random.Random, depth: int) -> BaseExpr[str]:
+    if depth == 0 or rng.random() < 0.1:
+        return Variable(rng.choice(ATOMS))
+    op = rng.randrange(6)
+    if op == 0:
+        return Not(random_formula(rng, depth - 1))
+    if op == 1:
+        return And((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 2:
+        return Or((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    binary = (Implies, Equiv, Xor)[op - 3]
+    return binary(random_formula(rng, depth - 1), random_formula(rng, depth - 1))
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rng = random.Random(0)
+    rows = [tuple(rng.random() < 0.5 for _ in ATOMS) for _ in range(2_000)]
+    worlds = [{atom for atom, bit in zip(ATOMS, row) if bit} for row in rows]
+    print(f"{'formula':<26} {'compile':>9} {'simple_eval':>12} {'compiled(set)':>14} {'compiled(tuple)':>16}")
+    for depth in (4, 6, 8, 10):
+        expr = random_formula(random.Random(depth), depth)
+        nodes = len(set(expr.iter_subtree()))
+        _compile_eval.cache_clear()
+        compile_time = _time(lambda: compile_eval(expr))  # noqa: B023
+        by_set, by_position = compile_eval(expr), compile_eval(expr, ATOMS)
+        simple_time = _time(lambda: [simple_eval(expr, world) for world in worlds])  # noqa: B023
+        set_time = _time(lambda: [by_set(world) for world in worlds])  # noqa: B023
+        tuple_time = _time(lambda: [by_position(row) for row in rows])  # noqa: B023
+        assert [by_set(w) for w in worlds] == [by_position(r) for r in rows] == [simple_eval(expr, w) for w in worlds]
+        print(
+            f"depth {depth:<2} ({nodes:>4} distinct)    {compile_time * 1e3:>7.2f}ms {simple_time * 1e3:>10.1f}ms"
+            f" {set_time * 1e3:>12.2f}ms {tuple_time * 1e3:>14.2f}ms"
+            f"   ({simple_time / set_time:.0f}x)"
+        )
+    print(f"\n(times for {len(rows)} assignments)")
+
+
+if __name__ == "__main__":
+    main()
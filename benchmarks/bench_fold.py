@@ -0,0 +1,130 @@
+"""Time of ``horizon``/``expand``/``to_nnf`` on formula trees and on shared formula DAGs.
+
+``horizon`` is computed with the memoized ``fold`` (once per distinct node) and
+with the previous per-occurrence recursion (reproduced below as
+``legacy_horizon``) on:
+
+- a corpus of random LTL trees, where there is little sharing and the two
+  should be on par;
+- ``G[0,t] G[0,t] G[0,t] p`` after ``expand``, whose bounded operators share
+  their operand ``t + 1`` times per level, so the tree grows as ``t**3``
+  while the DAG grows linearly;
+- a ladder where each level uses the previous one twice (``2**n`` paths).
+
+It also reports ``expand`` and ``to_nnf`` on the same inputs, and compares
+``fold(memo=True)`` with ``fold(memo=False)``.
+
+Run with ``python benchmarks/bench_fold.py``.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import time
+from collections.abc import Callable
+
+from logic_asts.base import And, Implies, Not, Or, Variable
+from logic_asts.ltl import Always, Eventually, Next, TimeInterval, Until
+from logic_asts.spec import Expr, fold
+
+
+def legacy_horizon(expr: Expr) -> int | float:
+    match expr:
+        case Variable():
+            return 0
+        case Not(arg):
+            return legacy_horizon(arg)
+        case And(args) | Or(args):
+            return max(legacy_horizon(arg) for arg in args)
+        case Implies(lhs, rhs):
+            return max(legacy_horizon(lhs), legacy_horizon(rhs))
+        case Next(arg, steps):
+            return (steps or 1) + legacy_horizon(arg)
+        case Always(arg, interval) | Eventually(arg, interval):
+            return (interval.end or math.inf) + legacy_horizon(arg)
+        case Until(lhs, rhs, interval):
+            end = interval.end or math.inf
+            return max(legacy_horizon(lhs) + end - 1, legacy_horizon(rhs) + end)
+        case _:
+            raise TypeError(type(expr).__name__)
+
+
+def random_formula(rng: random.Random, depth: int) -> Expr:
+    if depth == 0 or rng.random() < 0.15:
+        return Variable(f"p{rng.randrange(8)}")
+    op = rng.randrange(6)
+    if op == 0:
+        return Not(random_formula(rng, depth - 1))
+    if op == 1:
+        return And((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 2:
+        return Or((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 3:
+        return Next(random_formula(rng, depth - 1), rng.randrange(1, 4))
+    if op == 4:
+        return Always(random_formula(rng, depth - 1), TimeInterval(0, rng.randrange(1, 10)))
+    return Until(random_formula(rng, depth - 1), random_formula(rng, depth - 1), TimeInterval(0, rng.randrange(1, 10)))
+
+
+def nested_bounded(t: int, levels: int) -> Expr:
+    expr: Expr = Variable("p")
+    for _ in range(levels):
+        expr = Always(expr, TimeInterval(0, t))
+    return expr
+
+
+def ladder(levels: int) -> Expr:
+    expr: Expr = Variable("p")
+    for _ in range(levels):
+        expr = Implies(expr, Next(expr))
+    return expr
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _size(expr: Expr, *, memo: bool) -> int:
+    return fold(expr, lambda _, sizes: 1 + sum(sizes), memo=memo)
+
+
+def main() -> None:
+    rng = random.Random(0)
+    corpus = [random_formula(rng, 10) for _ in range(3_000)]
+    nodes = sum(_size(expr, memo=True) for expr in corpus)
+    fold_time = _time(lambda: [expr.horizon() for expr in corpus])
+    legacy_time = _time(lambda: [legacy_horizon(expr) for expr in corpus])
+    assert [expr.horizon() for expr in corpus] == [legacy_horizon(expr) for expr in corpus]
+    print(f"random trees ({len(corpus)} formulas, {nodes} nodes)")
+    print(f"  horizon: fold {fold_time * 1e3:.0f} ms, legacy {legacy_time * 1e3:.0f} ms")
+    print(f"  expand {_time(lambda: [e.expand() for e in corpus]) * 1e3:.0f} ms")
+    print(f"  to_nnf {_time(lambda: [e.to_nnf() for e in corpus]) * 1e3:.0f} ms")
+
+    print(f"\n{'input':<20} {'DAG nodes':>9} {'tree nodes':>12} {'fold':>9} {'legacy':>9} {'memo=False':>11}")
+    inputs = [(f"G[0,{t}]^3 expanded", nested_bounded(t, 3).expand()) for t in (8, 16, 32)]
+    inputs += [(f"ladder({n})", ladder(n)) for n in (12, 15, 18)]
+    for name, expr in inputs:
+        dag = len(set(map(id, expr.iter_subtree())))
+        tree = _size(expr, memo=True)
+        fold_time = _time(expr.horizon)
+        legacy_time = _time(lambda: legacy_horizon(expr))  # noqa: B023
+        tree_time = _time(lambda: _size(expr, memo=False))  # noqa: B023
+        print(
+            f"{name:<20} {dag:>9} {tree:>12} {fold_time * 1e3:>7.2f}ms {legacy_time * 1e3:>7.0f}ms {tree_time * 1e3:>9.0f}ms"
+        )
+
+    print()
+    for t in (8, 16, 32):
+        expr = nested_bounded(t, 3)
+        print(
+            f"G[0,{t}]^3: expand {_time(expr.expand) * 1e3:.1f} ms, "
+            f"to_nnf {_time(expr.to_nnf) * 1e3:.1f} ms, "
+            f"to_nnf(negate=True) {_time(lambda: expr.to_nnf(negate=True)) * 1e3:.1f} ms"  # noqa: B023
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Traversal time of deep formulas, which hash every node they visit.
+
+``iter_subtree``, ``atomic_predicates`` and ``simple_eval`` keep the visited
+nodes in sets and dicts. Without cached hashes every ``hash(node)`` walks the
+node's whole subtree, so traversing a formula of depth ``d`` costs
+``O(d^2)``; with them it is linear and the time per node stays flat.
+
+Each measurement builds a fresh formula, so no hash is cached up front.
+
+Run with ``python benchmarks/bench_hash_traversal.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+from logic_asts.base import And, BaseExpr, Not, Variable, simple_eval
+from logic_asts.spec import Expr
+
+# Deep enough to show the trend, shallow enough for the recursive first hash.
+DEPTHS = [25, 50, 100, 200]
+
+
+def chain(depth: int) -> BaseExpr[str]:
+    """``!(... !(!x0 & x1) & x2 ...) & x{depth}``: two levels per step."""
+    expr: BaseExpr[str] = Variable("x0")
+    for i in range(1, depth + 1):
+        expr = And((Not(expr), Variable(f"x{i}")))
+    return expr
+
+
+def _time(fn: Callable[[BaseExpr[str]], object], depth: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        expr = chain(depth)
+        t0 = time.perf_counter()
+        _ = fn(expr)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _count(expr: Expr) -> int:
+    return sum(1 for _ in expr.iter_subtree())
+
+
+CASES: dict[str, Callable[[BaseExpr[str]], object]] = {
+    "iter_subtree": _count,
+    "atomic_predicates": lambda e: list(e.atomic_predicates()),
+    "simple_eval": lambda e: simple_eval(e, {"x0", "x2"}),
+}
+
+
+def main() -> None:
+    print(f"{'case':<18} {'depth':>6} {'nodes':>6} {'time (ms)':>10} {'us/node':>8}")
+    for label, fn in CASES.items():
+        for depth in DEPTHS:
+            nodes = _count(chain(depth))
+            elapsed = _time(fn, depth)
+            print(f"{label:<18} {depth:>6} {nodes:>6} {elapsed * 1e3:>10.2f} {elapsed / nodes * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
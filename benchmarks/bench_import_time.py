@@ -0,0 +1,56 @@
+"""Cost of ``import logic_asts`` and of the first ``parse_expr`` call.
+
+Each measurement runs in a fresh interpreter under ``python -X importtime``;
+the reported figure is the median cumulative import time of the package.
+
+Run with ``python benchmarks/bench_import_time.py``.
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import time
+
+REPEATS = 7
+
+CASES = {
+    "import logic_asts": "import logic_asts",
+    "+ base usage": "import logic_asts\nfrom logic_asts.base import Variable, simple_eval\nsimple_eval(Variable('p'), {'p'})",
+    "import logic_asts.ltl": "import logic_asts.ltl",
+    "import logic_asts.grammars": "import logic_asts.grammars",
+}
+
+
+def _import_time_us(code: str) -> int:
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            # Top-level entries (no indentation) add up to the total import cost.
+            if not name.startswith("  "):
+                total += int(cumulative)
+    return total
+
+
+def _wall_time_s(code: str) -> float:
+    t0 = time.perf_counter()
+    _ = subprocess.run([sys.executable, "-c", code], check=True)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    baseline = statistics.median(_wall_time_s("pass") for _ in range(REPEATS))
+    print(f"{'case':<28} {'imports (ms)':>13}")
+    for label, code in CASES.items():
+        us = statistics.median(_import_time_us(code) for _ in range(REPEATS))
+        print(f"{label:<28} {us / 1e3:>13.1f}")
+    code = "import logic_asts\nlogic_asts.parse_expr('G (p -> F q)', syntax='ltl')"
+    wall = statistics.median(_wall_time_s(code) for _ in range(REPEATS))
+    print(f"{'first parse_expr (wall)':<28} {(wall - baseline) * 1e3:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Time of extending a trace with ``monitor.IncrementalEvaluator``, against re-evaluating it.
+
+``IncrementalEvaluator`` only re-evaluates each subformula from its first step
+that an extension of the trace can still change, so the time it takes to
+append a state to a bounded formula must not grow with the length of the
+trace, where calling ``ltl.evaluate`` on the whole trace again grows linearly.
+This is measured on ``G[0, 10] (req -> F[0, w] grant)`` for several widths
+``w``, by timing ``append`` and ``extend`` with batches of 100 states after
+``n`` states, and on the unbounded ``G (req -> F grant)``, whose unsettled
+steps all share one value, which is updated as a block.
+
+Run with ``python benchmarks/bench_incremental.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+import logic_asts
+from logic_asts.ltl import LTLExpr, evaluate
+from logic_asts.monitor import IncrementalEvaluator
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    total = 1_000_000
+    trace = {"req": rng.random(total) < 0.01, "grant": rng.random(total) < 0.02}
+    print(f"{'formula':<34} {'n':>9} {'append':>9} {'extend':>9} {'evaluate':>9}")
+    texts = [f"G[0, 10] (req -> F[0, {width}] grant)" for width in (10, 1000)] + ["G (req -> F grant)"]
+    for text in texts:
+        expr: LTLExpr[str] = logic_asts.parse_expr(text, syntax="ltl")
+        for n in (10_000, 100_000, 1_000_000 - 1000):
+            evaluator = IncrementalEvaluator(expr)
+            _ = evaluator.extend({atom: column[:n] for atom, column in trace.items()})
+            states = [{atom for atom, column in trace.items() if column[i]} for i in range(n, n + 100)]
+            t0 = time.perf_counter()
+            for state in states:
+                _ = evaluator.append(state)
+            append = (time.perf_counter() - t0) / 100
+            t0 = time.perf_counter()
+            for start in range(n + 100, n + 1000, 100):
+                _ = evaluator.extend({atom: column[start : start + 100] for atom, column in trace.items()})
+            extend = (time.perf_counter() - t0) / 9
+            assert (evaluator.values == evaluate(expr, {atom: column[: n + 1000] for atom, column in trace.items()})).all()
+            t0 = time.perf_counter()
+            _ = evaluate(expr, {atom: column[: n + 1000] for atom, column in trace.items()})
+            full = time.perf_counter() - t0
+            print(f"{text:<34} {n:>9} {append * 1e3:>7.3f}ms {extend * 1e3:>7.3f}ms {full * 1e3:>7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Latency and allocation of tree-then-transform vs. inline-transform parsing.
+
+Parses large LTL formulas (``n`` temporal clauses combined by a balanced tree
+of ``|``/``&``, so neither mode hits Python's recursion limit) both ways:
+building a ``lark.Tree`` and transforming it afterwards, and running the
+transformer as inline LALR callbacks. Reports median latency and the peak
+traced allocation of a single parse.
+
+Run with ``python benchmarks/bench_inline_transform.py``.
+"""
+
+from __future__ import annotations
+
+import timeit
+import tracemalloc
+from collections.abc import Callable
+
+from logic_asts.grammars import SupportedGrammars, get_parser
+
+
+def _formula(lo: int, hi: int, depth: int = 0) -> str:
+    if hi - lo == 1:
+        return f"G[0,{lo + 1}] (a{lo} -> X[!] (b{lo} U c{lo})) & !d{lo}"
+    mid = (lo + hi) // 2
+    op = "|" if depth % 2 == 0 else "&"
+    return f"({_formula(lo, mid, depth + 1)}) {op} ({_formula(mid, hi, depth + 1)})"
+
+
+def _peak_bytes(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        _ = func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    tree_parser = get_parser(SupportedGrammars.LTL)
+    inline_parser = get_parser(SupportedGrammars.LTL, inline_transform=True)
+    transformer = SupportedGrammars.LTL.get_transformer()
+
+    print(f"{'clauses':>8} {'tree (ms)':>10} {'inline (ms)':>12} {'tree peak (KiB)':>16} {'inline peak (KiB)':>18}")
+    for n in (10, 100, 1000, 10000):
+        text = _formula(0, n)
+
+        def tree(text: str = text) -> object:
+            return transformer.transform(tree_parser.parse(text))
+
+        def inline(text: str = text) -> object:
+            return inline_parser.parse(text)
+
+        assert tree() == inline()
+        number = max(1, 1000 // n)
+        t_tree = min(timeit.repeat(tree, number=number, repeat=5)) / number
+        t_inline = min(timeit.repeat(inline, number=number, repeat=5)) / number
+        print(
+            f"{n:>8} {t_tree * 1e3:>10.2f} {t_inline * 1e3:>12.2f}"
+            f" {_peak_bytes(tree) / 1024:>16.0f} {_peak_bytes(inline) / 1024:>18.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
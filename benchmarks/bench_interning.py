@@ -0,0 +1,60 @@
+"""Memory and comparison time of hash-consed (interned) formulas.
+
+Builds the explicit unrolling of ``G[0,N] (a -> F[0,K] b)`` over ``Next``
+operators, which repeats the same ``X^j b`` subformulas ``N`` times, with and
+without interning, and reports build time, the memory allocated by a second
+copy and the time to compare the two copies. (The sizes are kept small enough
+for the recursive ``==`` of plain nodes.)
+
+Run with ``python benchmarks/bench_interning.py``.
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+
+from logic_asts.base import And, Implies, Or, Variable
+from logic_asts.interning import interning
+from logic_asts.ltl import LTLExpr, Next
+from logic_asts.spec import Expr
+
+
+def _shift(expr: LTLExpr[str], steps: int) -> LTLExpr[str]:
+    for _ in range(steps):
+        expr = Next(expr)
+    return expr
+
+
+def unrolled(n: int, k: int) -> Expr:
+    a, b = Variable("a"), Variable("b")
+    eventually_b = Or(tuple(_shift(b, j) for j in range(k + 1)))
+    return And(tuple(_shift(Implies(a, eventually_b), t) for t in range(n + 1)))
+
+
+def _measure(n: int, k: int, interned: bool) -> tuple[float, float, float]:
+    with interning(interned):
+        t0 = time.perf_counter()
+        first = unrolled(n, k)
+        build = time.perf_counter() - t0
+        tracemalloc.start()
+        second = unrolled(n, k)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    t0 = time.perf_counter()
+    assert first == second
+    compare = time.perf_counter() - t0
+    return build, memory, compare
+
+
+def main() -> None:
+    print(f"{'N':>5} {'K':>4} {'mode':<9} {'build (ms)':>11} {'memory (KiB)':>13} {'== (ms)':>9}")
+    for n, k in [(50, 10), (150, 20), (300, 40)]:
+        for interned in (False, True):
+            build, memory, compare = _measure(n, k, interned)
+            mode = "interned" if interned else "plain"
+            print(f"{n:>5} {k:>4} {mode:<9} {build * 1e3:>11.1f} {memory / 1024:>13.0f} {compare * 1e3:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
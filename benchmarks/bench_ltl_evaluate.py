@@ -0,0 +1,61 @@
+"""Time of evaluating LTL formulas on long finite traces with ``ltl.evaluate``.
+
+``evaluate`` computes the satisfaction signal of every distinct subformula
+with a constant number of vectorized passes over the trace, so its time is
+linear in the trace length and does not depend on the width of the bounded
+operators. This is measured on ``G (req -> F[0, w] grant)`` for several
+trace lengths and widths ``w``, and compared with evaluating the same formula
+with ``F[0, w]`` written out as ``grant | X grant | X X grant | ...``, which
+has ``w + 1`` distinct subformulas.
+
+Run with ``python benchmarks/bench_ltl_evaluate.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from logic_asts.base import Implies, Or, Variable
+from logic_asts.ltl import Always, Eventually, LTLExpr, Next, TimeInterval, evaluate
+
+req, grant = Variable("req"), Variable("grant")
+
+
+def response(width: int) -> LTLExpr[str]:
+    return Always(Implies(req, Eventually(grant, TimeInterval(0, width))))
+
+
+def written_out(width: int) -> LTLExpr[str]:
+    disjuncts: list[LTLExpr[str]] = [grant]
+    for _ in range(width):
+        disjuncts.append(Next(disjuncts[-1]))
+    return Always(Implies(req, Or(tuple(disjuncts))))
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'steps':>9} {'width':>7} {'evaluate':>10} {'written out':>12}")
+    for n in (10_000, 100_000, 1_000_000):
+        trace = {"req": rng.random(n) < 0.01, "grant": rng.random(n) < 0.01}
+        for width in (10, 100, 1000, 100_000):
+            expr = response(width)
+            elapsed = _time(lambda: evaluate(expr, trace))  # noqa: B023
+            baseline = "-"
+            if width <= 100 or (width <= 1000 and n <= 100_000):
+                other = written_out(width)
+                baseline = f"{_time(lambda: evaluate(other, trace)) * 1e3:.1f}ms"  # noqa: B023
+                assert (evaluate(other, trace) == evaluate(expr, trace)).all()
+            print(f"{n:>9} {width:>7} {elapsed * 1e3:>8.1f}ms {baseline:>12}")
+
+
+if __name__ == "__main__":
+    main()
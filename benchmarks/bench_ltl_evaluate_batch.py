@@ -0,0 +1,58 @@
+"""Time of evaluating an LTL formula on many short traces with ``ltl.evaluate_batch``.
+
+``evaluate_batch`` evaluates every distinct subformula once over a
+``(traces, time)`` array, so its cost per step does not depend on how the
+steps are split into traces, while calling ``evaluate`` on each trace pays
+the Python overhead of a whole evaluation per trace. This is measured on
+``G (req -> X[!] F[0, 10] grant)`` for batches of traces of ragged lengths,
+given padded and concatenated.
+
+Run with ``python benchmarks/bench_ltl_evaluate_batch.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+import logic_asts
+from logic_asts.ltl import LTLExpr, evaluate, evaluate_batch
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    expr: LTLExpr[str] = logic_asts.parse_expr("G (req -> X[!] F[0, 10] grant)", syntax="ltl")
+    rng = np.random.default_rng(0)
+    print(f"{'traces':>7} {'length':>7} {'padded':>9} {'concat':>9} {'per trace':>10}")
+    for n_traces, length in ((100, 1000), (10_000, 100), (100_000, 10)):
+        lengths = rng.integers(length // 2, length + 1, size=n_traces)
+        total = int(lengths.sum())
+        flat = {"req": rng.random(total) < 0.05, "grant": rng.random(total) < 0.2}
+        ends = np.cumsum(lengths)
+        traces = [{atom: column[end - n : end] for atom, column in flat.items()} for n, end in zip(lengths, ends, strict=True)]
+        size = int(lengths.max())
+        padded = {atom: np.zeros((n_traces, size), dtype=bool) for atom in flat}
+        valid = np.arange(size) < lengths[:, np.newaxis]
+        for atom, column in flat.items():
+            padded[atom][valid] = column
+
+        expected = evaluate_batch(expr, flat, lengths=lengths)
+        assert (evaluate_batch(expr, padded, lengths=lengths) == expected).all()
+        assert (expected[valid] == np.concatenate([evaluate(expr, trace) for trace in traces])).all()
+        timings = (
+            _time(lambda: evaluate_batch(expr, padded, lengths=lengths)),  # noqa: B023
+            _time(lambda: evaluate_batch(expr, flat, lengths=lengths)),  # noqa: B023
+            _time(lambda: [evaluate(expr, trace) for trace in traces]),  # noqa: B023
+        )
+        print(f"{n_traces:>7} {length:>7}" + "".join(f" {t * 1e3:>7.1f}ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Time and memory of evaluating LTL formulas on long traces packed into bits, with ``ltl.evaluate_packed``.
+
+``evaluate_packed`` stores the value of each subformula as a Python integer
+with one bit per time step, where ``evaluate`` uses a NumPy boolean array
+with one byte per step. Boolean operators and ``X`` become word-wise
+operations and shifts, an unbounded ``U`` a single addition, and a bounded
+``F[a, b]``/``G[a, b]`` ``log2(b - a)`` shifted ORs/ANDs. This is measured
+against ``evaluate`` for several formulas and trace lengths; the packing and
+unpacking of the trace are included in the timings.
+
+Run with ``python benchmarks/bench_ltl_evaluate_packed.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+import logic_asts
+from logic_asts.ltl import LTLExpr, evaluate, evaluate_packed
+
+FORMULAS = (
+    "G (req -> X[!] grant)",
+    "(!req | X grant) & (X[2] req -> X[3] !grant)",
+    "G (req -> F[0, 10] grant)",
+    "G (req -> F[0, 1000] grant)",
+    "!grant U (req & !grant U grant)",
+    "G[0, 100] (req -> (req W grant))",
+)
+
+
+def _time(fn: Callable[[], object], repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    print(f"{'formula':<48} {'steps':>9} {'bool':>9} {'packed':>9} {'speedup':>8}")
+    for text in FORMULAS:
+        expr: LTLExpr[str] = logic_asts.parse_expr(text, syntax="ltl")
+        for n in (10_000, 1_000_000, 10_000_000):
+            trace = {"req": rng.random(n) < 0.05, "grant": rng.random(n) < 0.1}
+            assert (evaluate_packed(expr, trace) == evaluate(expr, trace)).all()
+            baseline = _time(lambda: evaluate(expr, trace))  # noqa: B023
+            packed = _time(lambda: evaluate_packed(expr, trace))  # noqa: B023
+            print(f"{text:<48} {n:>9} {baseline * 1e3:>7.2f}ms {packed * 1e3:>7.2f}ms {baseline / packed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time of monitoring LTL formulas by progression, with ``ltl.progress``.
+
+``progress`` memoizes the progression of every interned subformula through
+every state, so once the formula has been progressed through a state, doing
+it again is a dictionary lookup. This is measured by progressing several
+formulas through a trace of ``n`` random states over 4 atoms, first with an
+empty memo (``cold``), then through the same trace again (``warm``), against
+clearing the memo before every state (``uncached``), and against
+``evaluate`` on the whole trace.
+
+Run with ``python benchmarks/bench_ltl_progress.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+import logic_asts
+from logic_asts.ltl import LTLExpr, _progress, _progress_root, evaluate, progress
+
+FORMULAS = (
+    "G (req -> F grant)",
+    "G (req -> (busy U grant))",
+    "G (req -> F[0, 20] grant)",
+    "(req R !grant) & G (grant -> X[!] (!grant W req))",
+    "G (req -> (!grant U[2, 10] (grant & X idle)))",
+)
+
+
+def clear() -> None:
+    _progress_root.cache_clear()
+    _progress.cache_clear()
+
+
+def run(expr: LTLExpr[str], states: list[set[str]]) -> float:
+    t0 = time.perf_counter()
+    for state in states:
+        expr = progress(expr, state)
+    return time.perf_counter() - t0
+
+
+def run_uncached(expr: LTLExpr[str], states: list[set[str]]) -> float:
+    t0 = time.perf_counter()
+    for state in states:
+        clear()
+        expr = progress(expr, state)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    n = 100_000
+    atoms = ("req", "grant", "busy", "idle")
+    trace = {atom: rng.random(n) < 0.3 for atom in atoms}
+    states = [{atom for atom in atoms if trace[atom][i]} for i in range(n)]
+
+    print(f"{'formula':<52} {'cold':>9} {'warm':>9} {'uncached':>9} {'evaluate':>9}  (per state)")
+    for text in FORMULAS:
+        expr = logic_asts.parse_expr(text, syntax="ltl")
+        clear()
+        cold = run(expr, states)
+        warm = run(expr, states)
+        uncached = run_uncached(expr, states[:10_000]) / 10_000 * n
+        t0 = time.perf_counter()
+        _ = evaluate(expr, trace)
+        full = time.perf_counter() - t0
+        print(
+            f"{text:<52} {cold / n * 1e6:>7.2f}us {warm / n * 1e6:>7.2f}us {uncached / n * 1e6:>7.2f}us {full / n * 1e6:>7.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Latency of monitoring an LTL formula online with ``monitor.LTLMonitor``.
+
+The monitor only buffers the last ``horizon`` states of the stream, so the
+time it spends per state must not grow with the number of states seen. With
+a bounded formula, ``step`` updates every subformula incrementally (bounded
+windows with monotone deques), so it must not grow with the width of the
+windows either. This is measured on ``G[0, 10] (req -> F[0, w] grant)`` by timing ``step`` at
+several points of a long stream, and ``extend`` with batches of several sizes,
+for several widths ``w``.
+
+Run with ``python benchmarks/bench_monitor.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+import numpy as np
+
+from logic_asts.base import Implies, Variable
+from logic_asts.ltl import Always, Eventually, LTLExpr, TimeInterval
+from logic_asts.monitor import LTLMonitor
+
+req, grant = Variable("req"), Variable("grant")
+
+
+def response(width: int) -> LTLExpr[str]:
+    return Always(Implies(req, Eventually(grant, TimeInterval(0, width))), TimeInterval(0, 10))
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    n = 200_000
+    trace = {"req": rng.random(n) < 0.01, "grant": rng.random(n) < 0.01}
+    states = [{atom for atom, column in trace.items() if column[i]} for i in range(1000)]
+
+    print("step(): mean time per state after seeing k states")
+    print(f"{'width':>7} {'k=1e3':>9} {'k=1e4':>9} {'k=1e5':>9}")
+    for width in (10, 100, 1000):
+        monitor = LTLMonitor(response(width))
+        timings = []
+        seen = 0
+        for target in (1_000, 10_000, 100_000):
+            _ = monitor.extend({atom: column[seen:target] for atom, column in trace.items()})
+            seen = target
+            t0 = time.perf_counter()
+            for state in states:
+                _ = monitor.step(state)
+            timings.append((time.perf_counter() - t0) / len(states))
+            seen += len(states)
+        print(f"{width:>7}" + "".join(f" {t * 1e6:>7.0f}us" for t in timings))
+
+    print()
+    print("extend(): mean time per state, by batch size")
+    print(f"{'width':>7} {'1':>9} {'100':>9} {'10000':>9}")
+    for width in (10, 100, 1000):
+        timings = []
+        for batch in (1, 100, 10_000):
+            monitor = LTLMonitor(response(width))
+            # Past the first ``horizon`` states, which are only buffered.
+            stop = min(n, monitor.lookahead + 1000 * batch)
+            t0 = time.perf_counter()
+            for start in range(0, stop, batch):
+                _ = monitor.extend({atom: column[start : start + batch] for atom, column in trace.items()})
+            timings.append((time.perf_counter() - t0) / stop)
+        print(f"{width:>7}" + "".join(f" {t * 1e6:>7.2f}us" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
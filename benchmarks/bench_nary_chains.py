@@ -0,0 +1,32 @@
+"""Scaling of parsing long ``a1 & a2 & ... & aN`` / ``|`` chains.
+
+The grammars collect every operand of a chain in one rule, so building the
+flat ``And``/``Or`` is linear in ``N``. The ``us/operand`` column should stay
+roughly constant as ``N`` grows.
+
+Run with ``python benchmarks/bench_nary_chains.py``.
+"""
+
+from __future__ import annotations
+
+import time
+
+from logic_asts import parse_expr
+from logic_asts.base import And, Or
+
+
+def main() -> None:
+    print(f"{'syntax':<7} {'op':<3} {'operands':>9} {'parse (ms)':>11} {'us/operand':>11}")
+    for syntax in ("base", "ltl", "strel"):
+        for op, cls in (("&", And), ("|", Or)):
+            for n in (1_000, 10_000, 100_000):
+                text = f" {op} ".join(f"a{i}" for i in range(n))
+                t0 = time.perf_counter()
+                expr = parse_expr(text, syntax=syntax)
+                elapsed = time.perf_counter() - t0
+                assert isinstance(expr, cls) and len(expr.args) == n
+                print(f"{syntax:<7} {op:<3} {n:>9} {elapsed * 1e3:>11.1f} {elapsed / n * 1e6:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
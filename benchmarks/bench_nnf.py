@@ -0,0 +1,111 @@
+"""Time and output size of ``to_nnf``, with and without the extended NNF.
+
+``to_nnf`` converts each ``(subformula, polarity)`` pair that the result needs
+once and hash-conses the results. It is compared with the previous
+conversion, reproduced below as ``legacy_nnf``, which built the NNF of every
+distinct subformula *and* of its negation with a memoized ``fold``, on:
+
+- a corpus of random LTL trees;
+- ``X !X !X ... p``, where only one polarity of each node is needed;
+- nested biconditionals ``(...((x0 <-> x1) ^ x2) <-> ...)``, whose expansion
+  uses every operand twice, so the NNF tree doubles at every level while the
+  extended NNF (``extended=True``) keeps ``<->``/``^`` and stays linear.
+
+Output sizes are reported as distinct nodes (the DAG) and as tree nodes.
+
+Run with ``python benchmarks/bench_nnf.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+
+from logic_asts.base import And, Equiv, Not, Or, Variable, Xor
+from logic_asts.ltl import Always, Next, TimeInterval, Until
+from logic_asts.spec import Expr, fold
+
+
+def legacy_nnf(expr: Expr, *, negate: bool = False) -> Expr:
+    def pair(node: Expr, children: tuple[tuple[Expr, Expr], ...]) -> tuple[Expr, Expr]:
+        pos = tuple(child[0] for child in children)
+        neg = tuple(child[1] for child in children)
+        return node._nnf_node(pos, neg, negate=False), node._nnf_node(pos, neg, negate=True)
+
+    positive, negative = expr.expand().fold(pair)
+    return negative if negate else positive
+
+
+def random_formula(rng: random.Random, depth: int) -> Expr:
+    if depth == 0 or rng.random() < 0.15:
+        return Variable(f"p{rng.randrange(8)}")
+    op = rng.randrange(6)
+    if op == 0:
+        return Not(random_formula(rng, depth - 1))
+    if op == 1:
+        return And((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 2:
+        return Or((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 3:
+        return Next(random_formula(rng, depth - 1))
+    if op == 4:
+        return Always(random_formula(rng, depth - 1))
+    return Until(random_formula(rng, depth - 1), random_formula(rng, depth - 1), TimeInterval(0, rng.randrange(1, 4)))
+
+
+def next_chain(depth: int) -> Expr:
+    expr: Expr = Variable("p")
+    for _ in range(depth):
+        expr = Next(Not(expr))
+    return expr
+
+
+def nested_equiv(depth: int) -> Expr:
+    expr: Expr = Variable("x0")
+    for i in range(1, depth + 1):
+        expr = (Equiv if i % 2 else Xor)(expr, Variable(f"x{i}"))
+    return expr
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def _sizes(expr: Expr) -> tuple[int, int]:
+    return len({id(node) for node in expr.iter_subtree()}), fold(expr, lambda _, sizes: 1 + sum(sizes))
+
+
+def main() -> None:
+    rng = random.Random(0)
+    corpus = [random_formula(rng, 8) for _ in range(2_000)]
+    new_time = _time(lambda: [expr.to_nnf(negate=True) for expr in corpus])
+    legacy_time = _time(lambda: [legacy_nnf(expr, negate=True) for expr in corpus])
+    assert all(expr.to_nnf(negate=True) == legacy_nnf(expr, negate=True) for expr in corpus)
+    print(f"random trees ({len(corpus)} formulas): to_nnf {new_time * 1e3:.0f} ms, legacy {legacy_time * 1e3:.0f} ms")
+
+    for depth in (10_000, 100_000):
+        expr = next_chain(depth)
+        print(
+            f"X !X ... p ({depth} levels): to_nnf {_time(expr.to_nnf) * 1e3:.0f} ms, "
+            f"legacy {_time(lambda: legacy_nnf(expr)) * 1e3:.0f} ms"  # noqa: B023
+        )
+
+    print(f"\n{'nested <->/^':<16} {'to_nnf':>9} {'legacy':>9} {'DAG':>6} {'tree':>12} {'extended':>9} {'DAG':>6} {'tree':>6}")
+    for depth in (10, 20, 40):
+        expr = nested_equiv(depth)
+        new_time = _time(expr.to_nnf)
+        legacy_time = _time(lambda: legacy_nnf(expr))  # noqa: B023
+        ext_time = _time(lambda: expr.to_nnf(extended=True))  # noqa: B023
+        dag, tree = _sizes(expr.to_nnf())
+        ext_dag, ext_tree = _sizes(expr.to_nnf(extended=True))
+        print(
+            f"depth {depth:<10} {new_time * 1e3:>7.2f}ms {legacy_time * 1e3:>7.2f}ms {dag:>6} {tree:>12}"
+            f" {ext_time * 1e3:>7.2f}ms {ext_dag:>6} {ext_tree:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Throughput of ``parse_many`` against a ``parse_expr`` loop.
+
+Parses a synthetic corpus of LTL specifications in-process and with process
+pools of increasing size.
+
+Run with ``python benchmarks/bench_parse_many.py``.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+
+from logic_asts import parse_expr, parse_many
+
+N_LINES = 50_000
+
+
+def _corpus(n: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    templates = [
+        "G ({a} -> F[0,{k}] {b})",
+        "({a} U {b}) & X[!] !{c}",
+        "G[0,{k}] ({a} | {b}) -> F {c}",
+        "{a} & {b} & {c} W ({a} | {b})",
+    ]
+    return [
+        rng.choice(templates).format(
+            a=f"p{rng.randrange(50)}", b=f"q{rng.randrange(50)}", c=f"r{rng.randrange(50)}", k=rng.randrange(1, 20)
+        )
+        for _ in range(n)
+    ]
+
+
+def main() -> None:
+    corpus = _corpus(N_LINES)
+    _ = parse_expr(corpus[0], syntax="ltl")  # warm the parser cache
+
+    t0 = time.perf_counter()
+    for text in corpus:
+        _ = parse_expr(text, syntax="ltl")
+    baseline = time.perf_counter() - t0
+    print(f"{'parse_expr loop':<22} {baseline:8.2f}s  {N_LINES / baseline:10.0f} lines/s")
+
+    cpus = os.cpu_count() or 1
+    for workers in sorted({1, 2, 4, cpus}):
+        t0 = time.perf_counter()
+        n = sum(1 for r in parse_many(corpus, syntax="ltl", workers=workers, chunksize=512) if r.ok)
+        elapsed = time.perf_counter() - t0
+        assert n == N_LINES
+        label = f"parse_many workers={workers}"
+        print(f"{label:<22} {elapsed:8.2f}s  {N_LINES / elapsed:10.0f} lines/s  ({baseline / elapsed:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Time of ``simple_eval_batch`` against a loop of ``simple_eval`` calls.
+
+Both evaluate random propositional formulas over 16 atoms on every row of a
+random boolean matrix. ``simple_eval`` is called once per row, with the set of
+atoms that are true in it; ``simple_eval_batch`` evaluates each distinct
+subformula once per chunk of rows as a NumPy array operation. The batch
+version is also timed with a few chunk sizes, which bound the memory used by
+intermediate arrays.
+
+Run with ``python benchmarks/bench_simple_eval_batch.py``.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+
+import numpy as np
+
+from logic_asts.base import And, BaseExpr, Equiv, Implies, Not, Or, Variable, Xor, simple_eval, simple_eval_batch
+
+ATOMS = [f"p{i}" for i in range(16)]
+
+
+def random_formula(rng: random.Random, depth: int) -> BaseExpr[str]:
+    if depth == 0 or rng.random() < 0.1:
+        return Variable(rng.choice(ATOMS))
+    op = rng.randrange(6)
+    if op == 0:
+        return Not(random_formula(rng, depth - 1))
+    if op == 1:
+        return And((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    if op == 2:
+        return Or((random_formula(rng, depth - 1), random_formula(rng, depth - 1)))
+    binary = (Implies, Equiv, Xor)[op - 3]
+    return binary(random_formula(rng, depth - 1), random_formula(rng, depth - 1))
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rng = random.Random(0)
+    data = np.random.default_rng(0).random((1_000_000, len(ATOMS))) < 0.5
+    for depth in (4, 8):
+        expr = random_formula(rng, depth)
+        nodes = len(set(expr.iter_subtree()))
+        sample = data[:2_000]
+        worlds = [{atom for atom, bit in zip(ATOMS, row) if bit} for row in sample.tolist()]
+        loop_time = _time(lambda: [simple_eval(expr, world) for world in worlds])  # noqa: B023
+        batch_time = _time(lambda: simple_eval_batch(expr, sample, index=ATOMS))  # noqa: B023
+        assert simple_eval_batch(expr, sample, index=ATOMS).tolist() == [simple_eval(expr, w) for w in worlds]
+        print(f"depth {depth} ({nodes} distinct subformulas), {len(sample)} rows:")
+        print(f"  simple_eval loop {loop_time * 1e3:.0f} ms, simple_eval_batch {batch_time * 1e3:.1f} ms")
+        for chunk_size in (None, 1 << 18, 1 << 14):
+            elapsed = _time(lambda: simple_eval_batch(expr, data, index=ATOMS, chunk_size=chunk_size))  # noqa: B023
+            print(f"  {len(data)} rows, chunk_size={chunk_size}: {elapsed * 1e3:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Traversal time of ``iter_subtree`` and ``atomic_predicates`` on 10^6-node formulas.
+
+Compares the identity-based, linear-time traversals with the previous
+set-of-unvisited-children algorithm (reproduced below as ``legacy_*``) on:
+
+- a balanced ``And``/``Or`` tree with 2^19 distinct ``Variable`` leaves
+  (~10^6 nodes);
+- the same tree with leaves over only 64 names, so that it has many
+  equal-but-distinct subtrees (which the legacy algorithm, keyed by equality,
+  yields once);
+- a chain of 10^6 ``Next`` operators (the legacy algorithm is skipped: hashing
+  the chain recurses once per level).
+
+Run with ``python benchmarks/bench_traversal.py``.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+
+from logic_asts.base import And, Or, Variable
+from logic_asts.ltl import Next
+from logic_asts.spec import Expr
+
+
+def legacy_iter_subtree(expr: Expr) -> Iterator[Expr]:
+    stack: deque[Expr] = deque([expr])
+    visited: set[Expr] = set()
+    while stack:
+        subexpr = stack[-1]
+        unvisited_children = {child for child in subexpr.children() if child not in visited}
+        if not unvisited_children:
+            _ = stack.pop()
+            visited.add(subexpr)
+            yield subexpr
+        else:
+            stack.extend(unvisited_children)
+
+
+def balanced(levels: int, names: int) -> Expr:
+    layer: list[Expr] = [Variable(f"p{i % names}") for i in range(2**levels)]
+    ops = (And, Or)
+    depth = 0
+    while len(layer) > 1:
+        op = ops[depth % 2]
+        layer = [op((layer[i], layer[i + 1])) for i in range(0, len(layer), 2)]
+        depth += 1
+    return layer[0]
+
+
+def chain(length: int) -> Expr:
+    expr: Expr = Variable("p")
+    for _ in range(length):
+        expr = Next(expr)
+    return expr
+
+
+def _time(fn: Callable[[], object]) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main() -> None:
+    cases = [
+        ("balanced, 2^19 distinct leaves", balanced(19, 2**19), True),
+        ("balanced, 2^19 leaves over 64 names", balanced(19, 64), True),
+        ("Next chain 10^6", chain(10**6), False),
+    ]
+    for name, expr, run_legacy in cases:
+        print(name)
+        for order in ("post", "pre", "bfs"):
+            elapsed, count = _time(lambda: sum(1 for _ in expr.iter_subtree(order=order)))  # noqa: B023
+            print(f"  iter_subtree(order={order!r}): {elapsed * 1e3:8.0f} ms  ({count} nodes)")
+        elapsed, count = _time(lambda: sum(1 for _ in expr.atomic_predicates()))  # noqa: B023
+        print(f"  atomic_predicates():        {elapsed * 1e3:8.0f} ms  ({count} atoms)")
+        if run_legacy:
+            elapsed, count = _time(lambda: sum(1 for _ in legacy_iter_subtree(expr)))  # noqa: B023
+            print(f"  legacy iter_subtree:        {elapsed * 1e3:8.0f} ms  ({count} distinct-by-equality nodes)")
+
+
+if __name__ == "__main__":
+    main()
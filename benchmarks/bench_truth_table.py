@@ -0,0 +1,58 @@
+"""Time of counting the models of a propositional formula over ``k`` atoms.
+
+``count_models`` evaluates each distinct subformula once as a bitwise
+operation on ``2**k``-bit integers. It is compared with enumerating the
+``2**k`` assignments and evaluating each of them with ``compile_eval`` (and
+with ``simple_eval`` for small ``k``), on random 3-CNF formulas.
+
+Run with ``python benchmarks/bench_truth_table.py``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import random
+import time
+from collections.abc import Callable
+
+from logic_asts.base import And, BaseExpr, Not, Or, Variable, compile_eval, count_models, simple_eval
+
+
+def random_cnf(rng: random.Random, atoms: list[str], clauses: int) -> BaseExpr[str]:
+    def literal() -> BaseExpr[str]:
+        var = Variable(rng.choice(atoms))
+        return Not(var) if rng.random() < 0.5 else var
+
+    return And(tuple(Or((literal(), literal(), literal())) for _ in range(clauses)))
+
+
+def _time(fn: Callable[[], object]) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'atoms':>5} {'clauses':>8} {'models':>10} {'count_models':>13} {'compile_eval':>13} {'simple_eval':>12}")
+    for k in (8, 12, 16, 20, 24):
+        atoms = [f"x{i}" for i in range(k)]
+        expr = random_cnf(rng, atoms, 3 * k)
+        bits_time = _time(lambda: count_models(expr, atoms))  # noqa: B023
+        models = count_models(expr, atoms)
+        compiled_time = simple_time = float("nan")
+        if k <= 20:
+            fn = compile_eval(expr, atoms)
+            compiled_time = _time(lambda: sum(map(fn, itertools.product((False, True), repeat=k))))  # noqa: B023
+            assert sum(map(fn, itertools.product((False, True), repeat=k))) == models
+        if k <= 12:
+            worlds = [{atom for atom, bit in zip(atoms, row) if bit} for row in itertools.product((False, True), repeat=k)]
+            simple_time = _time(lambda: sum(simple_eval(expr, world) for world in worlds))  # noqa: B023
+        print(
+            f"{k:>5} {3 * k:>8} {models:>10} {bits_time * 1e3:>11.1f}ms"
+            f" {compiled_time * 1e3:>11.1f}ms {simple_time * 1e3:>10.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Hatch build hook that pre-generates the LALR tables for the bundled grammars.
+
+The tables are written next to the ``.lark`` sources as ``<grammar>.lalr`` and
+shipped in the wheel, so the first parse in a fresh process only deserializes
+them instead of compiling the grammar. See ``logic_asts/grammars/_tables.py``.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+from typing import Any
+
+from hatchling.builders.hooks.plugin.interface import BuildHookInterface
+
+GRAMMARS_DIR = Path(__file__).parent / "src" / "logic_asts" / "grammars"
+
+
+class LalrTablesBuildHook(BuildHookInterface):  # type: ignore[type-arg]
+    PLUGIN_NAME = "lalr-tables"
+
+    def initialize(self, version: str, build_data: dict[str, Any]) -> None:
+        # Load the helper by path: the package itself (and its runtime
+        # dependencies) is not importable inside the isolated build env.
+        spec = importlib.util.spec_from_file_location("_logic_asts_tables", GRAMMARS_DIR / "_tables.py")
+        assert spec is not None and spec.loader is not None
+        tables = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(tables)
+
+        names = sorted(p.stem for p in GRAMMARS_DIR.glob("*.lark"))
+        root = Path(self.root)
+        for path in tables.build_tables(names, GRAMMARS_DIR):
+            # The tables are git-ignored, so they must be force-included.
+            build_data["artifacts"].append(path.relative_to(root).as_posix())
@@ -5,18 +5,20 @@ propositional logic, LTL, STREL, and STL-GO.
 """
 
 # mypy: allow_untyped_calls
+from __future__ import annotations
+
+import importlib
 import typing
 from collections.abc import Hashable
 
-from lark import Lark, Transformer
 from typing_extensions import overload
 
+# Only the propositional core is imported eagerly. The other dialects, the
+# grammars (and with them ``lark``) and the parsing helpers are imported on
+# first use through the module ``__getattr__`` below, so that consumers that
+# only build and evaluate ASTs do not pay for them; ``parse_expr`` loads the
+# grammar machinery the first time it is called.
 import logic_asts.base as base
-import logic_asts.ltl as ltl
-import logic_asts.psl as psl
-import logic_asts.sere as sere
-import logic_asts.stl_go as stl_go
-import logic_asts.strel as strel
 from logic_asts.base import And as And
 from logic_asts.base import BoolExpr as BoolExpr
 from logic_asts.base import Equiv as Equiv
@@ -27,19 +29,96 @@ from logic_asts.base import Or as Or
 from logic_asts.base import Variable as Variable
 from logic_asts.base import Xor as Xor
 from logic_asts.base import bool_expr_iter as bool_expr_iter
-from logic_asts.grammars import SupportedGrammars
-from logic_asts.ltl import LTLExpr as LTLExpr
-from logic_asts.ltl import ltl_expr_iter as ltl_expr_iter
-from logic_asts.psl import PSLExpr as PSLExpr
-from logic_asts.psl import psl_expr_iter as psl_expr_iter
-from logic_asts.sere import SEREExpr as SEREExpr
-from logic_asts.sere import sere_expr_iter as sere_expr_iter
 from logic_asts.spec import Expr as Expr
 from logic_asts.spec import ExprVisitor as ExprVisitor
-from logic_asts.stl_go import STLGOExpr as STLGOExpr
-from logic_asts.stl_go import stlgo_expr_iter as stlgo_expr_iter
-from logic_asts.strel import STRELExpr as STRELExpr
-from logic_asts.strel import strel_expr_iter as strel_expr_iter
+from logic_asts.spec import fold as fold
+
+if typing.TYPE_CHECKING:
+    import logic_asts.arena as arena
+    import logic_asts.dfa as dfa
+    import logic_asts.interning as interning
+    import logic_asts.ltl as ltl
+    import logic_asts.monitor as monitor
+    import logic_asts.parsing as parsing
+    import logic_asts.psl as psl
+    import logic_asts.sere as sere
+    import logic_asts.stl_go as stl_go
+    import logic_asts.strel as strel
+    from logic_asts.grammars import SupportedGrammars as SupportedGrammars
+    from logic_asts.grammars import clear_parser_cache as clear_parser_cache
+    from logic_asts.grammars import get_parser as get_parser
+    from logic_asts.ltl import LTLExpr as LTLExpr
+    from logic_asts.ltl import ltl_expr_iter as ltl_expr_iter
+    from logic_asts.parsing import ParseCache as ParseCache
+    from logic_asts.parsing import ParseError as ParseError
+    from logic_asts.parsing import ParseResult as ParseResult
+    from logic_asts.parsing import disable_parse_cache as disable_parse_cache
+    from logic_asts.parsing import enable_parse_cache as enable_parse_cache
+    from logic_asts.parsing import get_parse_cache as get_parse_cache
+    from logic_asts.parsing import parse_many as parse_many
+    from logic_asts.psl import PSLExpr as PSLExpr
+    from logic_asts.psl import psl_expr_iter as psl_expr_iter
+    from logic_asts.sere import SEREExpr as SEREExpr
+    from logic_asts.sere import sere_expr_iter as sere_expr_iter
+    from logic_asts.stl_go import STLGOExpr as STLGOExpr
+    from logic_asts.stl_go import stlgo_expr_iter as stlgo_expr_iter
+    from logic_asts.strel import STRELExpr as STRELExpr
+    from logic_asts.strel import strel_expr_iter as strel_expr_iter
+
+# Public name -> (module, attribute), or (module, None) for the module itself.
+_LAZY_ATTRS: dict[str, tuple[str, str | None]] = {
+    "arena": ("logic_asts.arena", None),
+    "dfa": ("logic_asts.dfa", None),
+    "interning": ("logic_asts.interning", None),
+    "ltl": ("logic_asts.ltl", None),
+    "monitor": ("logic_asts.monitor", None),
+    "parsing": ("logic_asts.parsing", None),
+    "psl": ("logic_asts.psl", None),
+    "sere": ("logic_asts.sere", None),
+    "stl_go": ("logic_asts.stl_go", None),
+    "strel": ("logic_asts.strel", None),
+    "SupportedGrammars": ("logic_asts.grammars", "SupportedGrammars"),
+    "clear_parser_cache": ("logic_asts.grammars", "clear_parser_cache"),
+    "get_parser": ("logic_asts.grammars", "get_parser"),
+    "LTLExpr": ("logic_asts.ltl", "LTLExpr"),
+    "ltl_expr_iter": ("logic_asts.ltl", "ltl_expr_iter"),
+    "ParseCache": ("logic_asts.parsing", "ParseCache"),
+    "ParseError": ("logic_asts.parsing", "ParseError"),
+    "ParseResult": ("logic_asts.parsing", "ParseResult"),
+    "disable_parse_cache": ("logic_asts.parsing", "disable_parse_cache"),
+    "enable_parse_cache": ("logic_asts.parsing", "enable_parse_cache"),
+    "get_parse_cache": ("logic_asts.parsing", "get_parse_cache"),
+    "parse_many": ("logic_asts.parsing", "parse_many"),
+    "PSLExpr": ("logic_asts.psl", "PSLExpr"),
+    "psl_expr_iter": ("logic_asts.psl", "psl_expr_iter"),
+    "SEREExpr": ("logic_asts.sere", "SEREExpr"),
+    "sere_expr_iter": ("logic_asts.sere", "sere_expr_iter"),
+    "STLGOExpr": ("logic_asts.stl_go", "STLGOExpr"),
+    "stlgo_expr_iter": ("logic_asts.stl_go", "stlgo_expr_iter"),
+    "STRELExpr": ("logic_asts.strel", "STRELExpr"),
+    "strel_expr_iter": ("logic_asts.strel", "strel_expr_iter"),
+}
+
+
+# Hidden from type checkers, which see the ``TYPE_CHECKING`` imports above
+# and should still flag unknown attributes.
+if not typing.TYPE_CHECKING:
+
+    def __getattr__(name: str) -> object:
+        try:
+            module_name, attr = _LAZY_ATTRS[name]
+        except KeyError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+        module = importlib.import_module(module_name)
+        value = module if attr is None else getattr(module, attr)
+        # Cache it, so that ``__getattr__`` only runs on first access.
+        globals()[name] = value
+        return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 SupportedGrammarsStr: typing.TypeAlias = typing.Literal["base", "ltl", "strel", "stl_go", "sere", "psl"]
 
@@ -67,7 +146,9 @@ def is_ltl_expr(obj: object, var_type: type[_VarT] | None = None) -> typing.Type
     """
     if isinstance(obj, Expr):
         check_type = typing.get_origin(var_type) or var_type if var_type else None
-        return all(ltl.is_ltl_node(expr, check_type) for expr in obj.iter_subtree())
+        from logic_asts.ltl import is_ltl_node
+
+        return all(is_ltl_node(expr, check_type) for expr in obj.iter_subtree())
 
     return False
 
@@ -80,7 +161,9 @@ def is_strel_expr(obj: object, var_type: type[_VarT] | None = None) -> typing.Ty
     """
     if isinstance(obj, Expr):
         check_type = typing.get_origin(var_type) or var_type if var_type else None
-        return all(strel.is_strel_node(expr, check_type) for expr in obj.iter_subtree())
+        from logic_asts.strel import is_strel_node
+
+        return all(is_strel_node(expr, check_type) for expr in obj.iter_subtree())
     return False
 
 
@@ -92,7 +175,9 @@ def is_stl_go_expr(obj: object, var_type: type[_VarT] | None = None) -> typing.T
     """
     if isinstance(obj, Expr):
         check_type = typing.get_origin(var_type) or var_type if var_type else None
-        return all(stl_go.is_stlgo_node(expr, check_type) for expr in obj.iter_subtree())
+        from logic_asts.stl_go import is_stlgo_node
+
+        return all(is_stlgo_node(expr, check_type) for expr in obj.iter_subtree())
     return False
 
 
@@ -100,7 +185,9 @@ def is_sere_expr(obj: object, var_type: type[_VarT] | None = None) -> typing.Typ
     """Check that ``obj`` is a SERE-only expression tree."""
     if isinstance(obj, Expr):
         check_type = typing.get_origin(var_type) or var_type if var_type else None
-        return all(sere.is_sere_node(expr, check_type) for expr in obj.iter_subtree())
+        from logic_asts.sere import is_sere_node
+
+        return all(is_sere_node(expr, check_type) for expr in obj.iter_subtree())
     return False
 
 
@@ -108,7 +195,9 @@ def is_psl_expr(obj: object, var_type: type[_VarT] | None = None) -> typing.Type
     """Check that ``obj`` is a PSL-only expression tree (LTL + SERE + PSL bindings)."""
     if isinstance(obj, Expr):
         check_type = typing.get_origin(var_type) or var_type if var_type else None
-        return all(psl.is_psl_node(expr, check_type) for expr in obj.iter_subtree())
+        from logic_asts.psl import is_psl_node
+
+        return all(is_psl_node(expr, check_type) for expr in obj.iter_subtree())
     return False
 
 
@@ -163,28 +252,27 @@ def parse_expr(
 def parse_expr(
     expr: str,
     *,
-    syntax: SupportedGrammars | SupportedGrammarsStr = SupportedGrammars.BASE,
+    syntax: SupportedGrammars | SupportedGrammarsStr = "base",
 ) -> Expr:
     """Parse a logical expression string into an AST.
 
     For LTL expressions, uses Spot syntax with support for weak/strong
     operators (X, X[!], W, M) and bounded temporal operators.
-    """
-    syntax = SupportedGrammars(syntax)
 
-    # All grammars parse deterministically with the LALR parser, which is far
-    # more efficient than Earley.
-    grammar = Lark.open_from_package(
-        __name__,
-        f"{str(syntax.value)}.lark",
-        ["grammars"],
-        parser="lalr",
-    )
-    transformer = syntax.get_transformer()
-    assert isinstance(transformer, Transformer), f"{transformer=}"
+    Results are memoized if a parse cache was enabled with
+    :func:`enable_parse_cache`.
+    """
+    from logic_asts.grammars import _compiled
+    from logic_asts.parsing import get_parse_cache
 
-    parse_tree = grammar.parse(expr)
-    return transformer.transform(tree=parse_tree)
+    cache = get_parse_cache()
+    if cache is not None:
+        return cache.parse(expr, syntax=syntax)
+    # The compiled parser is cached per grammar, and runs the grammar's
+    # transformer as inline LALR callbacks so ``Expr`` nodes are built
+    # straight from the token stream; see :func:`logic_asts.grammars.get_parser`.
+    parser, _ = _compiled(syntax, inline=True)
+    return typing.cast(Expr, parser.parse(expr))
 
 
 __all__ = [
@@ -199,6 +287,9 @@ __all__ = [
     "Not",
     "Or",
     "PSLExpr",
+    "ParseCache",
+    "ParseError",
+    "ParseResult",
     "SEREExpr",
     "STLGOExpr",
     "STRELExpr",
@@ -206,13 +297,25 @@ __all__ = [
     "SupportedGrammarsStr",
     "Variable",
     "Xor",
+    "arena",
     "base",
     "bool_expr_iter",
+    "clear_parser_cache",
+    "dfa",
+    "disable_parse_cache",
+    "enable_parse_cache",
+    "fold",
+    "get_parse_cache",
+    "get_parser",
+    "interning",
     "is_psl_expr",
     "is_sere_expr",
     "ltl",
     "ltl_expr_iter",
+    "monitor",
+    "parsing",
     "parse_expr",
+    "parse_many",
     "psl",
     "psl_expr_iter",
     "sere",
@@ -0,0 +1,485 @@
+r"""Array-backed storage for large collections of formulas.
+
+A :class:`FormulaArena` stores formulas as a DAG in a handful of flat arrays
+instead of one Python object per node:
+
+- an opcode per node, indexing the arena's table of node classes;
+- a parameter id per node, indexing an interned table of the node's
+  non-child field values (intervals, step counts, bounds, ...), or, for
+  variables, an interned table of atom names;
+- child ids in CSR layout: the children of node ``n`` are
+  ``children[offsets[n]:offsets[n + 1]]``.
+
+Nodes are hash-consed: adding a formula reuses every node that is already in
+the arena, within and across formulas. A node's children always have smaller
+ids than the node itself, so sorting a set of node ids yields a post-order.
+
+Conversion to and from :class:`~logic_asts.spec.Expr` is lossless, and
+:meth:`~FormulaArena.iter_subtree`, :meth:`~FormulaArena.horizon`,
+:meth:`~FormulaArena.atomic_predicates` and :meth:`~FormulaArena.simple_eval`
+work directly on the arrays.
+
+Examples:
+    >>> from logic_asts import parse_expr
+    >>> arena = FormulaArena()
+    >>> f = arena.add(parse_expr("G[0,5] (a -> F[0,2] b)", syntax="ltl"))
+    >>> g = arena.add(parse_expr("(a -> F[0,2] b) & c", syntax="ltl"))
+    >>> len(arena)  # ``a -> F[0,2] b`` and its subformulas are stored once
+    7
+    >>> arena.horizon(f), arena.horizon(g)
+    (7, 2)
+    >>> sorted(arena.atom(n) for n in arena.atomic_predicates(g))
+    ['a', 'b', 'c']
+    >>> print(arena.to_expr(g))
+    ((a -> (F[0, 2] b)) & c)
+"""
+
+from __future__ import annotations
+
+import math
+import typing
+from array import array
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from collections.abc import Set as AbstractSet
+
+from attrs import frozen
+
+from logic_asts import ltl, psl, sere, stl_go, strel
+from logic_asts.base import And, Equiv, Implies, Literal, Not, Or, Variable, Xor
+from logic_asts.spec import Expr
+from logic_asts.utils import is_expr, node_fields, typed_key
+
+_CHILD = 0
+_CHILDREN = 1
+_PARAM = 2
+
+_Horizons = typing.TypeVar("_Horizons", dict[int, float], list[float])
+_HorizonRule: typing.TypeAlias = Callable[[tuple[object, ...], list[float]], float]
+
+
+@frozen
+class _Schema:
+    """How the fields of one node class map onto the arena arrays."""
+
+    cls: type[Expr]
+    fields: tuple[tuple[str, str, int], ...]
+    """``(attribute name, __init__ argument name, kind)`` of each field, in declaration order."""
+    param_names: tuple[str, ...]
+    n_single_children: int
+    """Number of ``_CHILD`` fields; a ``_CHILDREN`` field takes all remaining children."""
+
+
+def _schema_of(node: Expr) -> _Schema:
+    fields: list[tuple[str, str, int]] = []
+    for name, alias in node_fields(type(node)):
+        value = getattr(node, name)
+        if is_expr(value):
+            kind = _CHILD
+        elif type(value) is tuple and value and all(is_expr(v) for v in value):
+            kind = _CHILDREN
+        else:
+            kind = _PARAM
+        fields.append((name, alias, kind))
+    if sum(kind == _CHILDREN for _, _, kind in fields) > 1:
+        raise TypeError(f"{type(node).__name__} has more than one tuple of children")
+    return _Schema(
+        type(node),
+        tuple(fields),
+        tuple(name for name, _, kind in fields if kind == _PARAM),
+        sum(kind == _CHILD for _, _, kind in fields),
+    )
+
+
+# Horizon rules, mirroring the ``horizon`` methods of the node classes. Each
+# factory gets the class schema and returns ``rule(params, child_horizons)``.
+def _zero(_params: tuple[object, ...], _horizons: list[float]) -> float:
+    return 0
+
+
+def _infinite(_params: tuple[object, ...], _horizons: list[float]) -> float:
+    return math.inf
+
+
+def _max(_params: tuple[object, ...], horizons: list[float]) -> float:
+    return max(horizons)
+
+
+def _sum(_params: tuple[object, ...], horizons: list[float]) -> float:
+    return sum(horizons, start=0)
+
+
+def _interval_rule(schema: _Schema) -> _HorizonRule:
+    i = schema.param_names.index("interval")
+
+    def rule(params: tuple[object, ...], horizons: list[float]) -> float:
+        return (typing.cast(ltl.TimeInterval, params[i]).end or math.inf) + horizons[0]
+
+    return rule
+
+
+def _next_rule(schema: _Schema) -> _HorizonRule:
+    i = schema.param_names.index("steps")
+
+    def rule(params: tuple[object, ...], horizons: list[float]) -> float:
+        steps = typing.cast(int | None, params[i])
+        return (steps if steps is not None else 1) + horizons[0]
+
+    return rule
+
+
+def _until_rule(schema: _Schema) -> _HorizonRule:
+    i = schema.param_names.index("interval")
+
+    def rule(params: tuple[object, ...], horizons: list[float]) -> float:
+        end = typing.cast(ltl.TimeInterval, params[i]).end or math.inf
+        return max(horizons[0] + end - 1, horizons[1] + end)
+
+    return rule
+
+
+def _weak_until_rule(schema: _Schema) -> _HorizonRule:
+    i = schema.param_names.index("interval")
+
+    def rule(params: tuple[object, ...], horizons: list[float]) -> float:
+        end = typing.cast(ltl.TimeInterval, params[i]).end or math.inf
+        return max(horizons) + end
+
+    return rule
+
+
+def _repeat_rule(schema: _Schema) -> _HorizonRule:
+    i = schema.param_names.index("high")
+
+    def rule(params: tuple[object, ...], horizons: list[float]) -> float:
+        high = typing.cast(int | None, params[i])
+        return math.inf if high is None else high * horizons[0]
+
+    return rule
+
+
+def _const(rule: _HorizonRule) -> Callable[[_Schema], _HorizonRule]:
+    return lambda _schema: rule
+
+
+_HORIZON_RULES: dict[type[Expr], Callable[[_Schema], _HorizonRule]] = {
+    **dict.fromkeys([Variable, Literal, sere.Empty], _const(_zero)),
+    **dict.fromkeys(
+        [
+            And,
+            Or,
+            Not,
+            Implies,
+            Equiv,
+            Xor,
+            sere.Alt,
+            sere.Inter,
+            sere.NLMInter,
+            sere.FirstMatch,
+            strel.Reach,
+            strel.Escape,
+            strel.Everywhere,
+            strel.Somewhere,
+            stl_go.GraphIncoming,
+            stl_go.GraphOutgoing,
+            psl.WeakClosure,
+            psl.StrongClosure,
+        ],
+        _const(_max),
+    ),
+    **dict.fromkeys([sere.Concat, sere.Fusion, psl.SuffixImpliesUniv, psl.SuffixImpliesExist], _const(_sum)),
+    **dict.fromkeys([sere.Complement, sere.GotoRepeat, sere.EqualRepeat], _const(_infinite)),
+    **dict.fromkeys([ltl.Always, ltl.Eventually], _interval_rule),
+    **dict.fromkeys([ltl.Next, ltl.StrongNext], _next_rule),
+    **dict.fromkeys([ltl.Until, ltl.Release], _until_rule),
+    **dict.fromkeys([ltl.WeakUntil, ltl.StrongRelease], _weak_until_rule),
+    **dict.fromkeys([sere.Repeat, sere.FusionRepeat], _repeat_rule),
+}
+
+
+class FormulaArena:
+    """A struct-of-arrays store of formulas with structural sharing.
+
+    Formulas are added with :meth:`add` (or :meth:`extend`), which returns the
+    integer id of the formula's root node; all other methods take node ids.
+
+    Memory:
+        Each node costs an opcode (2 bytes), a parameter id (4 bytes), a CSR
+        offset (4 bytes) and 4 bytes per child, plus its share of the interned
+        parameter and atom tables. :attr:`nbytes` reports the array storage.
+        While formulas are being added the arena also keeps an index from node
+        structure to id, which is what finds shared nodes; :meth:`drop_index`
+        frees it once the arena is complete, and it is rebuilt on the next
+        :meth:`add`.
+    """
+
+    def __init__(self) -> None:
+        self._ops = array("H")
+        self._params = array("I")
+        self._offsets = array("I", [0])
+        self._children = array("I")
+        self._schemas: list[_Schema] = []
+        self._schema_ids: dict[type[Expr], int] = {}
+        self._horizon_rules: list[_HorizonRule | None] = []
+        self._atoms: list[Hashable] = []
+        self._atom_ids: dict[Hashable, int] = {}
+        self._param_values: list[tuple[object, ...]] = [()]
+        self._param_ids: dict[Hashable, int] = {typed_key(()): 0}
+        self._index: dict[tuple[int, ...], int] | None = {}
+
+    def __len__(self) -> int:
+        """Number of distinct nodes in the arena."""
+        return len(self._ops)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the node arrays."""
+        return sum(a.itemsize * len(a) for a in (self._ops, self._params, self._offsets, self._children))
+
+    def drop_index(self) -> None:
+        """Free the structure-to-id index used to share nodes while adding formulas."""
+        self._index = None
+
+    def _ensure_index(self) -> dict[tuple[int, ...], int]:
+        if self._index is None:
+            self._index = {
+                (self._ops[n], self._params[n], *self._children[self._offsets[n] : self._offsets[n + 1]]): n
+                for n in range(len(self))
+            }
+        return self._index
+
+    def _schema_id(self, node: Expr) -> int:
+        cls = type(node)
+        schema_id = self._schema_ids.get(cls)
+        if schema_id is None:
+            schema = _schema_of(node)
+            schema_id = len(self._schemas)
+            self._schemas.append(schema)
+            self._schema_ids[cls] = schema_id
+            factory = _HORIZON_RULES.get(cls)
+            self._horizon_rules.append(factory(schema) if factory is not None else None)
+        return schema_id
+
+    def _intern_param(self, values: tuple[object, ...]) -> int:
+        key = typed_key(values)
+        param_id = self._param_ids.get(key)
+        if param_id is None:
+            param_id = len(self._param_values)
+            self._param_values.append(values)
+            self._param_ids[key] = param_id
+        return param_id
+
+    def _intern_atom(self, name: Hashable) -> int:
+        key = typed_key(name)
+        atom_id = self._atom_ids.get(key)
+        if atom_id is None:
+            atom_id = len(self._atoms)
+            self._atoms.append(name)
+            self._atom_ids[key] = atom_id
+        return atom_id
+
+    def _add_node(self, node: Expr, ids: dict[int, int]) -> int:
+        schema_id = self._schema_id(node)
+        schema = self._schemas[schema_id]
+        kids: list[int] = []
+        values: list[object] = []
+        for name, _, kind in schema.fields:
+            value = getattr(node, name)
+            if kind == _CHILD:
+                kids.append(ids[id(value)])
+            elif kind == _CHILDREN:
+                kids.extend(ids[id(v)] for v in value)
+            else:
+                values.append(value)
+        param = self._intern_atom(values[0]) if schema.cls is Variable else self._intern_param(tuple(values))
+
+        index = self._ensure_index()
+        key = (schema_id, param, *kids)
+        existing = index.get(key)
+        if existing is not None:
+            return existing
+        node_id = len(self._ops)
+        self._ops.append(schema_id)
+        self._params.append(param)
+        self._children.extend(kids)
+        self._offsets.append(len(self._children))
+        index[key] = node_id
+        return node_id
+
+    def add(self, expr: Expr) -> int:
+        """Add ``expr`` to the arena, returning the id of its root node."""
+        ids: dict[int, int] = {}
+        stack: list[tuple[Expr, bool]] = [(expr, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if id(node) in ids:
+                continue
+            if children_done:
+                ids[id(node)] = self._add_node(node, ids)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children() if id(child) not in ids)
+        return ids[id(expr)]
+
+    def extend(self, exprs: Iterable[Expr]) -> list[int]:
+        """Add every formula in ``exprs``, returning their root ids in order."""
+        return [self.add(expr) for expr in exprs]
+
+    def kind(self, node: int) -> type[Expr]:
+        """The node class of ``node``."""
+        return self._schemas[self._ops[node]].cls
+
+    def children(self, node: int) -> tuple[int, ...]:
+        """Ids of the children of ``node``, in the order of :meth:`Expr.children`."""
+        return tuple(self._children[self._offsets[node] : self._offsets[node + 1]])
+
+    def atom(self, node: int) -> Hashable:
+        """The name of the variable ``node``."""
+        if self.kind(node) is not Variable:
+            raise TypeError(f"node {node} is a {self.kind(node).__name__}, not a Variable")
+        return self._atoms[self._params[node]]
+
+    def _param_tuple(self, node: int) -> tuple[object, ...]:
+        if self.kind(node) is Variable:
+            return (self._atoms[self._params[node]],)
+        return self._param_values[self._params[node]]
+
+    def to_expr(self, node: int) -> Expr:
+        """Rebuild the :class:`~logic_asts.spec.Expr` rooted at ``node``.
+
+        Shared nodes become shared objects.
+        """
+        built: dict[int, Expr] = {}
+        for n in self.iter_subtree(node):
+            schema = self._schemas[self._ops[n]]
+            kids = self.children(n)
+            params = iter(self._param_tuple(n))
+            kwargs: dict[str, object] = {}
+            k = 0
+            for _, alias, kind in schema.fields:
+                if kind == _CHILD:
+                    kwargs[alias] = built[kids[k]]
+                    k += 1
+                elif kind == _CHILDREN:
+                    count = len(kids) - schema.n_single_children
+                    kwargs[alias] = tuple(built[c] for c in kids[k : k + count])
+                    k += count
+                else:
+                    kwargs[alias] = next(params)
+            built[n] = schema.cls(**kwargs)
+        return built[node]
+
+    @typing.overload
+    def iter_subtree(self, node: int) -> Iterator[int]: ...
+
+    @typing.overload
+    def iter_subtree(self, node: int, *, kind: type[Expr]) -> Iterator[int]: ...
+
+    def iter_subtree(self, node: int, *, kind: type[Expr] | None = None) -> Iterator[int]:
+        """Iterate over the ids of the distinct nodes under ``node`` (inclusive), in post-order.
+
+        Args:
+            kind: Optional node class to filter by, as in :meth:`Expr.iter_subtree`.
+        """
+        offsets, children = self._offsets, self._children
+        seen = {node}
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            for c in children[offsets[n] : offsets[n + 1]]:
+                if c not in seen:
+                    seen.add(c)
+                    stack.append(c)
+        # Children always have smaller ids than their parents.
+        ordered = sorted(seen)
+        if kind is None:
+            return iter(ordered)
+        return (n for n in ordered if issubclass(self._schemas[self._ops[n]].cls, kind))
+
+    def horizon(self, node: int) -> int | float:
+        """The horizon of the formula rooted at ``node``, as :meth:`Expr.horizon`."""
+        return self._horizons(self.iter_subtree(node), {})[node]
+
+    def horizons(self) -> list[int | float]:
+        """The horizon of every node in the arena, indexed by node id.
+
+        A single pass over the arrays, which is much cheaper than calling
+        :meth:`horizon` on many roots that share subformulas.
+        """
+        horizons: list[float] = [0] * len(self)
+        _ = self._horizons(range(len(self)), horizons)
+        return horizons
+
+    def _horizons(self, order: Iterable[int], horizons: _Horizons) -> _Horizons:
+        ops, params, offsets, children = self._ops, self._params, self._offsets, self._children
+        rules, param_values = self._horizon_rules, self._param_values
+        var_op = self._schema_ids.get(Variable)
+        for n in order:
+            op = ops[n]
+            if op == var_op:
+                horizons[n] = 0
+                continue
+            rule = rules[op]
+            if rule is None:
+                # A node class this module has no rule for.
+                horizons[n] = self.to_expr(n).horizon()
+            else:
+                kids = children[offsets[n] : offsets[n + 1]]
+                horizons[n] = rule(param_values[params[n]], [horizons[c] for c in kids])
+        return horizons
+
+    def atomic_predicates(self, node: int, *, assume_nnf: bool = False) -> Iterator[int]:
+        """Ids of the variables under ``node``, as :meth:`Expr.atomic_predicates`.
+
+        With ``assume_nnf``, negated variables ``Not(Variable(...))`` are yielded
+        as atoms (and not looked into).
+        """
+        offsets, children, ops = self._offsets, self._children, self._ops
+        var_op = self._schema_ids.get(Variable)
+        not_op = self._schema_ids.get(Not)
+        # Pre-order, so atoms come in left-to-right order of first occurrence.
+        atoms: list[int] = []
+        seen: set[int] = set()
+        stack = [node]
+        while stack:
+            n = stack.pop()
+            if n in seen:
+                continue
+            seen.add(n)
+            if ops[n] == var_op:
+                atoms.append(n)
+                continue
+            if assume_nnf and ops[n] == not_op and ops[children[offsets[n]]] == var_op:
+                atoms.append(n)
+                continue
+            stack.extend(c for c in reversed(children[offsets[n] : offsets[n + 1]]) if c not in seen)
+        return iter(atoms)
+
+    def simple_eval(self, node: int, input: AbstractSet[Hashable]) -> bool:
+        """Evaluate the propositional formula rooted at ``node``, as :func:`logic_asts.base.simple_eval`."""
+        values: dict[int, bool] = {}
+        offsets, children = self._offsets, self._children
+        for n in self.iter_subtree(node):
+            cls = self._schemas[self._ops[n]].cls
+            kids = children[offsets[n] : offsets[n + 1]]
+            if cls is Variable:
+                values[n] = self._atoms[self._params[n]] in input
+            elif cls is Literal:
+                values[n] = typing.cast(bool, self._param_values[self._params[n]][0])
+            elif cls is Not:
+                values[n] = not values[kids[0]]
+            elif cls is And:
+                values[n] = all(values[c] for c in kids)
+            elif cls is Or:
+                values[n] = any(values[c] for c in kids)
+            elif cls is Xor:
+                values[n] = values[kids[0]] != values[kids[1]]
+            elif cls is Equiv:
+                values[n] = values[kids[0]] == values[kids[1]]
+            elif cls is Implies:
+                values[n] = (not values[kids[0]]) or values[kids[1]]
+            else:
+                raise TypeError(f"simple evaluation only possible for propositional logic expressions, got {cls}")
+        return values[node]
+
+
+__all__ = ["FormulaArena"]
@@ -0,0 +1,323 @@
+r"""Deterministic finite automata for LTL formulas on finite traces (LTLf).
+
+A :class:`DFA` reads a finite trace one state at a time, and accepts it if the
+formula holds at its first step, as in :func:`logic_asts.ltl.evaluate`. Its
+states are built on the fly by formula progression
+(:func:`logic_asts.ltl.progress`): a state is the formula the rest of the trace
+must satisfy, together with whether the trace read so far already satisfies
+the formula, and the target of a transition is computed the first time it is
+taken, then cached. Once the states and transitions a trace needs are built,
+reading it takes constant time per state, whatever the size of the formula.
+
+The letters of the automaton are the valuations of the atoms of the formula,
+but each state only reads the atoms that its formula needs at the current
+step: transitions are cached by the valuation of those atoms only, and
+:meth:`DFA.edges` labels them with Boolean formulas over those atoms instead
+of listing letters.
+
+Examples:
+    >>> from logic_asts import parse_expr
+    >>> dfa = DFA(parse_expr("G (req -> F grant)", syntax="ltl"))
+    >>> dfa.accepts([{"req"}, set(), {"grant"}]), dfa.accepts([{"req"}, set()])
+    (True, False)
+    >>> dfa.explore()
+    3
+    >>> for label, target in dfa.edges(dfa.initial):
+    ...     print(label, "->", target, dfa.formula(target), dfa.is_accepting(target))
+    (req & !grant) -> 1 ((F grant) & (G (req -> (F grant)))) False
+    (!req | grant) -> 2 (G (req -> (F grant))) True
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Hashable, Iterable
+from collections.abc import Set as AbstractSet
+from typing import Any
+
+from logic_asts.base import And, BoolExpr, Literal, Not, Or, Variable
+from logic_asts.ltl import (
+    Always,
+    Eventually,
+    LTLExpr,
+    Next,
+    Release,
+    StrongNext,
+    StrongRelease,
+    Until,
+    WeakUntil,
+    is_ltl_node,
+    ltl_expr_iter,
+    progress,
+)
+from logic_asts.utils import nary_fold
+
+
+def _current_atoms[Var: Hashable](expr: LTLExpr[Var]) -> set[Var]:
+    """The atoms that the progression of ``expr`` through a state reads: those not only under ``X`` or delayed windows."""
+    atoms: set[Var] = set()
+    stack: list[LTLExpr[Var]] = [expr]
+    seen: set[int] = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        match node:
+            case Variable(name):
+                atoms.add(name)
+            case Next() | StrongNext():
+                pass
+            case Eventually(interval=interval) | Always(interval=interval) if interval.start:
+                pass
+            case (
+                Until(lhs, _, interval)
+                | WeakUntil(lhs, _, interval)
+                | Release(lhs, _, interval)
+                | StrongRelease(lhs, _, interval)
+            ) if interval.start:
+                stack.append(lhs)
+            case _:
+                stack.extend(node.children())  # type: ignore[arg-type]
+    return atoms
+
+
+class DFA[Var: Hashable]:
+    r"""A deterministic finite automaton accepting the finite traces that satisfy an LTL formula, built on the fly.
+
+    States are numbered from :attr:`initial` (``0``) in the order they are
+    built. State ``q`` stands for the formula :meth:`formula` ``(q)`` that the
+    rest of the trace must satisfy, and :meth:`is_accepting` ``(q)`` for
+    whether the trace read so far satisfies the formula (the empty trace does
+    not). Transitions are built by :meth:`step` and :meth:`run` as traces take
+    them, or all at once by :meth:`explore`, which may take time exponential in
+    the size of the formula.
+
+    A transition is only keyed by the atoms that the formula of its source
+    state reads at the current step, given by :meth:`letter` as a bit mask in
+    the order of :attr:`atoms`: ``q`` has at most ``2**k`` transitions for
+    ``k`` such atoms, whatever the other atoms of the formula, and
+    :meth:`transitions` holds the ones built so far.
+
+    DFAs can be pickled, with the states and transitions built so far, and
+    keep building new ones once unpickled. Building transitions is
+    thread-safe.
+
+    Type Parameters:
+        Var: The variable type used in the expression.
+
+    Arguments:
+        expr: The LTL formula.
+
+    Raises:
+        TypeError: If the expression contains operators not in LTL.
+
+    Examples:
+        >>> from logic_asts import parse_expr
+        >>> dfa = DFA(parse_expr("a U[0, 2] b", syntax="ltl"))
+        >>> dfa.atoms
+        ('a', 'b')
+        >>> q = dfa.step(dfa.initial, {"a"})
+        >>> print(dfa.formula(q))
+        (a U[0, 1] b)
+        >>> dfa.is_accepting(q), dfa.is_accepting(dfa.run([{"a"}, {"b"}], q)), len(dfa)
+        (False, True, 4)
+        >>> dfa.transitions()
+        {(0, 1): 1, (1, 1): 2, (2, 2): 3}
+        >>> for label, target in dfa.edges(2):
+        ...     print(label, "->", dfa.formula(target))
+        b -> 1
+        !b -> 0
+    """
+
+    def __init__(self, expr: LTLExpr[Var]) -> None:
+        if not is_ltl_node(expr):
+            raise TypeError(f"LTLf automata only possible for LTL expressions, got {type(expr)}")
+        self.expr: LTLExpr[Var] = expr
+        atoms: dict[Var, None] = {}
+        node: LTLExpr[Var]
+        for node in ltl_expr_iter(expr):
+            if isinstance(node, Variable):
+                atoms[node.name] = None
+        self.atoms: tuple[Var, ...] = tuple(atoms)
+        self._bits = {atom: 1 << position for position, atom in enumerate(self.atoms)}
+        self._ids: dict[tuple[LTLExpr[Var], bool], int] = {}
+        self._formulas: list[LTLExpr[Var]] = []
+        self._accepting: list[bool] = []
+        # Per state: the bits of the atoms its formula reads, and its transitions by their values.
+        self._masks: list[int] = []
+        self._delta: list[dict[int, int]] = []
+        self._lock = threading.Lock()
+        self.initial = self._state(expr, False)
+
+    def __len__(self) -> int:
+        """The number of states built so far."""
+        return len(self._formulas)
+
+    def formula(self, q: int) -> LTLExpr[Var]:
+        """The formula that the rest of the trace must satisfy in state ``q``: a :class:`Literal` once decided."""
+        return self._formulas[q]
+
+    def is_accepting(self, q: int) -> bool:
+        """Whether the traces that end in state ``q`` satisfy the formula."""
+        return self._accepting[q]
+
+    def letter(self, state: AbstractSet[Var]) -> int:
+        """The letter of a state of the trace, given as the set of atoms that hold in it."""
+        bits = self._bits
+        letter = 0
+        for atom in state:
+            letter |= bits.get(atom, 0)
+        return letter
+
+    def transition(self, q: int, letter: int) -> int:
+        """The target of the transition from ``q`` on ``letter``, built if needed."""
+        letter &= self._masks[q]
+        target = self._delta[q].get(letter)
+        if target is None:
+            target = self._build(q, letter)
+        return target
+
+    def step(self, q: int, state: AbstractSet[Var]) -> int:
+        """The state reached from ``q`` by reading one state of the trace, given as the set of atoms that hold in it."""
+        return self.transition(q, self.letter(state))
+
+    def run(self, trace: Iterable[AbstractSet[Var]], q: int | None = None) -> int:
+        """The state reached by reading ``trace``, a sequence of sets of atoms that hold, from ``q`` (by default, :attr:`initial`)."""
+        bits, masks, delta = self._bits, self._masks, self._delta
+        q = self.initial if q is None else q
+        for state in trace:
+            letter = 0
+            for atom in state:
+                letter |= bits.get(atom, 0)
+            letter &= masks[q]
+            target = delta[q].get(letter)
+            q = self._build(q, letter) if target is None else target
+        return q
+
+    def accepts(self, trace: Iterable[AbstractSet[Var]]) -> bool:
+        """Whether the formula holds on ``trace``, a sequence of sets of atoms that hold."""
+        return self._accepting[self.run(trace)]
+
+    def explore(self) -> int:
+        """Build every state reachable from :attr:`initial`, and every transition between them.
+
+        Returns:
+            The number of states.
+        """
+        q = 0
+        while q < len(self):
+            mask = self._masks[q]
+            # Every sub-mask of ``mask``: the values of the atoms ``q`` reads.
+            letter = mask
+            while True:
+                _ = self.transition(q, letter)
+                if letter == 0:
+                    break
+                letter = (letter - 1) & mask
+            q += 1
+        return len(self)
+
+    def edges(self, q: int) -> list[tuple[BoolExpr[Var], int]]:
+        """The transitions out of ``q``, built if needed, as ``(label, target)`` pairs in order of target.
+
+        The label of a transition is a Boolean formula over the atoms that
+        ``q`` reads, which holds for exactly the states of the trace that
+        take it.
+        """
+        mask = self._masks[q]
+        letters: dict[int, list[int]] = {}
+        letter = mask
+        while True:
+            letters.setdefault(self.transition(q, letter), []).append(letter)
+            if letter == 0:
+                break
+            letter = (letter - 1) & mask
+        positions = tuple(position for position in range(len(self.atoms)) if mask >> position & 1)
+        return [(self._label(set(group), positions), target) for target, group in sorted(letters.items())]
+
+    def transitions(self) -> dict[tuple[int, int], int]:
+        """The transitions built so far, as a table from ``(state, letter)`` to the target state.
+
+        Letters only keep the atoms that their source state reads: the
+        transition from ``q`` on :meth:`letter` ``(state)`` is keyed by
+        ``letter(state) & m``, with ``m`` the bit mask of those atoms.
+        """
+        return {(q, letter): target for q, delta in enumerate(self._delta) for letter, target in delta.items()}
+
+    def _label(self, letters: set[int], positions: tuple[int, ...]) -> BoolExpr[Var]:
+        """A formula over the atoms at ``positions`` that holds for exactly ``letters`` (Shannon expansion)."""
+        if not letters:
+            return Literal(False)
+        if len(letters) == 1 << len(positions):
+            return Literal(True)
+        position, rest = positions[0], positions[1:]
+        bit = 1 << position
+        atom = Variable(self.atoms[position])
+        high = self._label({letter ^ bit for letter in letters if letter & bit}, rest)
+        low = self._label({letter for letter in letters if not letter & bit}, rest)
+        match high, low:
+            case _ if high == low:
+                return high
+            case Literal(True), Literal(False):
+                return atom
+            case Literal(False), Literal(True):
+                return Not(atom)
+            case _, Literal(False):
+                return nary_fold(And, [atom, high])
+            case Literal(False), _:
+                return nary_fold(And, [Not(atom), low])
+            case _, Literal(True):
+                return nary_fold(Or, [Not(atom), high])
+            case Literal(True), _:
+                return nary_fold(Or, [atom, low])
+            case _:
+                return Or((nary_fold(And, [atom, high]), nary_fold(And, [Not(atom), low])))
+
+    def _state(self, formula: LTLExpr[Var], accepting: bool) -> int:
+        q = self._ids.get((formula, accepting))
+        if q is None:
+            q = self._ids[(formula, accepting)] = len(self._formulas)
+            self._formulas.append(formula)
+            self._accepting.append(accepting)
+            mask = 0
+            for atom in _current_atoms(formula):
+                mask |= self._bits[atom]
+            self._masks.append(mask)
+            self._delta.append({})
+        return q
+
+    def _build(self, q: int, letter: int) -> int:
+        """Build the transition from ``q`` on ``letter``, already masked."""
+        state = frozenset(atom for atom, bit in self._bits.items() if letter & bit)
+        formula = self._formulas[q]
+        rest = progress(formula, state)
+        accepting = progress(formula, state, last=True) == Literal(True)
+        with self._lock:
+            target = self._delta[q].get(letter)
+            if target is None:
+                target = self._delta[q][letter] = self._state(rest, accepting)
+        return target
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "expr": self.expr,
+            "atoms": self.atoms,
+            "states": list(zip(self._formulas, self._accepting)),
+            "delta": self._delta,
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.expr = state["expr"]
+        self.atoms = state["atoms"]
+        self._bits = {atom: 1 << position for position, atom in enumerate(self.atoms)}
+        self._ids = {}
+        self._formulas, self._accepting, self._masks, self._delta = [], [], [], []
+        self._lock = threading.Lock()
+        for formula, accepting in state["states"]:
+            _ = self._state(formula, accepting)
+        self._delta = state["delta"]
+        self.initial = 0
+
+
+__all__ = ["DFA"]
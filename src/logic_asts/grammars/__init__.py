@@ -3,13 +3,16 @@
 from __future__ import annotations
 
 import enum
+import threading
 import typing
 from pathlib import Path
 
-from lark import Token, Transformer, v_args
+from lark import Lark, Token, Transformer, Tree, v_args
+from lark.exceptions import VisitError
 from lark.visitors import merge_transformers
 
 from logic_asts.base import And, BoolExpr, Equiv, Implies, Literal, Not, Or, Variable, Xor
+from logic_asts.grammars import _tables
 from logic_asts.ltl import (
     Always,
     Eventually,
@@ -81,13 +84,15 @@ class MaybeStrongInterval(typing.NamedTuple):
 @typing.final
 @v_args(inline=True)
 class BaseTransform(Transformer[Token, BoolExpr[str]]):
-    def mul(self, lhs: BoolExpr[str], rhs: BoolExpr[str]) -> BoolExpr[str]:
-        # ``&`` is a pure constructor now; flatten at construction via nary_fold
-        # so ``a & b & c`` stays a flat n-ary And.
-        return typing.cast(BoolExpr[str], nary_fold(And, (lhs, rhs)))
+    @v_args(inline=False)
+    def mul(self, args: list[BoolExpr[str]]) -> BoolExpr[str]:
+        # The grammar hands over the whole ``a & b & c`` chain at once; fold it
+        # in one pass (nary_fold also flattens parenthesized nested Ands).
+        return typing.cast(BoolExpr[str], nary_fold(And, args))
 
-    def add(self, lhs: BoolExpr[str], rhs: BoolExpr[str]) -> BoolExpr[str]:
-        return typing.cast(BoolExpr[str], nary_fold(Or, (lhs, rhs)))
+    @v_args(inline=False)
+    def add(self, args: list[BoolExpr[str]]) -> BoolExpr[str]:
+        return typing.cast(BoolExpr[str], nary_fold(Or, args))
 
     def neg(self, arg: BoolExpr[str]) -> BoolExpr[str]:
         return Not(arg)
@@ -141,8 +146,9 @@ class LtlTransform(Transformer[Token, LTLExpr[str]]):
     def start(self, expr: LTLExpr[str]) -> LTLExpr[str]:
         return expr
 
-    def mul(self, lhs: LTLExpr[str], rhs: LTLExpr[str]) -> LTLExpr[str]:
-        return typing.cast(LTLExpr[str], nary_fold(And, (lhs, rhs)))
+    @v_args(inline=False)
+    def mul(self, args: list[LTLExpr[str]]) -> LTLExpr[str]:
+        return typing.cast(LTLExpr[str], nary_fold(And, args))
 
     def until(self, lhs: LTLExpr[str], interval: TimeInterval | None, rhs: LTLExpr[str]) -> LTLExpr[str]:
         interval = interval or TimeInterval()
@@ -326,8 +332,9 @@ class StrelTransform(Transformer[Token, STRELExpr[str]]):
     def start(self, expr: STRELExpr[str]) -> STRELExpr[str]:
         return expr
 
-    def mul(self, lhs: STRELExpr[str], rhs: STRELExpr[str]) -> STRELExpr[str]:
-        return typing.cast(STRELExpr[str], nary_fold(And, (lhs, rhs)))
+    @v_args(inline=False)
+    def mul(self, args: list[STRELExpr[str]]) -> STRELExpr[str]:
+        return typing.cast(STRELExpr[str], nary_fold(And, args))
 
     def reach(
         self, lhs: STRELExpr[str], dist_fn: str | None, interval: DistanceInterval, rhs: STRELExpr[str]
@@ -361,9 +368,8 @@ class StlGoTransform(Transformer[Token, STLGOExpr[str]]):
     def start(self, expr: STLGOExpr[str]) -> STLGOExpr[str]:
         return expr
 
-    @v_args(inline=True)
-    def mul(self, lhs: STLGOExpr[str], rhs: STLGOExpr[str]) -> STLGOExpr[str]:
-        return typing.cast(STLGOExpr[str], nary_fold(And, (lhs, rhs)))
+    def mul(self, args: list[STLGOExpr[str]]) -> STLGOExpr[str]:
+        return typing.cast(STLGOExpr[str], nary_fold(And, args))
 
     @v_args(inline=True)
     def graph_incoming(
@@ -576,3 +582,125 @@ class SupportedGrammars(enum.Enum):
                 )
             case _:
                 raise ValueError(f"Unsupported grammar reference: {syntax}")
+
+
+class _InlineTransformer:
+    """Adapter that lets a :class:`~lark.Transformer` run as inline LALR callbacks.
+
+    Passing a transformer to ``Lark(..., transformer=...)`` makes the LALR
+    parser call the rule methods on each reduction, building ``Expr`` nodes
+    straight from the token stream with no intermediate :class:`~lark.Tree`.
+    Two details differ from :meth:`Transformer.transform` and are patched here:
+
+    - Lark registers terminal methods (``INT``, ``IDENTIFIER``, ...) as lexer
+      callbacks, which must return a :class:`~lark.Token`. Ours return ``int``,
+      ``Variable`` and so on, so terminal methods are hidden from Lark and
+      applied to the token children right before the rule callback runs.
+    - Exceptions raised by a rule are wrapped in :class:`~lark.exceptions.VisitError`
+      (a ``LarkError``), exactly as the tree-walking transformer does.
+    """
+
+    def __init__(self, transformer: Transformer[Token, Expr]) -> None:
+        self._transformer = transformer
+        self._token_funcs: dict[str, typing.Callable[[Token], object] | None] = {}
+
+    def _convert(self, child: object) -> object:
+        if not isinstance(child, Token):
+            return child
+        try:
+            func = self._token_funcs[child.type]
+        except KeyError:
+            func = self._token_funcs[child.type] = getattr(self._transformer, child.type, None)
+        if func is None:
+            return child
+        try:
+            return func(child)
+        except Exception as e:
+            raise VisitError(child.type, child, e) from e
+
+    def __getattr__(self, name: str) -> typing.Callable[[list[object]], object]:
+        if name.startswith("_") or name.rpartition("__")[2].isupper():
+            # Terminals are upper-case (possibly namespaced, e.g. ``base__INT``).
+            raise AttributeError(name)
+        # A missing rule method raises AttributeError here, and Lark then builds
+        # a Tree for that rule, mirroring ``Transformer.__default__``.
+        func = getattr(self._transformer, name)
+        wrapper = getattr(func, "visit_wrapper", None)
+        convert = self._convert
+
+        def callback(children: list[object]) -> object:
+            children = [convert(c) for c in children]
+            try:
+                if wrapper is not None:
+                    return wrapper(func, name, children, None)
+                return func(children)
+            except Exception as e:
+                raise VisitError(name, Tree(name, children), e) from e
+
+        return callback
+
+
+_PARSER_CACHE: dict[tuple[SupportedGrammars, bool], tuple[Lark, Transformer[Token, Expr]]] = {}
+_PARSER_CACHE_LOCK = threading.Lock()
+
+
+def _compiled(syntax: SupportedGrammars | str, inline: bool = False) -> tuple[Lark, Transformer[Token, Expr]]:
+    """Return the cached ``(parser, transformer)`` pair for ``syntax``, building it on first use.
+
+    With ``inline=True`` the parser runs the transformer as LALR callbacks, so
+    ``parser.parse`` already returns the ``Expr``.
+    """
+    key = (SupportedGrammars(syntax), inline)
+    # Fast path: a plain dict lookup is atomic, so readers never take the lock.
+    entry = _PARSER_CACHE.get(key)
+    if entry is not None:
+        return entry
+    with _PARSER_CACHE_LOCK:
+        # Double-checked: another thread may have built it while we waited.
+        entry = _PARSER_CACHE.get(key)
+        if entry is None:
+            name = str(key[0].value)
+            transformer = key[0].get_transformer()
+            callbacks = _InlineTransformer(transformer) if inline else None
+            # Prefer the tables pre-generated at package-build time; they are
+            # rejected if they don't match the current ``.lark`` sources.
+            parser = _tables.load_tables(name, transformer=callbacks) or _tables.compile_grammar(name, transformer=callbacks)
+            entry = (parser, transformer)
+            _PARSER_CACHE[key] = entry
+    return entry
+
+
+def get_parser(syntax: SupportedGrammars | str, *, inline_transform: bool = False) -> Lark:
+    """Return the compiled LALR parser for ``syntax``.
+
+    Parsers are built lazily on first request and then shared process-wide,
+    so the grammar loading and LALR table construction is paid once per
+    grammar rather than once per :func:`logic_asts.parse_expr` call. The
+    registry is thread-safe.
+
+    When the package ships pre-generated LALR tables (``<grammar>.lalr``,
+    written at build time by ``hatch_build.py``) and they match the ``.lark``
+    sources, the parser is deserialized from them instead of compiled.
+
+    Args:
+        syntax: The grammar to parse.
+        inline_transform: When False (default), ``parse`` returns a
+            :class:`lark.Tree`. When True, the grammar's transformer runs as
+            inline LALR callbacks and ``parse`` returns the ``Expr`` directly.
+
+    >>> get_parser("ltl") is get_parser(SupportedGrammars.LTL)
+    True
+    >>> print(get_parser("ltl", inline_transform=True).parse("G p"))
+    (G p)
+    """
+    return _compiled(syntax, inline_transform)[0]
+
+
+def clear_parser_cache() -> None:
+    """Drop every cached parser and transformer.
+
+    Subsequent calls to :func:`get_parser` (or :func:`logic_asts.parse_expr`)
+    rebuild them from the ``.lark`` sources. Mostly useful for tests.
+    """
+    with _PARSER_CACHE_LOCK:
+        _PARSER_CACHE.clear()
@@ -0,0 +1,107 @@
+"""Pre-generated LALR tables for the bundled grammars.
+
+Compiling a ``.lark`` grammar (loading imports, building the LALR automaton and
+the contextual lexer) dominates the first :func:`logic_asts.parse_expr` call in
+a fresh process. This module serializes the compiled parsers with
+:meth:`lark.Lark.save` into ``<grammar>.lalr`` files next to the sources, and
+loads them back in a few milliseconds.
+
+Every table file starts with a digest line covering all ``.lark`` sources and
+the installed lark version. A table whose digest no longer matches is ignored
+(and the caller falls back to compiling), so edited grammars or a lark upgrade
+can never load a stale parser.
+
+Note:
+    This module deliberately depends only on the standard library and ``lark``:
+    the build hook in ``hatch_build.py`` loads it by path to generate the tables
+    at package-build time, before ``logic_asts`` itself is importable.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from collections.abc import Iterable
+from pathlib import Path
+
+import lark
+from lark import Lark
+
+GRAMMARS_DIR = Path(__file__).parent
+TABLES_SUFFIX = ".lalr"
+
+
+@functools.cache
+def sources_digest(grammars_dir: Path = GRAMMARS_DIR) -> str:
+    """Digest of every ``.lark`` file in ``grammars_dir`` and the lark version.
+
+    All sources are hashed (not only the ones a grammar imports) because the
+    grammars import each other; it is cheap and never under-invalidates.
+    """
+    h = hashlib.sha256()
+    h.update(lark.__version__.encode())
+    for path in sorted(grammars_dir.glob("*.lark")):
+        h.update(b"\0" + path.name.encode() + b"\0")
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+def compile_grammar(name: str, grammars_dir: Path = GRAMMARS_DIR, transformer: object = None) -> Lark:
+    """Compile ``<name>.lark`` from source with the options used by the parser registry.
+
+    ``transformer``, when given, is run as inline LALR callbacks.
+    """
+    # All grammars parse deterministically with the LALR parser, which is far
+    # more efficient than Earley.
+    return Lark.open(str(grammars_dir / f"{name}.lark"), parser="lalr", transformer=transformer)
+
+
+def tables_path(name: str, directory: Path = GRAMMARS_DIR) -> Path:
+    return directory / f"{name}{TABLES_SUFFIX}"
+
+
+def build_tables(
+    names: Iterable[str],
+    grammars_dir: Path = GRAMMARS_DIR,
+    dest: Path | None = None,
+) -> list[Path]:
+    """Compile each grammar in ``names`` and write its serialized tables to ``dest``.
+
+    ``dest`` defaults to ``grammars_dir``. Returns the written paths.
+    """
+    dest = grammars_dir if dest is None else dest
+    digest = sources_digest(grammars_dir)
+    written: list[Path] = []
+    for name in names:
+        parser = compile_grammar(name, grammars_dir)
+        path = tables_path(name, dest)
+        with path.open("wb") as f:
+            _ = f.write(digest.encode() + b"\n")
+            parser.save(f)
+        written.append(path)
+    return written
+
+
+def load_tables(
+    name: str,
+    grammars_dir: Path = GRAMMARS_DIR,
+    directory: Path | None = None,
+    transformer: object = None,
+) -> Lark | None:
+    """Load the pre-generated parser for ``name``, or ``None`` if absent, stale or unreadable.
+
+    ``transformer``, when given, is run as inline LALR callbacks.
+    """
+    path = tables_path(name, grammars_dir if directory is None else directory)
+    try:
+        with path.open("rb") as f:
+            if f.readline().rstrip(b"\n") != sources_digest(grammars_dir).encode():
+                return None
+            # ``Lark.load`` takes no options; ``_load`` is what it (and lark's
+            # own cache) calls, and it accepts the load-time ``transformer``.
+            # It is private, so anything it raises on a table it cannot read
+            # (not only unpickling errors) means compiling from source.
+            return Lark.__new__(Lark)._load(f, transformer=transformer)
+    except Exception:
+        # Missing, truncated or malformed tables just mean we compile from source.
+        return None
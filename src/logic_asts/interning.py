@@ -0,0 +1,170 @@
+"""Opt-in hash-consing (interning) of expression nodes.
+
+Structurally equal subformulas are normally separate objects. While interning
+is enabled, constructing any node (``And``, ``Not``, ``Variable``, ``Next``,
+``Until``, ``Concat``, ...) instead returns the canonical instance for its
+structure from a process-wide unique table, so that:
+
+- equal formulas built while interning are the *same* object, and ``is``
+  is a constant-time equality test;
+- repeated subformulas, e.g. in expanded bounded temporal operators, share
+  memory instead of being copied.
+
+The table only holds weak references: a canonical node lives exactly as long
+as something else refers to it.
+
+Examples:
+    >>> from logic_asts.base import Variable
+    >>> with interning():
+    ...     a = Variable("p") & ~Variable("q")
+    ...     b = Variable("p") & ~Variable("q")
+    >>> a is b
+    True
+    >>> Variable("p") is Variable("p")
+    False
+
+Nodes built before interning was enabled are not canonical; :func:`intern`
+returns the canonical version of such a tree.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+import weakref
+from collections.abc import Hashable, Iterator
+from typing import TypeVar
+
+from logic_asts.spec import Expr, _ExprMeta
+from logic_asts.utils import ATOMIC_TYPES, is_expr, node_fields, typed_key
+
+_E = TypeVar("_E", bound=Expr)
+
+# Shallow key -> canonical node. A key identifies a node by its class, the
+# identities of its (canonical) children and its other field values, so that
+# looking a node up never hashes or compares whole subtrees.
+_UNIQUE: weakref.WeakValueDictionary[Hashable, Expr] = weakref.WeakValueDictionary()
+_LOCK = threading.Lock()
+
+
+def _key(node: Expr) -> Hashable:
+    parts: list[Hashable] = [type(node)]
+    for name, _ in node_fields(type(node)):
+        value = getattr(node, name)
+        # ``is_expr`` inlined: this runs for every node constructed while interning.
+        if isinstance(type(value), _ExprMeta):
+            parts.append(id(value))
+        elif type(value) is tuple and any(is_expr(v) for v in value):
+            parts.append(tuple(id(v) if is_expr(v) else typed_key(v) for v in value))
+        elif type(value) in ATOMIC_TYPES:
+            parts.append((type(value), value))
+        else:
+            parts.append(typed_key(value))
+    return tuple(parts)
+
+
+def _is_canonical(node: Expr) -> bool:
+    return _UNIQUE.get(_key(node)) is node
+
+
+def _intern_shallow(node: Expr, canonical: dict[int, Expr]) -> Expr:
+    """Return the canonical node for ``node``, whose children are mapped by ``canonical`` (by ``id``)."""
+    changes: dict[str, object] = {}
+    for name, alias in node_fields(type(node)):
+        value = getattr(node, name)
+        if is_expr(value):
+            if canonical[id(value)] is not value:
+                changes[alias] = canonical[id(value)]
+        elif type(value) is tuple and any(is_expr(v) for v in value):
+            new = tuple(canonical[id(v)] if is_expr(v) else v for v in value)
+            if any(a is not b for a, b in zip(new, value)):
+                changes[alias] = new
+    if changes:
+        # Rebuild on the canonical children, bypassing the interning hook.
+        kwargs = {alias: getattr(node, name) for name, alias in node_fields(type(node))}
+        kwargs.update(changes)
+        node = type.__call__(type(node), **kwargs)
+    key = _key(node)
+    with _LOCK:
+        existing = _UNIQUE.get(key)
+        if existing is not None:
+            return existing
+        _UNIQUE[key] = node
+        return node
+
+
+def intern(expr: _E) -> _E:
+    """Return the canonical instance of ``expr``, interning every node of it that is not yet canonical.
+
+    Works whether or not interning is enabled, and on arbitrarily deep trees.
+    """
+    canonical: dict[int, Expr] = {}
+    stack: list[tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if id(node) in canonical:
+            continue
+        if children_done:
+            canonical[id(node)] = _intern_shallow(node, canonical)
+        elif _is_canonical(node):
+            # A canonical node only has canonical descendants.
+            canonical[id(node)] = node
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children() if id(child) not in canonical)
+    return canonical[id(expr)]  # type: ignore[return-value]
+
+
+def _interning_call(cls: type[Expr], *args: object, **kwargs: object) -> Expr:
+    node: Expr = type.__call__(cls, *args, **kwargs)
+    existing = _UNIQUE.get(_key(node))
+    if existing is not None:
+        return existing
+    return intern(node)
+
+
+def is_interning_enabled() -> bool:
+    return "__call__" in vars(_ExprMeta)
+
+
+def enable_interning() -> None:
+    """Make every node construction return the canonical instance for its structure."""
+    _ExprMeta.__call__ = _interning_call  # type: ignore[method-assign,assignment]
+
+
+def disable_interning() -> None:
+    """Go back to building a fresh object for every node. Already interned nodes stay shared."""
+    if is_interning_enabled():
+        del _ExprMeta.__call__
+
+
+@contextlib.contextmanager
+def interning(enabled: bool = True) -> Iterator[None]:
+    """Enable (or disable) interning for the duration of a ``with`` block, restoring the previous state after."""
+    previous = is_interning_enabled()
+    if enabled:
+        enable_interning()
+    else:
+        disable_interning()
+    try:
+        yield
+    finally:
+        if previous:
+            enable_interning()
+        else:
+            disable_interning()
+
+
+def interned_count() -> int:
+    """Number of canonical nodes currently alive."""
+    return len(_UNIQUE)
+
+
+__all__ = [
+    "disable_interning",
+    "enable_interning",
+    "intern",
+    "interned_count",
+    "interning",
+    "is_interning_enabled",
+]
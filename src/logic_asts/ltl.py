@@ -43,9 +43,12 @@ Examples:
 
 from __future__ import annotations
 
+import functools
 import itertools
 import math
-from collections.abc import Hashable, Iterator
+import typing
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from collections.abc import Set as AbstractSet
 from typing import Generic, cast, final
 
 import attrs
@@ -61,8 +64,21 @@ from logic_asts.base import Or as Or
 from logic_asts.base import Variable as Variable
 from logic_asts.base import Xor as Xor
 from logic_asts.base import is_bool_node as is_bool_node
+from logic_asts.interning import _UNIQUE, _key, intern
 from logic_asts.spec import ChildExpr, Expr, ExprVisitor, LogicOp
-from logic_asts.utils import check_positive, check_start, convert_next_step, nary_fold
+from logic_asts.utils import (
+    bool_columns,
+    bool_trace_batch,
+    check_positive,
+    check_start,
+    convert_next_step,
+    last_uses,
+    nary_fold,
+)
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 _T = TypeVar("_T", bound=Hashable, default=Hashable)
 
@@ -193,7 +209,7 @@ class TimeInterval:
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Next(LogicOp, Generic[ChildExpr]):
     r"""Next operator: :math:`X\phi` or :math:`X^n\phi`.
 
@@ -223,43 +239,46 @@ class Next(LogicOp, Generic[ChildExpr]):
     steps: int | None = attrs.field(default=None, converter=convert_next_step)
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         match self.steps:
             case None | 1:
                 step_str = ""
             case t:
                 step_str = f"[{t}]"
-        return f"(X{step_str} {self.arg})"
+        return (f"(X{step_str} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        arg = self.arg.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         if self.steps is None:
-            return cast(ChildExpr, Next(arg))
-        else:
-            assert isinstance(self.steps, int)
-            expr: Expr = arg
-            for _ in range(self.steps):
-                expr = Next(expr)
-            return cast(ChildExpr, expr)
+            return self
+        expr: Expr = self.arg
+        for _ in range(self.steps):
+            expr = Next(expr)
+        return expr
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # !X f = X[!] !f (strong-X dual of weak-X)
-            return cast(ChildExpr, StrongNext(self.arg.to_nnf(negate=True, expand=False)))
+            return StrongNext(neg[0])
         # X f = X f
-        return cast(ChildExpr, Next(self.arg.to_nnf(expand=False)))
+        return Next(pos[0])
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        arg_hrz = self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        arg_hrz = horizons[0]
         assert isinstance(arg_hrz, int) or math.isinf(arg_hrz), (
             "`Next` cannot be used for continuous-time specifications, horizon cannot be computed"
         )
@@ -268,7 +287,7 @@ class Next(LogicOp, Generic[ChildExpr]):
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class StrongNext(LogicOp, Generic[ChildExpr]):
     r"""Strong Next operator: :math:`X[!]\phi` or :math:`X[n!]\phi`.
 
@@ -299,43 +318,46 @@ class StrongNext(LogicOp, Generic[ChildExpr]):
     steps: int | None = attrs.field(default=None, converter=convert_next_step)
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         match self.steps:
             case None | 1:
                 step_str = "[!]"
             case t:
                 step_str = f"[{t}!]"
-        return f"(X{step_str} {self.arg})"
+        return (f"(X{step_str} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        arg = self.arg.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         if self.steps is None:
-            return cast(ChildExpr, StrongNext(arg))
-        else:
-            assert isinstance(self.steps, int)
-            expr: Expr = arg
-            for _ in range(self.steps):
-                expr = StrongNext(expr)
-            return cast(ChildExpr, expr)
+            return self
+        expr: Expr = self.arg
+        for _ in range(self.steps):
+            expr = StrongNext(expr)
+        return expr
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # !X[!] f = X !f (weak-X dual of strong-X)
-            return cast(ChildExpr, Next(self.arg.to_nnf(negate=True, expand=False)))
+            return Next(neg[0])
         # X[!] f = X[!] f
-        return cast(ChildExpr, StrongNext(self.arg.to_nnf(expand=False)))
+        return StrongNext(pos[0])
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        arg_hrz = self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        arg_hrz = horizons[0]
         assert isinstance(arg_hrz, int) or math.isinf(arg_hrz), (
             "`StrongNext` cannot be used for continuous-time specifications, horizon cannot be computed"
         )
@@ -344,7 +366,7 @@ class StrongNext(LogicOp, Generic[ChildExpr]):
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Always(LogicOp, Generic[ChildExpr]):
     r"""Always (globally) operator: :math:`G\phi` or :math:`G_{[a,b]}\phi`.
 
@@ -375,58 +397,65 @@ class Always(LogicOp, Generic[ChildExpr]):
     strong: bool = attrs.field(default=False)
 
     @override
-    def __str__(self) -> str:
-        return f"(G{self.interval.format(strong=self.strong)} {self.arg})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return (f"(G{self.interval.format(strong=self.strong)} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         # Choose Next or StrongNext based on self.strong
         next_op = StrongNext if self.strong else Next
 
         match self.interval:
             case TimeInterval(None, None) | TimeInterval(0, None):
                 # Unbounded G
-                return cast(ChildExpr, Always(self.arg.expand(), strong=self.strong))
+                return Always(self.arg, strong=self.strong)
             case TimeInterval(0, int(t2)) | TimeInterval(None, int(t2)):
                 # G[0, t2]
-                arg = self.arg.expand()
+                arg = self.arg
                 # ``&`` is a pure constructor now; build a flat n-ary And.
                 conjuncts: list[Expr] = [arg, *(next_op(arg) for _ in range(t2))]
-                return cast(ChildExpr, nary_fold(And, conjuncts))
+                return nary_fold(And, conjuncts)
             case TimeInterval(int(t1), None):
                 # G[t1, inf]
                 assert t1 > 0
-                return cast(ChildExpr, next_op(Always(self.arg, strong=self.strong), t1).expand())
+                return next_op(Always(self.arg, strong=self.strong), t1)._expand_node()
             case TimeInterval(int(t1), int(t2)):
                 # G[t1, t2]
                 assert t1 > 0
                 # G[t1, t2] = X[t1] G[0,t2-t1] arg
                 # Nested nexts until t1
-                return cast(ChildExpr, next_op(Always(self.arg, TimeInterval(0, t2 - t1), strong=self.strong), t1).expand())
+                inner = Always(self.arg, TimeInterval(0, t2 - t1), strong=self.strong)._expand_node()
+                return next_op(inner, t1)._expand_node()
             case _:
                 raise RuntimeError(f"Unexpected time interval {self.interval}")
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # ! G x = F !x
-            return cast(ChildExpr, Eventually(self.arg.to_nnf(negate=True, expand=False), self.interval))
+            return Eventually(neg[0], self.interval)
         # G x = G x
-        return cast(ChildExpr, Always(self.arg.to_nnf(expand=False), self.interval))
+        return Always(pos[0], self.interval)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        return (self.interval.end or math.inf) + self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return (self.interval.end or math.inf) + horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Eventually(LogicOp, Generic[ChildExpr]):
     r"""Eventually (future) operator: :math:`F\phi` or :math:`F_{[a,b]}\phi`.
 
@@ -457,60 +486,65 @@ class Eventually(LogicOp, Generic[ChildExpr]):
     strong: bool = attrs.field(default=False)
 
     @override
-    def __str__(self) -> str:
-        return f"(F{self.interval.format(strong=self.strong)} {self.arg})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return (f"(F{self.interval.format(strong=self.strong)} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         # Choose Next or StrongNext based on self.strong
         next_op = StrongNext if self.strong else Next
 
         match self.interval:
             case TimeInterval(None, None) | TimeInterval(0, None):
                 # Unbounded F
-                return cast(ChildExpr, Eventually(self.arg.expand(), strong=self.strong))
+                return Eventually(self.arg, strong=self.strong)
             case TimeInterval(0, int(t2)) | TimeInterval(None, int(t2)):
                 # F[0, t2]
-                arg = self.arg.expand()
+                arg = self.arg
                 # ``&`` is a pure constructor now; build a flat n-ary And.
                 conjuncts: list[Expr] = [arg, *(next_op(arg) for _ in range(t2))]
-                return cast(ChildExpr, nary_fold(And, conjuncts))
+                return nary_fold(And, conjuncts)
             case TimeInterval(int(t1), None):
                 # F[t1, inf]
                 assert t1 > 0
-                return cast(ChildExpr, next_op(Eventually(self.arg, strong=self.strong), t1).expand())
+                return next_op(Eventually(self.arg, strong=self.strong), t1)._expand_node()
             case TimeInterval(int(t1), int(t2)):
                 # F[t1, t2]
                 assert t1 > 0
                 # F[t1, t2] = X[t1] F[0,t2-t1] arg
                 # Nested nexts until t1
-                return cast(
-                    ChildExpr, next_op(Eventually(self.arg, TimeInterval(0, t2 - t1), strong=self.strong), t1).expand()
-                )
+                inner = Eventually(self.arg, TimeInterval(0, t2 - t1), strong=self.strong)._expand_node()
+                return next_op(inner, t1)._expand_node()
             case _:
                 raise RuntimeError(f"Unexpected time interval {self.interval}")
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # ! F x = G !x
-            return cast(ChildExpr, Always(self.arg.to_nnf(negate=True, expand=False), self.interval))
+            return Always(neg[0], self.interval)
         # F x = F x
-        return cast(ChildExpr, Eventually(self.arg.to_nnf(expand=False), self.interval))
+        return Eventually(pos[0], self.interval)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        return (self.interval.end or math.inf) + self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return (self.interval.end or math.inf) + horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Until(LogicOp, Generic[ChildExpr]):
     r"""Until operator: :math:`\phi U \psi` or :math:`\phi U_{[a,b]} \psi`.
 
@@ -543,55 +577,42 @@ class Until(LogicOp, Generic[ChildExpr]):
     interval: TimeInterval = attrs.field(factory=lambda: TimeInterval(None, None))
 
     @override
-    def __str__(self) -> str:
-        return f"({self.lhs} U{self.interval or ''} {self.rhs})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("(", self.lhs, f" U{self.interval or ''} ", self.rhs, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        new_lhs = self.lhs.expand()
-        new_rhs = self.rhs.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         match self.interval:
             case TimeInterval(None | 0, None):
                 # Just make an unbounded one here
-                return cast(ChildExpr, Until(new_lhs, new_rhs))
+                return Until(self.lhs, self.rhs)
             case TimeInterval(t1, None):  # Unbounded end
-                return cast(
-                    ChildExpr,
-                    Always(
-                        arg=Until(lhs=new_lhs, rhs=new_rhs),
-                        interval=TimeInterval(0, t1),
-                    ).expand(),
-                )
+                return Always(
+                    arg=Until(lhs=self.lhs, rhs=self.rhs),
+                    interval=TimeInterval(0, t1),
+                )._expand_node()
             case TimeInterval(t1, _):
-                z1 = Eventually(interval=self.interval, arg=new_lhs).expand()
+                z1 = Eventually(interval=self.interval, arg=self.lhs)._expand_node()
                 until_interval = TimeInterval(t1, None)
-                z2 = Until(interval=until_interval, lhs=new_lhs, rhs=new_rhs).expand()
-                return cast(ChildExpr, z1 & z2)
+                z2 = Until(interval=until_interval, lhs=self.lhs, rhs=self.rhs)._expand_node()
+                return z1 & z2
             case _:
                 raise RuntimeError(f"Unexpected time interval {self.interval}")
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # ! (f U g) = (!f) R (!g)
-            return cast(
-                ChildExpr,
-                Release(
-                    self.lhs.to_nnf(negate=True, expand=False),
-                    self.rhs.to_nnf(negate=True, expand=False),
-                    self.interval,
-                ),
-            )
-        return cast(
-            ChildExpr,
-            Until(
-                self.lhs.to_nnf(expand=False),
-                self.rhs.to_nnf(expand=False),
-                self.interval,
-            ),
-        )
+            return Release(neg[0], neg[1], self.interval)
+        return Until(pos[0], pos[1], self.interval)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -599,13 +620,13 @@ class Until(LogicOp, Generic[ChildExpr]):
         yield self.rhs
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         end = self.interval.end or math.inf
-        return max(self.lhs.horizon() + end - 1, self.rhs.horizon() + end)
+        return max(horizons[0] + end - 1, horizons[1] + end)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class WeakUntil(LogicOp, Generic[ChildExpr]):
     r"""Weak Until operator: :math:`\phi W \psi` or :math:`\phi W_{[a,b]} \psi`.
 
@@ -638,55 +659,42 @@ class WeakUntil(LogicOp, Generic[ChildExpr]):
     interval: TimeInterval = attrs.field(factory=lambda: TimeInterval(None, None))
 
     @override
-    def __str__(self) -> str:
-        return f"({self.lhs} W{self.interval or ''} {self.rhs})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("(", self.lhs, f" W{self.interval or ''} ", self.rhs, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        new_lhs = self.lhs.expand()
-        new_rhs = self.rhs.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         match self.interval:
             case TimeInterval(None | 0, None):
                 # Just make an unbounded one here
-                return cast(ChildExpr, WeakUntil(new_lhs, new_rhs))
+                return WeakUntil(self.lhs, self.rhs)
             case TimeInterval(t1, None):  # Unbounded end
-                return cast(
-                    ChildExpr,
-                    Always(
-                        arg=WeakUntil(lhs=new_lhs, rhs=new_rhs),
-                        interval=TimeInterval(0, t1),
-                    ).expand(),
-                )
+                return Always(
+                    arg=WeakUntil(lhs=self.lhs, rhs=self.rhs),
+                    interval=TimeInterval(0, t1),
+                )._expand_node()
             case TimeInterval(t1, _):
-                z1 = Eventually(interval=self.interval, arg=new_lhs).expand()
+                z1 = Eventually(interval=self.interval, arg=self.lhs)._expand_node()
                 until_interval = TimeInterval(t1, None)
-                z2 = WeakUntil(interval=until_interval, lhs=new_lhs, rhs=new_rhs).expand()
-                return cast(ChildExpr, z1 & z2)
+                z2 = WeakUntil(interval=until_interval, lhs=self.lhs, rhs=self.rhs)._expand_node()
+                return z1 & z2
             case _:
                 raise RuntimeError(f"Unexpected time interval {self.interval}")
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # ! (f W g) = (!f) M (!g)
-            return cast(
-                ChildExpr,
-                StrongRelease(
-                    self.lhs.to_nnf(negate=True, expand=False),
-                    self.rhs.to_nnf(negate=True, expand=False),
-                    self.interval,
-                ),
-            )
-        return cast(
-            ChildExpr,
-            WeakUntil(
-                self.lhs.to_nnf(expand=False),
-                self.rhs.to_nnf(expand=False),
-                self.interval,
-            ),
-        )
+            return StrongRelease(neg[0], neg[1], self.interval)
+        return WeakUntil(pos[0], pos[1], self.interval)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -694,13 +702,14 @@ class WeakUntil(LogicOp, Generic[ChildExpr]):
         yield self.rhs
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        # Unlike in ``U``, ``lhs`` is also needed at ``b``, for the ``G[0, b] lhs`` disjunct.
         end = self.interval.end or math.inf
-        return max(self.lhs.horizon() + end - 1, self.rhs.horizon() + end)
+        return max(horizons[0], horizons[1]) + end
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Release(LogicOp, Generic[ChildExpr]):
     r"""Release operator: :math:`\phi R \psi` or :math:`\phi R_{[a,b]} \psi`.
 
@@ -743,36 +752,28 @@ class Release(LogicOp, Generic[ChildExpr]):
     interval: TimeInterval = attrs.field(factory=lambda: TimeInterval(None, None))
 
     @override
-    def __str__(self) -> str:
-        return f"({self.lhs} R{self.interval or ''} {self.rhs})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("(", self.lhs, f" R{self.interval or ''} ", self.rhs, ")")
 
     @override
     def expand(self) -> ChildExpr:
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         # Expands as the dual of Until
-        return cast(ChildExpr, Not(Until(~self.lhs, ~self.rhs, self.interval)))
+        return Not(Until(~self.lhs, ~self.rhs, self.interval))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # ! (f R g) = (!f) U (!g)
-            return cast(
-                ChildExpr,
-                Until(
-                    self.lhs.to_nnf(negate=True, expand=False),
-                    self.rhs.to_nnf(negate=True, expand=False),
-                    self.interval,
-                ),
-            )
-        return cast(
-            ChildExpr,
-            Release(
-                self.lhs.to_nnf(expand=False),
-                self.rhs.to_nnf(expand=False),
-                self.interval,
-            ),
-        )
+            return Until(neg[0], neg[1], self.interval)
+        return Release(pos[0], pos[1], self.interval)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -780,14 +781,14 @@ class Release(LogicOp, Generic[ChildExpr]):
         yield self.rhs
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         # Release has same horizon as Until
         end = self.interval.end or math.inf
-        return max(self.lhs.horizon() + end - 1, self.rhs.horizon() + end)
+        return max(horizons[0] + end - 1, horizons[1] + end)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class StrongRelease(LogicOp, Generic[ChildExpr]):
     r"""Strong Release operator: :math:`\phi M \psi` or :math:`\phi M_{[a,b]} \psi`.
 
@@ -826,43 +827,33 @@ class StrongRelease(LogicOp, Generic[ChildExpr]):
     interval: TimeInterval = attrs.field(factory=lambda: TimeInterval(None, None))
 
     @override
-    def __str__(self) -> str:
-        return f"({self.lhs} M{self.interval or ''} {self.rhs})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("(", self.lhs, f" M{self.interval or ''} ", self.rhs, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        new_lhs = self.lhs.expand()
-        new_rhs = self.rhs.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         match self.interval:
             case TimeInterval(None | 0, None):
                 # Unbounded: return StrongRelease with expanded operands
-                return cast(ChildExpr, StrongRelease(new_lhs, new_rhs))
+                return StrongRelease(self.lhs, self.rhs)
             case _:
                 # Bounded: use dual form Not(WeakUntil(~lhs, ~rhs, interval))
-                return cast(ChildExpr, Not(WeakUntil(~new_lhs, ~new_rhs, self.interval)))
+                return Not(WeakUntil(~self.lhs, ~self.rhs, self.interval))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # ! (f M g) = (!f) W (!g)
-            return cast(
-                ChildExpr,
-                WeakUntil(
-                    self.lhs.to_nnf(negate=True, expand=False),
-                    self.rhs.to_nnf(negate=True, expand=False),
-                    self.interval,
-                ),
-            )
-        return cast(
-            ChildExpr,
-            StrongRelease(
-                self.lhs.to_nnf(expand=False),
-                self.rhs.to_nnf(expand=False),
-                self.interval,
-            ),
-        )
+            return WeakUntil(neg[0], neg[1], self.interval)
+        return StrongRelease(pos[0], pos[1], self.interval)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -870,9 +861,10 @@ class StrongRelease(LogicOp, Generic[ChildExpr]):
         yield self.rhs
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        # Same as ``W``, of which ``M`` is the dual.
         end = self.interval.end or math.inf
-        return max(self.lhs.horizon() + end - 1, self.rhs.horizon() + end)
+        return max(horizons[0], horizons[1]) + end
 
 
 Var = TypeVar("Var")
@@ -946,6 +938,651 @@ def ltl_expr_iter(expr: LTLExpr[Var]) -> Iterator[LTLExpr[Var]]:
     )
 
 
+def _first_true(values: npt.NDArray[np.bool_]) -> npt.NDArray[np.intp]:
+    """For each ``i <= T`` along the last axis, the first ``j >= i`` where ``values[..., j]`` holds, or ``T``."""
+    import numpy as np
+
+    size = values.shape[-1]
+    positions = np.where(values, np.arange(size), size)
+    positions = np.concatenate((positions, np.full((*values.shape[:-1], 1), size)), axis=-1)
+    return np.flip(np.minimum.accumulate(np.flip(positions, -1), axis=-1), -1)
+
+
+def _offsets(lengths: int | npt.NDArray[np.intp], size: int, offset: int) -> npt.NDArray[np.intp]:
+    """``min(i + offset, length)`` for each time step ``i < size`` of traces of the given lengths."""
+    import numpy as np
+
+    return np.minimum(np.arange(size) + offset, lengths)
+
+
+def _take(values: npt.NDArray[np.intp], positions: int | npt.NDArray[np.intp]) -> npt.NDArray[np.intp]:
+    """``values[..., positions]`` along the last axis, with positions shared by all traces or one row per trace."""
+    import numpy as np
+
+    if isinstance(positions, int):
+        return values[..., positions, np.newaxis]
+    if positions.ndim == 1:
+        return values[..., positions]
+    return np.take_along_axis(values, positions, axis=-1)
+
+
+def _shift(
+    values: npt.NDArray[np.bool_], steps: int, lengths: int | npt.NDArray[np.intp], *, strong: bool
+) -> npt.NDArray[np.bool_]:
+    """``values[..., i + steps]``, or ``not strong`` past the end of each trace."""
+    import numpy as np
+
+    size = values.shape[-1]
+    if isinstance(lengths, int):
+        shifted = np.full(values.shape, not strong)
+        shifted[..., : max(lengths - steps, 0)] = values[..., steps:lengths]
+        return shifted
+    shifted = np.empty_like(values)
+    shifted[..., : max(size - steps, 0)] = values[..., steps:]
+    return np.where(np.arange(size) + steps < lengths, shifted, not strong)
+
+
+def _eventually(
+    values: npt.NDArray[np.bool_], interval: TimeInterval, lengths: int | npt.NDArray[np.intp], *, strong: bool
+) -> npt.NDArray[np.bool_]:
+    """``F[a, b]``: ``values`` holds somewhere in the window ``[i + a, i + b]``.
+
+    Each window is a difference of prefix counts, clipped to the end of its
+    trace. Steps of the window past the end count as satisfied, unless
+    ``strong``.
+    """
+    import numpy as np
+
+    size = values.shape[-1]
+    start, end = interval.start or 0, interval.end
+    counts = np.concatenate((np.zeros((*values.shape[:-1], 1), dtype=np.intp), np.cumsum(values, axis=-1)), axis=-1)
+    # With no end, every window reaches the end of its trace.
+    upper = lengths if end is None else _offsets(lengths, size, end + 1)
+    found = _take(counts, upper) > _take(counts, _offsets(lengths, size, start))
+    if strong:
+        return found
+    return found | (np.arange(size) + (start if end is None else end) >= lengths)
+
+
+def _always(
+    values: npt.NDArray[np.bool_], interval: TimeInterval, lengths: int | npt.NDArray[np.intp], *, strong: bool
+) -> npt.NDArray[np.bool_]:
+    """``G[a, b]``, as the dual ``!F[a, b] !`` with the opposite strength."""
+    import numpy as np
+
+    return np.logical_not(_eventually(np.logical_not(values), interval, lengths, strong=not strong))
+
+
+def _until(
+    lhs: npt.NDArray[np.bool_],
+    rhs: npt.NDArray[np.bool_],
+    interval: TimeInterval,
+    lengths: int | npt.NDArray[np.intp],
+) -> npt.NDArray[np.bool_]:
+    """``lhs U[a, b] rhs``: ``rhs`` holds at some ``j`` in ``[i + a, i + b]``, and ``lhs`` on ``[i, j)``.
+
+    ``lhs`` only needs to hold up to the first such ``j``, so it suffices to
+    compare the first step at or after ``i + a`` where ``rhs`` holds with the
+    first step at or after ``i`` where ``lhs`` fails. Steps past the end of a
+    trace never count, whatever their values.
+    """
+    import numpy as np
+
+    size = lhs.shape[-1]
+    start, end = interval.start or 0, interval.end
+    found = _take(_first_true(rhs), _offsets(lengths, size, start))
+    holds = (found < lengths) & (found <= _first_true(np.logical_not(lhs))[..., :size])
+    if end is not None:
+        holds &= found <= np.arange(size) + end
+    return holds
+
+
+def _weak_until(
+    lhs: npt.NDArray[np.bool_],
+    rhs: npt.NDArray[np.bool_],
+    interval: TimeInterval,
+    lengths: int | npt.NDArray[np.intp],
+) -> npt.NDArray[np.bool_]:
+    """``lhs W[a, b] rhs``: ``lhs U[a, b] rhs``, or ``lhs`` holds on ``[i, i + b]`` up to the end of the trace."""
+    import numpy as np
+
+    size = lhs.shape[-1]
+    end = interval.end
+    fails = _first_true(np.logical_not(lhs))[..., :size]
+    lhs_holds = fails >= (lengths if end is None else _offsets(lengths, size, end + 1))
+    return _until(lhs, rhs, interval, lengths) | lhs_holds
+
+
+def evaluate(
+    expr: LTLExpr[Var],
+    trace: Mapping[Var, npt.ArrayLike] | npt.ArrayLike,
+    index: Mapping[Var, int] | Sequence[Var] | None = None,
+) -> npt.NDArray[np.bool_]:
+    r"""Evaluate an LTL formula on a finite trace (LTLf), at every time step.
+
+    Every distinct subformula is evaluated once over the whole trace with
+    vectorized NumPy passes (install the ``numpy`` extra), in
+    :math:`O(|\phi| \cdot |trace|)` time: bounded operators are evaluated
+    directly, never expanded.
+
+    The value at step ``i`` only depends on steps ``i`` onward:
+
+    - ``X[n] f`` holds if ``f`` holds at ``i + n``, or if ``i + n`` is past the
+      end of the trace; ``X[n!] f`` requires ``i + n`` to be in the trace.
+    - ``F[a, b] f`` holds if ``f`` holds at some step in ``[i + a, i + b]``, and
+      ``G[a, b] f`` if ``f`` holds at every step in it. As in their expansion
+      with weak ``X``, steps past the end of the trace satisfy both, unless the
+      operator is ``strong``. Steps past the end are never enough for an
+      unbounded ``F``.
+    - ``f U[a, b] g`` holds if ``g`` holds at some step ``j`` in
+      ``[i + a, i + b]`` of the trace, and ``f`` at every step in ``[i, j)``.
+      ``f W[a, b] g`` also holds if ``f`` holds at every step in
+      ``[i, i + b]`` of the trace. ``f R g`` is ``!(!f U !g)`` and ``f M g``
+      is ``!(!f W !g)``, with the same interval.
+
+    Type Parameters:
+        Var: The variable type used in the expression.
+
+    Arguments:
+        expr: The LTL formula to evaluate.
+        trace: Either a mapping from atoms to 1-D boolean arrays of the same
+            length, or a 2-D boolean array with one row per time step.
+        index: Required with a 2-D array, and only allowed with one: the column
+            of each atom, as a mapping or as a sequence of atoms in column
+            order.
+
+    Returns:
+        A 1-D boolean array whose element ``i`` is the value of the formula
+        on the suffix of the trace that starts at step ``i``. Atoms without a
+        column are false.
+
+    Raises:
+        TypeError: If the expression contains operators not in LTL, or
+            ``index`` is missing or misplaced.
+        ValueError: If the trace does not have the expected shape.
+
+    Examples:
+        >>> from logic_asts.base import Variable
+        >>> p, q = Variable("p"), Variable("q")
+        >>> trace = {"p": [True, True, False, False], "q": [False, False, True, False]}
+        >>> evaluate(Until(p, q), trace)
+        array([ True,  True,  True, False])
+        >>> evaluate(Next(q), trace), evaluate(StrongNext(q), trace)
+        (array([False,  True, False,  True]), array([False,  True, False, False]))
+        >>> evaluate(Eventually(p, TimeInterval(1, 2), strong=True), trace)
+        array([ True, False, False, False])
+    """
+    import numpy as np
+
+    n, column = bool_columns(trace, index)
+    return np.array(_evaluate(expr, (n,), n, lambda name: column(name, 0, n)), dtype=np.bool_)
+
+
+def evaluate_batch(
+    expr: LTLExpr[Var],
+    traces: Mapping[Var, npt.ArrayLike] | npt.ArrayLike,
+    index: Mapping[Var, int] | Sequence[Var] | None = None,
+    lengths: npt.ArrayLike | None = None,
+) -> npt.NDArray[np.bool_]:
+    r"""Evaluate an LTL formula on many finite traces at once, at every time step.
+
+    Same semantics as :func:`evaluate`, applied to each trace separately, but
+    every distinct subformula is evaluated once over the whole batch, with
+    NumPy passes over a ``(traces, time)`` array instead of a Python loop over
+    the traces. Each trace ends at its own length: ``X[n!] f`` is false, and
+    ``X[n] f`` true, at its last ``n`` steps, and no window reaches past it
+    into the padding of the batch.
+
+    Type Parameters:
+        Var: The variable type used in the expression.
+
+    Arguments:
+        expr: The LTL formula to evaluate.
+        traces: The traces, either padded to a common length or concatenated.
+            Padded traces are a mapping from atoms to 2-D boolean arrays of
+            shape ``(traces, time)``, or a 3-D boolean array of shape
+            ``(traces, time, atoms)``. Concatenated traces are laid end to end
+            along the time axis, as for :func:`evaluate` (a mapping to 1-D
+            arrays, or a 2-D array), and require ``lengths``.
+        index: Required with an array of traces, and only allowed with one:
+            the column of each atom, as a mapping or as a sequence of atoms in
+            column order.
+        lengths: The number of time steps of each trace. Padded traces default
+            to their full length, and steps past the length of a trace are
+            ignored.
+
+    Returns:
+        A boolean array of shape ``(traces, time)`` whose element ``[k, i]``
+        is the value of the formula on trace ``k`` from step ``i`` on, with
+        ``time`` the longest length. Steps past the end of a trace are false.
+
+    Raises:
+        TypeError: If the expression contains operators not in LTL, or
+            ``index`` is missing or misplaced.
+        ValueError: If the traces or their lengths do not have the expected
+            shape.
+
+    Examples:
+        >>> from logic_asts.base import Variable
+        >>> p = Variable("p")
+        >>> evaluate_batch(StrongNext(p), {"p": [True, True, True, False, True]}, lengths=[3, 2])
+        array([[ True,  True, False],
+               [ True, False, False]])
+    """
+    import numpy as np
+
+    counts, size, column = bool_trace_batch(traces, index, lengths)
+    ends = counts[:, np.newaxis]
+    # Traces of the same length share the cheaper indexing of a single trace.
+    value = _evaluate(expr, (len(counts), size), size if (counts == size).all() else ends, column)
+    return np.logical_and(value, np.arange(size) < ends)
+
+
+def _evaluate(
+    expr: LTLExpr[Var],
+    shape: tuple[int, ...],
+    lengths: int | npt.NDArray[np.intp],
+    column: Callable[[Var], npt.NDArray[np.bool_] | None],
+) -> npt.NDArray[np.bool_]:
+    """Evaluate every subformula once on traces of the given ``shape``, with time as its last axis.
+
+    The value of the formula may be an array of the input.
+    """
+    import numpy as np
+
+    order = list(dict.fromkeys(ltl_expr_iter(expr)))
+    last_use = last_uses(order)
+
+    cache: dict[LTLExpr[Var], npt.NDArray[np.bool_]] = dict()
+    for position, subexpr in enumerate(order):
+        value: npt.NDArray[np.bool_]
+        match subexpr:
+            case Literal(literal):
+                value = np.full(shape, literal)
+            case Variable(name):
+                data = column(name)
+                value = np.zeros(shape, dtype=np.bool_) if data is None else data
+            case _:
+                value = _evaluate_node(subexpr, cache.__getitem__, lengths)
+        cache[subexpr] = value
+        for child in subexpr.children():
+            if last_use.get(child) == position:
+                cache.pop(cast(LTLExpr[Var], child), None)
+
+    return cache[expr]
+
+
+def _evaluate_node(
+    node: LTLExpr[Var],
+    value_of: Callable[[LTLExpr[Var]], npt.NDArray[np.bool_]],
+    lengths: int | npt.NDArray[np.intp],
+) -> npt.NDArray[np.bool_]:
+    """Evaluate an operator on the values of its operands, given by ``value_of``, with time as their last axis."""
+    import numpy as np
+
+    match node:
+        case Not(arg):
+            return np.logical_not(value_of(arg))
+        case Or(args) | And(args):
+            ufunc = np.logical_or if isinstance(node, Or) else np.logical_and
+            value = ufunc(value_of(args[0]), value_of(args[1]))
+            for arg in args[2:]:
+                ufunc(value, value_of(arg), out=value)
+            return value
+        case Xor(lhs, rhs):
+            return np.not_equal(value_of(lhs), value_of(rhs))
+        case Equiv(lhs, rhs):
+            return np.equal(value_of(lhs), value_of(rhs))
+        case Implies(lhs, rhs):
+            value = np.logical_not(value_of(lhs))
+            return np.logical_or(value, value_of(rhs), out=value)
+        case Next(arg, steps):
+            return _shift(value_of(arg), steps or 1, lengths, strong=False)
+        case StrongNext(arg, steps):
+            return _shift(value_of(arg), steps or 1, lengths, strong=True)
+        case Eventually(arg, interval, strong):
+            return _eventually(value_of(arg), interval, lengths, strong=strong)
+        case Always(arg, interval, strong):
+            return _always(value_of(arg), interval, lengths, strong=strong)
+        case Until(lhs, rhs, interval):
+            return _until(value_of(lhs), value_of(rhs), interval, lengths)
+        case WeakUntil(lhs, rhs, interval):
+            return _weak_until(value_of(lhs), value_of(rhs), interval, lengths)
+        case Release(lhs, rhs, interval):
+            return np.logical_not(_until(np.logical_not(value_of(lhs)), np.logical_not(value_of(rhs)), interval, lengths))
+        case StrongRelease(lhs, rhs, interval):
+            return np.logical_not(_weak_until(np.logical_not(value_of(lhs)), np.logical_not(value_of(rhs)), interval, lengths))
+        case _:
+            raise TypeError(f"LTL evaluation only possible for LTL expressions, got {type(node)}")
+
+
+def evaluate_packed(
+    expr: LTLExpr[Var],
+    trace: Mapping[Var, npt.ArrayLike] | npt.ArrayLike,
+    index: Mapping[Var, int] | Sequence[Var] | None = None,
+) -> npt.NDArray[np.bool_]:
+    r"""Evaluate an LTL formula on a finite trace (LTLf), with the trace packed into bits.
+
+    Same arguments, results and semantics as :func:`evaluate`, but the value
+    of every distinct subformula is a Python integer with one bit per time
+    step, so that each operator is a few word-wise operations on
+    :math:`|trace| / 64` machine words instead of a pass over a boolean array:
+    ``X[n]`` is a shift, bounded ``F``/``G`` windows are ORs/ANDs of shifts
+    doubled up to their width, and an unbounded ``U`` propagates through
+    ``lhs`` as the carry of an addition. It uses 8 times less memory, and is
+    an order of magnitude faster on long traces, unless packing the trace
+    dominates, as with only Boolean operators and ``X``.
+
+    Examples:
+        >>> from logic_asts.base import Variable
+        >>> p, q = Variable("p"), Variable("q")
+        >>> trace = {"p": [True, True, False, False], "q": [False, False, True, False]}
+        >>> evaluate_packed(Until(p, q), trace)
+        array([ True,  True,  True, False])
+    """
+    import numpy as np
+
+    n, column = bool_columns(trace, index)
+    # Big-endian bytes put step ``i`` at bit ``n - 1 - i`` after dropping the padding, so
+    # that a carry moves to earlier steps.
+    padding = -n % 8
+
+    def bits(name: Var) -> int | None:
+        data = column(name, 0, n)
+        return None if data is None else int.from_bytes(np.packbits(data).tobytes(), "big") >> padding
+
+    value = _evaluate_bits(expr, n, bits)
+    packed = np.frombuffer((value << padding).to_bytes((n + 7) // 8, "big"), dtype=np.uint8)
+    return np.unpackbits(packed, count=n).view(np.bool_)
+
+
+def _evaluate_bits(expr: LTLExpr[Var], n: int, column: Callable[[Var], int | None]) -> int:
+    """Evaluate every subformula once on a trace of ``n`` steps, with bit ``k`` as step ``n - 1 - k``."""
+    mask = (1 << n) - 1
+
+    def shift(value: int, steps: int, strong: bool) -> int:
+        # The last ``steps`` steps look past the end of the trace.
+        steps = min(steps, n)
+        shifted = (value << steps) & mask
+        return shifted if strong else shifted | ((1 << steps) - 1)
+
+    def eventually(value: int, start: int, end: int | None, strong: bool) -> int:
+        if end is None:
+            # Every step up to the last one where ``value`` holds.
+            return shift(mask ^ ((value & -value) - 1) if value else 0, start, strong)
+        # Steps past ``n`` are all past the end of the trace.
+        start, end = min(start, n), min(end, n)
+        # Windows of ``end - start + 1`` bits, of ``value`` after ``end`` bits past the end of the trace.
+        window, width = (value << end) | (0 if strong else (1 << end) - 1), 1
+        while width < end - start + 1:
+            step = min(width, end - start + 1 - width)
+            window |= window >> step
+            width += step
+        return window & mask
+
+    def always(value: int, start: int, end: int | None, strong: bool) -> int:
+        return mask ^ eventually(mask ^ value, start, end, not strong)
+
+    def until(lhs: int, rhs: int, start: int, end: int | None) -> int:
+        # ``rhs``, or a run of ``lhs`` that reaches the step before one where ``rhs`` holds.
+        # Adding a seed at that step carries back through the run, and clears it.
+        seeds = (rhs << 1) & lhs
+        holds = rhs | seeds | (lhs & ~(lhs + seeds))
+        if end is not None:
+            holds &= eventually(rhs, 0, end - start, True)
+        if start:
+            holds = shift(holds, start, True) & always(lhs, 0, start - 1, False)
+        return holds
+
+    def weak_until(lhs: int, rhs: int, start: int, end: int | None) -> int:
+        return until(lhs, rhs, start, end) | always(lhs, 0, end, False)
+
+    order = list(dict.fromkeys(ltl_expr_iter(expr)))
+    last_use = last_uses(order)
+
+    cache: dict[LTLExpr[Var], int] = dict()
+    for position, subexpr in enumerate(order):
+        match subexpr:
+            case Literal(literal):
+                value = mask if literal else 0
+            case Variable(name):
+                data = column(name)
+                value = 0 if data is None else data
+            case Not(arg):
+                value = mask ^ cache[arg]
+            case Or(args):
+                value = 0
+                for arg in args:
+                    value |= cache[arg]
+            case And(args):
+                value = mask
+                for arg in args:
+                    value &= cache[arg]
+            case Xor(lhs, rhs):
+                value = cache[lhs] ^ cache[rhs]
+            case Equiv(lhs, rhs):
+                value = mask ^ cache[lhs] ^ cache[rhs]
+            case Implies(lhs, rhs):
+                value = (mask ^ cache[lhs]) | cache[rhs]
+            case Next(arg, steps):
+                value = shift(cache[arg], steps or 1, False)
+            case StrongNext(arg, steps):
+                value = shift(cache[arg], steps or 1, True)
+            case Eventually(arg, interval, strong):
+                value = eventually(cache[arg], interval.start or 0, interval.end, strong)
+            case Always(arg, interval, strong):
+                value = always(cache[arg], interval.start or 0, interval.end, strong)
+            case Until(lhs, rhs, interval):
+                value = until(cache[lhs], cache[rhs], interval.start or 0, interval.end)
+            case WeakUntil(lhs, rhs, interval):
+                value = weak_until(cache[lhs], cache[rhs], interval.start or 0, interval.end)
+            case Release(lhs, rhs, interval):
+                value = mask ^ until(mask ^ cache[lhs], mask ^ cache[rhs], interval.start or 0, interval.end)
+            case StrongRelease(lhs, rhs, interval):
+                value = mask ^ weak_until(mask ^ cache[lhs], mask ^ cache[rhs], interval.start or 0, interval.end)
+            case _:
+                raise TypeError(f"LTL evaluation only possible for LTL expressions, got {type(subexpr)}")
+        cache[subexpr] = value
+        for child in subexpr.children():
+            if last_use.get(child) == position:
+                cache.pop(cast(LTLExpr[Var], child), None)
+
+    return cache[expr]
+
+
+def progress(expr: LTLExpr[Var], state: AbstractSet[Var], *, last: bool = False) -> LTLExpr[Var]:
+    r"""Progress an LTL formula through one state of a finite trace (Bacchus/Kabanza formula progression).
+
+    Returns the formula that a trace ``w`` must satisfy for ``state`` followed
+    by ``w`` to satisfy ``expr``, with the semantics of :func:`evaluate`:
+    ``X f`` becomes ``f``, ``F[a, b] f`` becomes ``f | F[a, b - 1] f`` (or
+    ``F[a - 1, b - 1] f`` with ``a > 0``), and so on. With ``last``, ``state``
+    is the last state of the trace, and the result is the :class:`Literal`
+    value of the formula on it. Monitoring a trace is progressing the formula
+    through its states in order, until it becomes a :class:`Literal`, which is
+    the verdict of every continuation.
+
+    Progressed formulas are simplified as they are built (constants are
+    folded, nested ``&`` and ``|`` flattened, duplicate and complementary
+    operands removed), and :func:`~logic_asts.interning.intern`-ed, so that
+    equal formulas are the same object. The progression of every subformula
+    through every state is memoized in a bounded LRU table shared by all
+    calls: progressing a formula through a state seen before is a dictionary
+    lookup.
+
+    Arguments:
+        expr: The LTL formula to progress.
+        state: Set of variables that are true in the state; all others are false.
+        last: Whether ``state`` ends the trace.
+
+    Returns:
+        The progressed formula, a :class:`Literal` if it is decided.
+
+    Raises:
+        TypeError: If the progressed part of the expression contains operators
+            not in LTL.
+
+    Examples:
+        >>> from logic_asts.base import Variable
+        >>> req, grant = Variable("req"), Variable("grant")
+        >>> spec = Always(Implies(req, Eventually(grant)))
+        >>> step = progress(spec, {"req"})
+        >>> print(step)
+        ((F grant) & (G (req -> (F grant))))
+        >>> progress(step, {"req"}) is step
+        True
+        >>> print(progress(step, {"grant"}))
+        (G (req -> (F grant)))
+        >>> progress(step, {"req"}, last=True)
+        Literal(value=False)
+    """
+    return _progress_root(expr, frozenset(state), last)
+
+
+_TRUE: Literal = intern(Literal(True))
+_FALSE: Literal = intern(Literal(False))
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def _progress_root(expr: LTLExpr[Var], state: frozenset[Var], last: bool) -> LTLExpr[Var]:
+    # Interning a formula costs more than a lookup, even when it is already
+    # interned, so it is only done once per formula and state. The subformulas
+    # of an interned formula are interned.
+    return _progress(intern(expr), state, last)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _progress(expr: LTLExpr[Var], state: frozenset[Var], last: bool) -> LTLExpr[Var]:
+    match expr:
+        case Literal():
+            return expr
+        case Variable(name):
+            return _TRUE if name in state else _FALSE
+        case Not(arg):
+            return _not(_progress(arg, state, last))
+        case And(args) | Or(args):
+            return _junction(type(expr), [_progress(arg, state, last) for arg in args])
+        case Implies(lhs, rhs):
+            lhs, rhs = _progress(lhs, state, last), _progress(rhs, state, last)
+            if isinstance(lhs, Literal) or isinstance(rhs, Literal):
+                return _junction(Or, [_not(lhs), rhs])
+            return _TRUE if lhs is rhs else _interned(Implies(lhs, rhs))
+        case Equiv(lhs, rhs) | Xor(lhs, rhs):
+            lhs, rhs = _progress(lhs, state, last), _progress(rhs, state, last)
+            equiv = isinstance(expr, Equiv)
+            if isinstance(lhs, Literal):
+                return rhs if lhs.value is equiv else _not(rhs)
+            if isinstance(rhs, Literal):
+                return lhs if rhs.value is equiv else _not(lhs)
+            if lhs is rhs:
+                return _TRUE if equiv else _FALSE
+            return _interned(type(expr)(lhs, rhs))
+        case Next(arg, steps) | StrongNext(arg, steps):
+            if last:
+                return _TRUE if isinstance(expr, Next) else _FALSE
+            return arg if steps is None else _interned(type(expr)(arg, steps - 1))
+        case Eventually(arg, interval) | Always(arg, interval):
+            rest = _progress_rest(expr, last)
+            if interval.start:
+                return rest
+            return _junction(Or if isinstance(expr, Eventually) else And, [_progress(arg, state, last), rest])
+        case (
+            Until(lhs, rhs, interval)
+            | WeakUntil(lhs, rhs, interval)
+            | Release(lhs, rhs, interval)
+            | StrongRelease(lhs, rhs, interval)
+        ):
+            # ``f U g`` is ``g | (f & X (f U g))``, and ``f R g`` its dual ``g & (f | X (f R g))``.
+            rest = _progress_rest(expr, last)
+            inner, outer = (And, Or) if isinstance(expr, (Until, WeakUntil)) else (Or, And)
+            held = _junction(inner, [_progress(lhs, state, last), rest])
+            if interval.start:
+                return held
+            return _junction(outer, [_progress(rhs, state, last), held])
+        case _:
+            raise TypeError(f"LTL progression only possible for LTL expressions, got {type(expr)}")
+
+
+def _progress_rest(
+    expr: Eventually[LTLExpr[Var]]
+    | Always[LTLExpr[Var]]
+    | Until[LTLExpr[Var]]
+    | WeakUntil[LTLExpr[Var]]
+    | Release[LTLExpr[Var]]
+    | StrongRelease[LTLExpr[Var]],
+    last: bool,
+) -> LTLExpr[Var]:
+    """What a temporal operator requires from the steps after the current one: itself, with its window moved by one step.
+
+    With ``last``, there are no such steps, and this is the value of that
+    formula on the empty rest of the trace.
+    """
+    interval = expr.interval
+    start, end = interval.start or 0, interval.end
+    # ``F``, ``U`` and ``M`` need a step of their window to exist; the others hold on an empty one.
+    existential = isinstance(expr, (Eventually, Until, StrongRelease))
+    if end == 0:
+        return _FALSE if existential else _TRUE
+    if last:
+        match expr:
+            case Eventually(strong=strong):
+                # As in the expansion with weak ``X``, steps past the end of the trace satisfy bounded windows.
+                value = not strong and (start > 0 or end is not None)
+            case Always(strong=strong):
+                value = not strong or (start == 0 and end is None)
+            case _:
+                value = not existential
+        return _TRUE if value else _FALSE
+    if start == 0 and end is None:
+        return expr
+    if start == 0 and end == 1:
+        # The window is down to the next step, where the operator is decided.
+        match expr:
+            case Eventually(arg) | Always(arg) | Until(_, arg) | Release(_, arg):
+                return arg
+            case WeakUntil(lhs, rhs):
+                return _junction(Or, [rhs, lhs])
+            case StrongRelease(lhs, rhs):
+                return _junction(And, [lhs, rhs])
+    later = TimeInterval(start - 1 if start else interval.start, None if end is None else end - 1)
+    return _interned(attrs.evolve(expr, interval=later))
+
+
+def _interned[E: Expr](node: E) -> E:
+    """:func:`~logic_asts.interning.intern` for a new node whose operands are interned: one lookup when it exists."""
+    existing = _UNIQUE.get(_key(node))
+    return intern(node) if existing is None else cast(E, existing)
+
+
+def _not(arg: LTLExpr[Var]) -> LTLExpr[Var]:
+    match arg:
+        case Literal(value):
+            return _FALSE if value else _TRUE
+        case Not(inner):
+            return inner
+        case _:
+            return _interned(Not(arg))
+
+
+def _junction(cls: type[And[typing.Any] | Or[typing.Any]], args: Iterable[LTLExpr[Var]]) -> LTLExpr[Var]:
+    """``And`` or ``Or`` of ``args``, simplified: flattened, without constants or duplicates."""
+    absorbing = cls is Or
+    # Operands are interned: a dict removes duplicates in constant time, and keeps their order.
+    kept: dict[LTLExpr[Var], None] = {}
+    for arg in args:
+        if isinstance(arg, Literal):
+            if arg.value is absorbing:
+                return arg
+            continue
+        for operand in arg.args if isinstance(arg, cls) else (arg,):
+            kept[operand] = None
+    if any(isinstance(operand, Not) and operand.arg in kept for operand in kept):
+        return _TRUE if absorbing else _FALSE
+    if len(kept) < 2:
+        return next(iter(kept), _FALSE if absorbing else _TRUE)
+    return _interned(cls(tuple(kept)))
+
+
 __all__ = [
     "LTLExpr",
     "TimeInterval",
@@ -959,4 +1596,8 @@ __all__ = [
     "StrongRelease",
     "ltl_expr_iter",
     "is_ltl_node",
+    "evaluate",
+    "evaluate_batch",
+    "evaluate_packed",
+    "progress",
 ]
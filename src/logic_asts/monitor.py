@@ -0,0 +1,842 @@
+r"""Online monitoring of LTL formulas over a stream of states.
+
+An :class:`LTLMonitor` consumes a trace one state, or one batch of states, at a
+time, and emits the :class:`Verdict` of the formula at every step of the stream
+(its value on the suffix that starts there, as in :func:`logic_asts.ltl.evaluate`)
+as soon as enough of the stream has been seen.
+
+The value at a step only depends on the following :meth:`Expr.horizon()
+<logic_asts.spec.Expr.horizon>` steps. So for a bounded formula the monitor
+buffers that many states and emits exact verdicts, with a constant delay, in
+constant memory and constant time per state, however long the stream. An
+unbounded formula generally cannot be decided before the stream ends: the
+monitor buffers a fixed ``lookahead`` of states and emits three-valued
+verdicts, which are inconclusive unless every continuation of the stream
+(including its end) agrees on the value.
+
+Examples:
+    >>> from logic_asts import parse_expr
+    >>> monitor = LTLMonitor(parse_expr("req -> F[0, 2] grant", syntax="ltl"))
+    >>> monitor.step({"req"}), monitor.step(set()), monitor.step({"grant"})
+    ([], [], [<Verdict.TRUE: 'true'>])
+    >>> monitor.extend({"req": [True, False], "grant": [False, False]})
+    [<Verdict.TRUE: 'true'>, <Verdict.TRUE: 'true'>]
+    >>> monitor.finish()
+    [<Verdict.TRUE: 'true'>, <Verdict.TRUE: 'true'>]
+"""
+
+from __future__ import annotations
+
+import collections
+import enum
+import math
+import operator
+import typing
+from collections.abc import Hashable, Mapping, Sequence
+from collections.abc import Set as AbstractSet
+from typing import final
+
+from logic_asts.base import And, Equiv, Implies, Literal, Not, Or, Variable, Xor
+from logic_asts.ltl import (
+    Always,
+    Eventually,
+    LTLExpr,
+    Next,
+    Release,
+    StrongNext,
+    StrongRelease,
+    TimeInterval,
+    Until,
+    WeakUntil,
+    _evaluate_node,
+    _first_true,
+    _offsets,
+    _shift,
+    evaluate,
+    is_ltl_node,
+    ltl_expr_iter,
+)
+from logic_asts.spec import Expr
+from logic_asts.utils import bool_columns, last_uses
+
+if typing.TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+    _Bounds = tuple[npt.NDArray[np.bool_], npt.NDArray[np.bool_]]
+
+
+@final
+class Verdict(enum.Enum):
+    """The verdict of a monitor on one step of a stream.
+
+    Attributes:
+        FALSE: The formula is false at the step, whatever the rest of the stream.
+        INCONCLUSIVE: The states seen so far do not decide the formula at the step.
+        TRUE: The formula is true at the step, whatever the rest of the stream.
+    """
+
+    FALSE = "false"
+    INCONCLUSIVE = "inconclusive"
+    TRUE = "true"
+
+
+# Indexed by ``lower + upper`` bound of the value of a step.
+_VERDICTS = (Verdict.FALSE, Verdict.INCONCLUSIVE, Verdict.TRUE)
+
+# Below this many states, a batch of exact verdicts is cheaper to compute state
+# by state than by re-evaluating the buffered states with it.
+_MAX_STEPPED_BATCH = 32
+
+
+def _horizons(node: Expr, horizons: tuple[tuple[float, float], ...]) -> tuple[float, float]:
+    """The horizon of ``node``, and the largest finite horizon of its subformulas."""
+    horizon = node._horizon_node(tuple(h for h, _ in horizons))
+    settled = max((s for _, s in horizons), default=0)
+    return horizon, settled if math.isinf(horizon) else max(settled, horizon)
+
+
+def _eventually(values: npt.NDArray[np.bool_], interval: TimeInterval, *, pad: bool) -> npt.NDArray[np.bool_]:
+    """``F[a, b]`` on a trace that goes on forever with ``values`` equal to ``pad`` past its end."""
+    import numpy as np
+
+    n = len(values)
+    start, end = interval.start or 0, interval.end
+    counts = np.append(0, np.cumsum(values))
+    found = counts[n if end is None else _offsets(n, n, end + 1)] > counts[_offsets(n, n, start)]
+    if pad:
+        if end is None:
+            return np.ones(n, dtype=np.bool_)
+        found |= np.arange(n) + end >= n
+    return found
+
+
+def _always(values: npt.NDArray[np.bool_], interval: TimeInterval, *, pad: bool) -> npt.NDArray[np.bool_]:
+    """``G[a, b]``, as the dual ``!F[a, b] !``."""
+    import numpy as np
+
+    return np.logical_not(_eventually(np.logical_not(values), interval, pad=not pad))
+
+
+def _until(
+    lhs: npt.NDArray[np.bool_], rhs: npt.NDArray[np.bool_], interval: TimeInterval, *, pad: bool
+) -> npt.NDArray[np.bool_]:
+    """``lhs U[a, b] rhs`` on a trace that goes on forever with both operands equal to ``pad`` past its end.
+
+    As in :func:`logic_asts.ltl.evaluate`; with ``pad``, the first step past
+    the end of the trace is where ``rhs`` holds, if no step of the trace is.
+    """
+    import numpy as np
+
+    n = len(lhs)
+    start, end = interval.start or 0, interval.end
+    found = _first_true(rhs)[_offsets(n, n, start)]
+    holds = found <= _first_true(np.logical_not(lhs))[:n]
+    if not pad:
+        holds &= found < n
+    if end is not None:
+        holds &= found <= np.arange(n) + end
+    return holds
+
+
+def _weak_until(
+    lhs: npt.NDArray[np.bool_], rhs: npt.NDArray[np.bool_], interval: TimeInterval, *, pad: bool
+) -> npt.NDArray[np.bool_]:
+    """``lhs W[a, b] rhs``, as ``lhs U[a, b] rhs | G[0, b] lhs``."""
+    import numpy as np
+
+    lhs_holds = _always(lhs, TimeInterval(None, interval.end), pad=pad)
+    return np.logical_or(_until(lhs, rhs, interval, pad=pad), lhs_holds)
+
+
+def _bounds[Var: Hashable](
+    order: Sequence[LTLExpr[Var]], column: typing.Callable[[Var], npt.NDArray[np.bool_] | None], n: int
+) -> _Bounds:
+    """Lower and upper bounds of the values of ``order[-1]`` on every continuation of a trace of ``n`` steps.
+
+    ``order`` lists the distinct subformulas in post-order. The continuation may
+    also be empty. Every operator is monotone in its operands, and each bound
+    is computed from the same bound of the operands (or the other one, under
+    negation), with the steps past the end of the trace false for the lower
+    bound and true for the upper one.
+    """
+    import numpy as np
+
+    last_use = last_uses(order)
+    cache: dict[LTLExpr[Var], _Bounds] = dict()
+    for position, subexpr in enumerate(order):
+        lo: npt.NDArray[np.bool_]
+        hi: npt.NDArray[np.bool_]
+        match subexpr:
+            case Literal(literal):
+                lo = hi = np.full(n, literal)
+            case Variable(name):
+                data = column(name)
+                lo = hi = np.zeros(n, dtype=np.bool_) if data is None else data
+            case Not(arg):
+                lo, hi = np.logical_not(cache[arg][1]), np.logical_not(cache[arg][0])
+            case Or(args) | And(args):
+                ufunc = np.logical_or if isinstance(subexpr, Or) else np.logical_and
+                lo = ufunc.reduce([cache[arg][0] for arg in args])
+                hi = ufunc.reduce([cache[arg][1] for arg in args])
+            case Xor(lhs, rhs) | Equiv(lhs, rhs):
+                (lhs_lo, lhs_hi), (rhs_lo, rhs_hi) = cache[lhs], cache[rhs]
+                differ_lo = (lhs_lo & ~rhs_hi) | (~lhs_hi & rhs_lo)
+                differ_hi = (lhs_hi & ~rhs_lo) | (~lhs_lo & rhs_hi)
+                lo, hi = (differ_lo, differ_hi) if isinstance(subexpr, Xor) else (~differ_hi, ~differ_lo)
+            case Implies(lhs, rhs):
+                lo = np.logical_or(np.logical_not(cache[lhs][1]), cache[rhs][0])
+                hi = np.logical_or(np.logical_not(cache[lhs][0]), cache[rhs][1])
+            case Next(arg, steps) | StrongNext(arg, steps):
+                lo = _shift(cache[arg][0], steps or 1, n, strong=True)
+                hi = _shift(cache[arg][1], steps or 1, n, strong=False)
+            case Eventually(arg, interval):
+                lo = _eventually(cache[arg][0], interval, pad=False)
+                hi = _eventually(cache[arg][1], interval, pad=True)
+            case Always(arg, interval):
+                lo = _always(cache[arg][0], interval, pad=False)
+                hi = _always(cache[arg][1], interval, pad=True)
+            case Until(lhs, rhs, interval) | WeakUntil(lhs, rhs, interval):
+                until = _until if isinstance(subexpr, Until) else _weak_until
+                lo = until(cache[lhs][0], cache[rhs][0], interval, pad=False)
+                hi = until(cache[lhs][1], cache[rhs][1], interval, pad=True)
+            case Release(lhs, rhs, interval) | StrongRelease(lhs, rhs, interval):
+                # ``!(!lhs U !rhs)``: the negated operands swap their bounds, and so does the result.
+                until = _until if isinstance(subexpr, Release) else _weak_until
+                (lhs_lo, lhs_hi), (rhs_lo, rhs_hi) = cache[lhs], cache[rhs]
+                lo = np.logical_not(until(~lhs_lo, ~rhs_lo, interval, pad=True))
+                hi = np.logical_not(until(~lhs_hi, ~rhs_hi, interval, pad=False))
+            case _:
+                raise TypeError(f"LTL monitoring only possible for LTL expressions, got {type(subexpr)}")
+        cache[subexpr] = (lo, hi)
+        for child in subexpr.children():
+            if last_use.get(child) == position:
+                cache.pop(typing.cast(LTLExpr[Var], child), None)
+    return cache[order[-1]]
+
+
+# Computes the value of a subformula from the time step and the current state
+# (one truth value per atom), or returns ``None`` before its first value.
+_Cell = typing.Callable[[int, Sequence[bool]], bool | None]
+
+
+class _Stepper[Var: Hashable]:
+    r"""Exact evaluation of a bounded formula, one state at a time.
+
+    When state ``t`` arrives, every distinct subformula ``f`` computes its value
+    at step ``t - horizon(f)``, the first one that state ``t`` decides, from
+    the values its operands computed at this or earlier time steps:
+
+    - Boolean operators read the values of their operands at the same step
+      from a ring buffer, as long as the largest difference of horizons.
+    - ``X[n] f`` is the value ``f`` just computed.
+    - ``F[a, b] f`` and ``G[a, b] f`` keep the last step where ``f`` held, or
+      failed: the monotone deque of a sliding maximum (minimum) of booleans
+      only ever holds its last element.
+    - ``U``, ``W``, ``R`` and ``M`` keep monotone deques of the steps where
+      ``rhs`` holds, and ``lhs`` fails, in the window, so that both the first
+      such steps are at the front.
+
+    So each state costs :math:`O(|\phi|)` amortized time, whatever the width
+    of the windows, and the memory is bounded by the horizon. Weak and strong
+    operators only differ at the end of the trace, which is never seen here.
+    """
+
+    def __init__(self, order: Sequence[LTLExpr[Var]], columns: Mapping[Var, int]) -> None:
+        index: dict[Expr, int] = {node: k for k, node in enumerate(order)}
+        delays: list[int] = []
+        for node in order:
+            delays.append(int(node._horizon_node(tuple(delays[index[child]] for child in node.children()))))
+        # How far back the Boolean operators read the values of each subformula.
+        lags = [0] * len(order)
+        for node, delay in zip(order, delays, strict=True):
+            if isinstance(node, (Not, And, Or, Xor, Equiv, Implies)):
+                for child in node.children():
+                    lags[index[child]] = max(lags[index[child]], delay - delays[index[child]])
+        self._rings = [[False] * (lag + 1) for lag in lags]
+        self._latest: list[bool | None] = [None] * len(order)
+        self._delays = delays
+        self._cells = [self._cell(node, index, columns) for node in order]
+        self._time = 0
+
+    def push(self, state: Sequence[bool]) -> bool | None:
+        """Consume the next state, and return the value of the formula it decides, if any."""
+        t = self._time
+        self._time += 1
+        latest, rings, delays = self._latest, self._rings, self._delays
+        for k, cell in enumerate(self._cells):
+            value = latest[k] = cell(t, state)
+            if value is not None:
+                ring = rings[k]
+                ring[(t - delays[k]) % len(ring)] = value
+        return latest[-1]
+
+    def _cell(self, node: LTLExpr[Var], index: Mapping[Expr, int], columns: Mapping[Var, int]) -> _Cell:
+        latest, rings, delay = self._latest, self._rings, self._delays[index[node]]
+
+        def operand(child: LTLExpr[Var]) -> typing.Callable[[int], bool]:
+            ring = rings[index[child]]
+            size = len(ring)
+            return lambda i: ring[i % size]
+
+        match node:
+            case Literal(value):
+                return lambda t, state: value
+            case Variable(name):
+                column = columns[name]
+                return lambda t, state: state[column]
+            case Not(arg):
+                arg_at = operand(arg)
+                return lambda t, state: None if t < delay else not arg_at(t - delay)
+            case And(args) | Or(args):
+                reduce = all if isinstance(node, And) else any
+                args_at = [operand(arg) for arg in args]
+                return lambda t, state: None if t < delay else reduce(at(t - delay) for at in args_at)
+            case Xor(lhs, rhs) | Equiv(lhs, rhs) | Implies(lhs, rhs):
+                lhs_at, rhs_at = operand(lhs), operand(rhs)
+                op: typing.Callable[[bool, bool], bool] = (
+                    operator.ne if isinstance(node, Xor) else operator.eq if isinstance(node, Equiv) else operator.le
+                )
+                return lambda t, state: None if t < delay else op(lhs_at(t - delay), rhs_at(t - delay))
+            case Next(arg) | StrongNext(arg):
+                k = index[arg]
+                return lambda t, state: None if t < delay else latest[k]
+            case Eventually(arg, interval) | Always(arg, interval):
+                return self._window_cell(index[arg], interval, delay, isinstance(node, Eventually))
+            case Until(lhs, rhs, interval) | WeakUntil(lhs, rhs, interval):
+                return self._until_cell(index[lhs], index[rhs], interval, delay, isinstance(node, WeakUntil), False)
+            case Release(lhs, rhs, interval) | StrongRelease(lhs, rhs, interval):
+                # ``!(!lhs U !rhs)``, and ``!(!lhs W !rhs)``.
+                return self._until_cell(index[lhs], index[rhs], interval, delay, isinstance(node, StrongRelease), True)
+            case _:
+                raise TypeError(f"LTL monitoring only possible for LTL expressions, got {type(node)}")
+
+    def _window_cell(self, arg: int, interval: TimeInterval, delay: int, holds: bool) -> _Cell:
+        """``F[a, b]`` (``holds``) or ``G[a, b]``: whether the last step where ``arg`` is ``holds`` is in the window."""
+        latest, arg_delay, start = self._latest, self._delays[arg], interval.start or 0
+        last = -1
+
+        def cell(t: int, state: Sequence[bool]) -> bool | None:
+            nonlocal last
+            if latest[arg] is holds:
+                last = t - arg_delay
+            if t < delay:
+                return None
+            return (last >= t - delay + start) is holds
+
+        return cell
+
+    def _until_cell(self, lhs: int, rhs: int, interval: TimeInterval, delay: int, weak: bool, negate: bool) -> _Cell:
+        """``lhs U[a, b] rhs`` (or ``W``), on the operands negated if ``negate``, and negated itself."""
+        latest, lhs_delay, rhs_delay = self._latest, self._delays[lhs], self._delays[rhs]
+        start, end = interval.start or 0, typing.cast(int, interval.end)
+        # The steps where ``rhs`` holds from ``i + a`` on, and where ``lhs`` fails from ``i`` on.
+        found: collections.deque[int] = collections.deque()
+        fails: collections.deque[int] = collections.deque()
+
+        def cell(t: int, state: Sequence[bool]) -> bool | None:
+            if latest[rhs] is not None and latest[rhs] is not negate:
+                found.append(t - rhs_delay)
+            if latest[lhs] is not None and latest[lhs] is negate:
+                fails.append(t - lhs_delay)
+            if t < delay:
+                return None
+            i = t - delay
+            while found and found[0] < i + start:
+                found.popleft()
+            while fails and fails[0] < i:
+                fails.popleft()
+            first_fail = fails[0] if fails else math.inf
+            holds = bool(found) and found[0] <= i + end and found[0] <= first_fail
+            if weak:
+                holds = holds or first_fail > i + end
+            return holds is not negate
+
+        return cell
+
+
+class LTLMonitor[Var: Hashable]:
+    r"""Monitor an LTL formula online, over a stream of states.
+
+    Feed the stream with :meth:`step` (one state) or :meth:`extend` (a batch of
+    states). Both return the verdicts of the steps of the stream that they
+    settle, in order: the verdict of step ``i`` is emitted once step
+    ``i + lookahead`` has been seen, and :meth:`finish` emits the remaining
+    ones when the stream ends. :attr:`position` counts the verdicts emitted.
+
+    Only the last ``lookahead`` states are buffered, so memory and the time
+    spent per state do not depend on how much of the stream has been seen.
+    With a ``lookahead`` of at least the :meth:`~logic_asts.spec.Expr.horizon`
+    of the formula, which is the default for bounded formulas, every verdict is
+    exact: :data:`Verdict.TRUE` or :data:`Verdict.FALSE`, as
+    :func:`logic_asts.ltl.evaluate` on the whole stream would give. Otherwise
+    (by default, for unbounded formulas, the largest horizon of their bounded
+    subformulas), verdicts are three-valued: :data:`Verdict.INCONCLUSIVE`
+    unless every continuation of the states seen so far agrees on the value.
+    These are sound but not complete, since each subformula is bounded
+    separately, and :meth:`extend` may settle the early steps of a batch on
+    more states than :meth:`step` would. The verdicts emitted by
+    :meth:`finish` are always exact.
+
+    For exact verdicts, :meth:`step` updates the value of every subformula
+    incrementally, in time independent of the horizon and of the width of the
+    windows. :meth:`extend` evaluates the buffered states and the batch with
+    vectorized passes instead, which is much cheaper per state for large
+    batches.
+
+    Requires NumPy (install the ``numpy`` extra).
+
+    Type Parameters:
+        Var: The variable type used in the expression.
+
+    Arguments:
+        expr: The LTL formula to monitor.
+        lookahead: The number of states seen past a step before its verdict is
+            emitted.
+
+    Raises:
+        TypeError: If the expression contains operators not in LTL.
+        ValueError: If ``lookahead`` is negative.
+
+    Examples:
+        >>> from logic_asts import parse_expr
+        >>> monitor = LTLMonitor(parse_expr("G (req -> X grant)", syntax="ltl"))
+        >>> monitor.lookahead
+        1
+        >>> monitor.step({"req"}), monitor.step({"grant"}), monitor.step({"req"})
+        ([], [<Verdict.INCONCLUSIVE: 'inconclusive'>], [<Verdict.INCONCLUSIVE: 'inconclusive'>])
+        >>> monitor.step(set())
+        [<Verdict.FALSE: 'false'>]
+        >>> monitor.finish()
+        [<Verdict.TRUE: 'true'>]
+    """
+
+    def __init__(self, expr: LTLExpr[Var], lookahead: int | None = None) -> None:
+        if not is_ltl_node(expr):
+            raise TypeError(f"LTL monitoring only possible for LTL expressions, got {type(expr)}")
+        self.expr: LTLExpr[Var] = expr
+        self._order: list[LTLExpr[Var]] = list(dict.fromkeys(ltl_expr_iter(expr)))
+        horizon, settled = expr.fold(_horizons)
+        if lookahead is None:
+            lookahead = int(settled if math.isinf(horizon) else horizon)
+        elif lookahead < 0:
+            raise ValueError(f"lookahead must be non-negative (got {lookahead})")
+        self.horizon = horizon
+        self.lookahead = lookahead
+        self._exact = lookahead >= horizon
+        self._atoms = tuple(dict.fromkeys(node.name for node in self._order if isinstance(node, Variable)))
+        self._columns = {atom: position for position, atom in enumerate(self._atoms)}
+        self._states: collections.deque[tuple[bool, ...]] = collections.deque(maxlen=lookahead)
+        # With exact verdicts, ``step`` evaluates the formula incrementally: the
+        # stepper is built from the buffered states when needed, and its values
+        # wait in ``_pending`` until ``lookahead`` (not just ``horizon``) states
+        # have been seen past them.
+        self._stepper: _Stepper[Var] | None = None
+        self._pending: collections.deque[bool] = collections.deque()
+        self.position = 0
+
+    def step(self, state: AbstractSet[Var]) -> list[Verdict]:
+        """Consume the next state of the stream, given as the set of atoms that hold in it.
+
+        Returns:
+            The verdicts of the steps of the stream settled by this state.
+        """
+        import numpy as np
+
+        row = tuple(atom in state for atom in self._atoms)
+        if not self._exact:
+            return self._advance(np.array([row], dtype=np.bool_).reshape(1, len(row)))
+        return self._step(row)
+
+    def extend(
+        self,
+        states: Mapping[Var, npt.ArrayLike] | npt.ArrayLike,
+        index: Mapping[Var, int] | Sequence[Var] | None = None,
+    ) -> list[Verdict]:
+        """Consume the next states of the stream, given as a trace of :func:`logic_asts.ltl.evaluate`.
+
+        Returns:
+            The verdicts of the steps of the stream settled by these states.
+
+        Raises:
+            TypeError: If ``index`` is missing or misplaced.
+            ValueError: If the states do not have the expected shape.
+        """
+        import numpy as np
+
+        n, column = bool_columns(states, index)
+        batch = np.zeros((n, len(self._atoms)), dtype=np.bool_)
+        for position, atom in enumerate(self._atoms):
+            data = column(atom, 0, n)
+            if data is not None:
+                batch[:, position] = data
+        if self._exact and n <= _MAX_STEPPED_BATCH:
+            return [verdict for row in batch.tolist() for verdict in self._step(tuple(row))]
+        return self._advance(batch)
+
+    def finish(self) -> list[Verdict]:
+        """End the stream, and return the (exact) verdicts of the steps not emitted yet.
+
+        The monitor is then ready for a new stream, and :attr:`position` is reset.
+        """
+        values = evaluate(self.expr, self._window(), index=self._atoms)
+        self.position = 0
+        self._states.clear()
+        self._stepper = None
+        return [Verdict.TRUE if value else Verdict.FALSE for value in values.tolist()]
+
+    def _step(self, row: tuple[bool, ...]) -> list[Verdict]:
+        if self._stepper is None:
+            self._stepper = _Stepper(self._order, self._columns)
+            self._pending.clear()
+            for buffered in self._states:
+                self._push(buffered)
+        self._states.append(row)
+        self._push(row)
+        if len(self._pending) <= self.lookahead - self.horizon:
+            return []
+        self.position += 1
+        return [Verdict.TRUE if self._pending.popleft() else Verdict.FALSE]
+
+    def _push(self, state: tuple[bool, ...]) -> None:
+        value = typing.cast(_Stepper[Var], self._stepper).push(state)
+        if value is not None:
+            self._pending.append(value)
+
+    def _window(self, batch: npt.NDArray[np.bool_] | None = None) -> npt.NDArray[np.bool_]:
+        """The buffered states, followed by ``batch``, as a 2-D array."""
+        import numpy as np
+
+        buffered = np.array(self._states, dtype=np.bool_).reshape(len(self._states), len(self._atoms))
+        return buffered if batch is None else np.concatenate((buffered, batch))
+
+    def _advance(self, batch: npt.NDArray[np.bool_]) -> list[Verdict]:
+        import numpy as np
+
+        window = self._window(batch)
+        if self.lookahead:
+            self._states.extend(map(tuple, batch[-self.lookahead :].tolist()))
+        self._stepper = None
+        ready = len(window) - self.lookahead
+        if ready <= 0:
+            return []
+        self.position += ready
+        if self._exact:
+            values = evaluate(self.expr, window, index=self._atoms)[:ready]
+            return [Verdict.TRUE if value else Verdict.FALSE for value in values.tolist()]
+
+        def column(atom: Var) -> npt.NDArray[np.bool_] | None:
+            return np.ascontiguousarray(window[:, self._columns[atom]])
+
+        lo, hi = _bounds(self._order, column, len(window))
+        codes = lo[:ready].astype(np.intp) + hi[:ready]
+        return [_VERDICTS[code] for code in codes.tolist()]
+
+
+class _Signal:
+    """The values of a subformula from step ``offset`` up to the end of the trace, in a growing buffer.
+
+    ``settled`` counts the first steps whose value no extension of the trace
+    can change, and ``scanned`` the first steps of the operands already
+    searched for the steps that settle an unbounded operator. The unsettled
+    steps of an unbounded operator before ``scanned`` share a value, the
+    ``block`` of steps ``[start, stop)`` last filled with it.
+    """
+
+    __slots__ = ("block", "buffer", "offset", "scanned", "settled")
+
+    def __init__(self) -> None:
+        import numpy as np
+
+        self.buffer: npt.NDArray[np.bool_] = np.zeros(0, dtype=np.bool_)
+        self.offset = 0
+        self.settled = 0
+        self.scanned = 0
+        self.block: tuple[int, int, bool] | None = None
+
+    def get(self, start: int, stop: int) -> npt.NDArray[np.bool_]:
+        return self.buffer[start - self.offset : stop - self.offset]
+
+    def put(self, start: int, values: npt.NDArray[np.bool_] | bool, stop: int | None = None) -> None:
+        """Set steps ``[start, stop)`` to ``values``, by default as many as there are ``values``."""
+        import numpy as np
+
+        stop = start + len(typing.cast("npt.NDArray[np.bool_]", values)) if stop is None else stop
+        if stop - self.offset > len(self.buffer):
+            # Doubling the capacity keeps appends amortized constant time per step.
+            buffer = np.zeros(max(stop - self.offset, 2 * len(self.buffer)), dtype=np.bool_)
+            buffer[: len(self.buffer)] = self.buffer
+            self.buffer = buffer
+        self.buffer[start - self.offset : stop - self.offset] = values
+
+    def first_change(self, start: int, values: npt.NDArray[np.bool_] | bool, stop: int) -> int | None:
+        """The first step in ``[start, stop)`` whose value differs from ``values``, if any.
+
+        ``values`` starts at step ``start``, and compares equal past its end.
+        """
+        import numpy as np
+
+        end = stop if isinstance(values, bool) else min(stop, start + len(values))
+        if start >= end:
+            return None
+        old = self.get(start, end)
+        differs = np.flatnonzero(old != (values if isinstance(values, bool) else values[: end - start]))
+        return start + int(differs[0]) if len(differs) else None
+
+    def drop(self, start: int, stop: int) -> None:
+        """Forget the values before ``start``, once they take most of the buffer."""
+        if 2 * (start - self.offset) > len(self.buffer):
+            self.buffer = self.buffer[start - self.offset : max(stop, start) - self.offset].copy()
+            self.offset = start
+
+
+def _interval(node: Expr) -> TimeInterval | None:
+    match node:
+        case Eventually(_, interval) | Always(_, interval):
+            return interval
+        case Until(_, _, interval) | WeakUntil(_, _, interval) | Release(_, _, interval) | StrongRelease(_, _, interval):
+            return interval
+        case _:
+            return None
+
+
+def _reach(node: Expr) -> tuple[int, ...] | None:
+    """How many steps ahead an operator reads each of its operands, or ``None`` for an unbounded one."""
+    interval = _interval(node)
+    match node:
+        case Next(_, steps) | StrongNext(_, steps):
+            return (steps or 1,)
+        case _ if interval is None:
+            return tuple(0 for _ in node.children())
+        case _ if interval.end is None:
+            return None
+        case Until() | Release():
+            # ``lhs`` only needs to hold before the step where ``rhs`` does.
+            return (interval.end - 1, interval.end)
+        case _:
+            return tuple(interval.end for _ in node.children())
+
+
+class IncrementalEvaluator[Var: Hashable]:
+    r"""The value of an LTL formula at every step of a growing finite trace (LTLf).
+
+    Feed the trace with :meth:`append` (one state) or :meth:`extend` (a batch
+    of states); :attr:`values` is then :func:`logic_asts.ltl.evaluate` on the
+    whole trace so far. Extending a trace only changes the values of some
+    steps, so each subformula is only re-evaluated on the steps whose value
+    may change: those that read operands that changed, or the end of the
+    trace, and are not :attr:`settled` yet, which no extension can change.
+    These are the last :meth:`~logic_asts.spec.Expr.horizon` steps for a
+    bounded subformula. For an unbounded one, the steps after the last one
+    that decides it (e.g. where ``p`` holds, for ``F p``) all share the same
+    value, up to the unsettled steps of its operands, so only where that
+    value changes are they updated. Subformulas only keep the values that
+    their parents may read again.
+
+    So appending ``k`` states costs :math:`O((k + h) \cdot |\phi|)` for a
+    bounded formula of horizon ``h``, however long the trace; unbounded
+    subformulas add the number of steps whose value changes, and those of
+    their operands that are unsettled (as for ``F p`` in ``G F p``, between
+    two steps where ``p`` holds).
+
+    Requires NumPy (install the ``numpy`` extra).
+
+    Type Parameters:
+        Var: The variable type used in the expression.
+
+    Arguments:
+        expr: The LTL formula to evaluate.
+
+    Raises:
+        TypeError: If the expression contains operators not in LTL.
+
+    Examples:
+        >>> from logic_asts import parse_expr
+        >>> evaluator = IncrementalEvaluator(parse_expr("F[0, 1!] p", syntax="ltl"))
+        >>> evaluator.extend({"p": [False, False, False]})
+        0
+        >>> evaluator.values, evaluator.settled
+        (array([False, False, False]), 2)
+        >>> evaluator.append({"p"})
+        2
+        >>> evaluator.values
+        array([False, False,  True,  True])
+    """
+
+    def __init__(self, expr: LTLExpr[Var]) -> None:
+        if not is_ltl_node(expr):
+            raise TypeError(f"LTL evaluation only possible for LTL expressions, got {type(expr)}")
+        self.expr: LTLExpr[Var] = expr
+        self._order: list[LTLExpr[Var]] = list(dict.fromkeys(ltl_expr_iter(expr)))
+        self._signals: dict[Expr, _Signal] = {node: _Signal() for node in self._order}
+        self._parents: dict[Expr, list[Expr]] = {node: [] for node in self._order}
+        for node in self._order:
+            for child in dict.fromkeys(node.children()):
+                self._parents[child].append(node)
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def values(self) -> npt.NDArray[np.bool_]:
+        """The value of the formula at every step of the trace so far (a read-only view)."""
+        values = self._signals[self.expr].get(0, self._length)
+        values.flags.writeable = False
+        return values
+
+    @property
+    def settled(self) -> int:
+        """The number of first steps of the trace whose value no extension of it can change."""
+        return self._signals[self.expr].settled
+
+    def append(self, state: AbstractSet[Var]) -> int:
+        """Append a state to the trace, given as the set of atoms that hold in it.
+
+        Returns:
+            The first step whose value changed, or the new step.
+        """
+        import numpy as np
+
+        def column(atom: Var, start: int, stop: int) -> npt.NDArray[np.bool_]:
+            return np.array([atom in state], dtype=np.bool_)
+
+        return self._extend(1, column)
+
+    def extend(
+        self,
+        states: Mapping[Var, npt.ArrayLike] | npt.ArrayLike,
+        index: Mapping[Var, int] | Sequence[Var] | None = None,
+    ) -> int:
+        """Append states to the trace, given as a trace of :func:`logic_asts.ltl.evaluate`.
+
+        Returns:
+            The first step whose value changed, or the first new step.
+
+        Raises:
+            TypeError: If ``index`` is missing or misplaced.
+            ValueError: If the states do not have the expected shape.
+        """
+        n, column = bool_columns(states, index)
+        return self._extend(n, column)
+
+    def _extend(self, n: int, column: typing.Callable[[Var, int, int], npt.NDArray[np.bool_] | None]) -> int:
+        import numpy as np
+
+        start, stop = self._length, self._length + n
+        # The first step of each subformula whose value changed, or ``start``.
+        changed: dict[Expr, int] = {}
+        for node in self._order:
+            signal = self._signals[node]
+            settled = signal.settled
+            match node:
+                case Literal(literal):
+                    signal.put(start, np.full(n, literal))
+                    changed[node] = start
+                case Variable(name):
+                    data = column(name, 0, n)
+                    signal.put(start, np.zeros(n, dtype=np.bool_) if data is None else data)
+                    changed[node] = start
+                case _:
+                    self._settle(node, signal)
+                    reach = _reach(node)
+                    if reach is None:
+                        changed[node] = self._update_unbounded(node, signal, settled, start, stop)
+                    else:
+                        children = zip(node.children(), reach, strict=True)
+                        first = max(settled, min(changed[child] - steps for child, steps in children))
+                        values = self._evaluate(node, first, stop)
+                        change = signal.first_change(first, values, start)
+                        changed[node] = start if change is None else change
+                        signal.put(first, values)
+            if isinstance(node, Literal | Variable):
+                signal.settled = stop
+        self._length = stop
+        for node in self._order:
+            if node is not self.expr:
+                self._signals[node].drop(min(self._reads_from(parent) for parent in self._parents[node]), stop)
+        return changed[self.expr]
+
+    def _reads_from(self, node: Expr) -> int:
+        """The first step of its operands that a node may read again."""
+        signal = self._signals[node]
+        match node:
+            case Eventually(_, interval) | Always(_, interval) if interval.end is None:
+                # Settled steps are filled, and the others read from the start of the tail.
+                return max(signal.settled, signal.scanned - (interval.start or 0) - 1)
+            case _:
+                return signal.settled
+
+    def _evaluate(self, node: LTLExpr[Var], start: int, stop: int) -> npt.NDArray[np.bool_]:
+        """The values of ``node`` on the steps ``[start, stop)``, as if the trace ended at ``stop``."""
+        return _evaluate_node(node, lambda child: self._signals[child].get(start, stop), stop - start)
+
+    def _update_unbounded(self, node: LTLExpr[Var], signal: _Signal, settled: int, start: int, stop: int) -> int:
+        """Update an unbounded operator from its first step ``settled`` before this update."""
+        offset = typing.cast(TimeInterval, _interval(node)).start or 0
+        changes: list[int | None] = []
+        if signal.settled > settled:
+            if isinstance(node, Eventually | Always):
+                # The steps that just settled are decided by a step where ``F`` holds, or ``G`` fails.
+                decided: npt.NDArray[np.bool_] | bool = isinstance(node, Eventually)
+            else:
+                # They are decided by steps of the operands before ``settled + offset``,
+                # which are settled too.
+                end = min(signal.scanned, signal.settled + offset)
+                decided = self._evaluate(node, settled, end)[: signal.settled - settled]
+            changes.append(signal.first_change(settled, decided, min(signal.settled, start)))
+            signal.put(settled, decided, signal.settled)
+        # Up to ``tail``, no step is decided by the settled steps of the operands, so
+        # they all share the value of ``tail``, which only depends on the later steps.
+        tail = max(signal.settled, signal.scanned - offset - 1)
+        values = self._evaluate(node, tail, stop)
+        if tail > signal.settled:
+            value = bool(values[0])
+            first = signal.settled
+            if signal.block is not None and signal.block[2] == value:
+                first = max(first, signal.block[1])
+            changes.append(signal.first_change(first, value, min(tail, start)))
+            signal.put(first, value, tail)
+            signal.block = (signal.settled, tail, value)
+        else:
+            signal.block = None
+        changes.append(signal.first_change(tail, values, start))
+        signal.put(tail, values)
+        return min((change for change in changes if change is not None), default=start)
+
+    def _settle(self, node: LTLExpr[Var], signal: _Signal) -> None:
+        """Count the settled steps of an operator, from those of its operands."""
+        settled = min(self._signals[child].settled for child in node.children())
+        scanned, signal.scanned = signal.scanned, settled
+        reach = _reach(node)
+        match node:
+            case Eventually(arg, interval) | Always(arg, interval) if interval.end is None:
+                # A step is settled by a later settled step of ``arg`` that decides it.
+                last = self._last(arg, scanned, settled, isinstance(node, Eventually))
+                settled = last + 1 - (interval.start or 0)
+            case (
+                Until(lhs, rhs, interval)
+                | WeakUntil(lhs, rhs, interval)
+                | Release(lhs, rhs, interval)
+                | StrongRelease(lhs, rhs, interval)
+            ) if interval.end is None:
+                # Until the first step where ``rhs`` (or ``!rhs`` for a release) holds, or ``lhs``
+                # (or ``!lhs``) fails.
+                until = isinstance(node, Until | WeakUntil)
+                found = self._last(rhs, scanned, settled, until) + 1 - (interval.start or 0)
+                settled = max(found, self._last(lhs, scanned, settled, not until) + 1)
+            case _ if reach is not None:
+                children = zip(node.children(), reach, strict=True)
+                settled = min(self._signals[child].settled - steps for child, steps in children)
+        signal.settled = max(signal.settled, settled)
+
+    def _last(self, node: Expr, start: int, stop: int, value: bool) -> int:
+        """The last step in ``[start, stop)`` where ``node`` has the given value, or ``-1``."""
+        import numpy as np
+
+        values = self._signals[node].get(start, stop)
+        steps = np.flatnonzero(values if value else np.logical_not(values))
+        return start + int(steps[-1]) if len(steps) else -1
+
+
+__all__ = ["IncrementalEvaluator", "LTLMonitor", "Verdict"]
@@ -0,0 +1,412 @@
+"""Batch, parallel and cached parsing.
+
+:func:`parse_many` parses a (possibly huge, possibly lazy) stream of formula
+strings and yields one :class:`ParseResult` per input, in input order. Inputs
+are cut into chunks; each chunk is parsed with the cached, inline-transforming
+parser of the grammar (see :func:`logic_asts.grammars.get_parser`), either in
+this process or fanned out across a process pool. Every worker process compiles
+(or loads the pre-generated tables of) the grammar once and reuses it for all
+the chunks it is handed.
+
+A malformed input does not abort the batch: its result carries a
+:class:`ParseError` instead of an expression.
+
+Examples:
+    >>> for r in parse_many(["a & b", "a &", "!c"]):
+    ...     print(r.index, r.expr if r.ok else r.error.kind)
+    0 (a & b)
+    1 UnexpectedToken
+    2 !c
+
+Services that parse the same strings over and over can instead put a bounded
+LRU :class:`ParseCache` in front of :func:`logic_asts.parse_expr` with
+:func:`enable_parse_cache`. Since every node is immutable, the cached ASTs are
+shared freely between callers.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import hashlib
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import typing
+from collections import OrderedDict, deque
+from collections.abc import Generator, Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from attrs import frozen
+from lark.exceptions import LarkError, UnexpectedInput, VisitError
+from typing_extensions import Self
+
+from logic_asts.grammars import SupportedGrammars, _compiled, _tables
+from logic_asts.spec import Expr
+
+DEFAULT_CHUNKSIZE = 256
+
+# Number of chunks kept in flight per worker, so that the pool never idles
+# while the consumer is busy, yet the input is never read far ahead.
+_CHUNKS_IN_FLIGHT_PER_WORKER = 4
+
+
+class ParseError(ValueError):
+    """A failure to parse one input of :func:`parse_many`.
+
+    Unlike the ``lark`` exceptions it summarizes, it can be pickled, so it
+    crosses process boundaries intact.
+
+    Attributes:
+        message: The message of the underlying error.
+        kind: Name of the underlying exception type, e.g. ``"UnexpectedToken"``, or
+            the type of the error raised while building the AST, e.g. ``"ValueError"``.
+        line: 1-based line of the offending input, if known.
+        column: 1-based column of the offending input, if known.
+    """
+
+    def __init__(self, message: str, kind: str, line: int | None = None, column: int | None = None) -> None:
+        super().__init__(message, kind, line, column)
+        self.message = message
+        self.kind = kind
+        self.line = line
+        self.column = column
+
+    def __str__(self) -> str:
+        return self.message
+
+    @classmethod
+    def from_lark(cls, err: LarkError) -> ParseError:
+        if isinstance(err, VisitError):
+            # Errors raised while building nodes (e.g. an invalid interval) are
+            # more useful than lark's "Error trying to process rule" wrapper.
+            return cls(str(err.orig_exc), type(err.orig_exc).__name__)
+        if isinstance(err, UnexpectedInput):
+            line = err.line if err.line > 0 else None
+            column = err.column if err.column > 0 else None
+            return cls(str(err), type(err).__name__, line, column)
+        return cls(str(err), type(err).__name__)
+
+
+@frozen
+class ParseResult:
+    """The outcome of parsing one input of :func:`parse_many`.
+
+    Exactly one of ``expr`` and ``error`` is set.
+    """
+
+    index: int
+    """Position of the input in the iterable given to :func:`parse_many`."""
+    text: str
+    """The input string."""
+    expr: Expr | None = None
+    """The parsed expression, on success."""
+    error: ParseError | None = None
+    """Why the input could not be parsed, on failure."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> Expr:
+        """Return the parsed expression, or raise the parse error."""
+        if self.error is not None:
+            raise self.error
+        assert self.expr is not None
+        return self.expr
+
+
+def _parse_chunk(syntax: SupportedGrammars, texts: Sequence[str]) -> list[Expr | ParseError]:
+    # Runs in the worker processes: only the outcomes travel back, the parent
+    # still holds the input strings.
+    parser, _ = _compiled(syntax, inline=True)
+    out: list[Expr | ParseError] = []
+    for text in texts:
+        try:
+            out.append(typing.cast(Expr, parser.parse(text)))
+        except LarkError as e:
+            out.append(ParseError.from_lark(e))
+    return out
+
+
+def _results(start: int, texts: Sequence[str], outcomes: list[Expr | ParseError]) -> Iterator[ParseResult]:
+    for i, (text, outcome) in enumerate(zip(texts, outcomes, strict=True), start):
+        if isinstance(outcome, ParseError):
+            yield ParseResult(i, text, error=outcome)
+        else:
+            yield ParseResult(i, text, expr=outcome)
+
+
+def parse_many(
+    texts: Iterable[str],
+    *,
+    syntax: SupportedGrammars | str = SupportedGrammars.BASE,
+    workers: int | None = 1,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Generator[ParseResult, None, None]:
+    """Parse every string in ``texts``, yielding a :class:`ParseResult` for each, in input order.
+
+    Arguments:
+        texts: The formulas to parse. It is consumed lazily, so it may be a
+            generator over an arbitrarily large corpus.
+        syntax: The grammar to parse with, as in :func:`logic_asts.parse_expr`.
+        workers: Number of worker processes. ``1`` (the default) parses in the
+            calling process; ``None`` uses one worker per CPU.
+        chunksize: Number of inputs sent to a worker at a time. Larger chunks
+            amortize the inter-process overhead; smaller ones stream results
+            back sooner.
+
+    Results are produced as soon as the chunk holding them is parsed, and at
+    most a few chunks per worker are read ahead of the consumer. Closing the
+    generator early shuts the pool down and cancels pending chunks.
+
+    Raises:
+        ValueError: If ``syntax`` is not a supported grammar, or ``workers`` or
+            ``chunksize`` is less than 1, when called rather than when the
+            results are first iterated.
+    """
+    syntax = SupportedGrammars(syntax)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1 (got {workers})")
+    if chunksize < 1:
+        raise ValueError(f"chunksize must be at least 1 (got {chunksize})")
+    return _parse_many(texts, syntax, workers, chunksize)
+
+
+def _parse_many(
+    texts: Iterable[str], syntax: SupportedGrammars, workers: int, chunksize: int
+) -> Generator[ParseResult, None, None]:
+    chunks = itertools.batched(texts, chunksize)
+    start = 0
+    if workers == 1:
+        for chunk in chunks:
+            yield from _results(start, chunk, _parse_chunk(syntax, chunk))
+            start += len(chunk)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    pending: deque[tuple[int, Sequence[str], Future[list[Expr | ParseError]]]] = deque()
+    try:
+        for chunk in chunks:
+            pending.append((start, chunk, pool.submit(_parse_chunk, syntax, chunk)))
+            start += len(chunk)
+            if len(pending) >= workers * _CHUNKS_IN_FLIGHT_PER_WORKER:
+                first, texts_, future = pending.popleft()
+                yield from _results(first, texts_, future.result())
+        while pending:
+            first, texts_, future = pending.popleft()
+            yield from _results(first, texts_, future.result())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ParseCacheInfo(typing.NamedTuple):
+    """Statistics of a :class:`ParseCache`, in the spirit of :func:`functools.lru_cache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+_CACHE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS entries (
+    pos INTEGER PRIMARY KEY,
+    grammar TEXT NOT NULL,
+    source TEXT NOT NULL,
+    ast BLOB NOT NULL
+);
+"""
+
+
+@functools.cache
+def _cache_digest() -> str:
+    # Persisted ASTs are only valid for the grammars, lark version and node
+    # classes that produced them. (importlib.metadata is slow to import and
+    # only needed here.)
+    import importlib.metadata
+
+    try:
+        version = importlib.metadata.version("logic-asts")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return hashlib.sha256(f"{_tables.sources_digest()}\0{version}".encode()).hexdigest()
+
+
+class ParseCache:
+    """A bounded, thread-safe LRU cache of parsed expressions keyed by ``(source text, grammar)``.
+
+    Only successful parses are cached; malformed inputs raise on every call.
+
+    Arguments:
+        maxsize: Maximum number of cached expressions; the least recently used
+            one is evicted when it is exceeded.
+        path: Optional sqlite database the cache is persisted to. It is loaded
+            on construction, and the current entries (at most ``maxsize``, in
+            LRU order) are written back by :meth:`save`, which
+            :meth:`close` and the context manager call. Entries written by a
+            different version of the grammars, ``lark`` or ``logic-asts`` are
+            discarded.
+
+    Warning:
+        The persisted ASTs are pickled: only point ``path`` at files you trust.
+
+    Examples:
+        >>> cache = ParseCache(maxsize=2)
+        >>> cache.parse("a & b") is cache.parse("a & b")
+        True
+        >>> _ = cache.parse("G a", syntax="ltl"), cache.parse("c")
+        >>> cache.info()
+        ParseCacheInfo(hits=1, misses=3, evictions=1, maxsize=2, currsize=2)
+    """
+
+    def __init__(self, maxsize: int = 4096, *, path: str | os.PathLike[str] | None = None) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be at least 1 (got {maxsize})")
+        self.maxsize = maxsize
+        self.path = path
+        self._entries: OrderedDict[tuple[str, SupportedGrammars], Expr] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        if path is not None:
+            self._load()
+
+    def parse(self, expr: str, *, syntax: SupportedGrammars | str = SupportedGrammars.BASE) -> Expr:
+        """Parse ``expr`` like :func:`logic_asts.parse_expr`, returning the cached AST if there is one."""
+        key = (expr, SupportedGrammars(syntax))
+        with self._lock:
+            ast = self._entries.get(key)
+            if ast is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return ast
+            self._misses += 1
+        # Parse outside the lock: racing threads may parse the same text twice,
+        # but never block each other on a slow parse.
+        parser, _ = _compiled(key[1], inline=True)
+        ast = typing.cast(Expr, parser.parse(expr))
+        with self._lock:
+            self._insert(key, ast)
+        return ast
+
+    def _insert(self, key: tuple[str, SupportedGrammars], ast: Expr) -> None:
+        self._entries[key] = ast
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            _ = self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def info(self) -> ParseCacheInfo:
+        with self._lock:
+            return ParseCacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Drop all entries and reset the statistics. The persisted file is only updated by :meth:`save`."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def _load(self) -> None:
+        assert self.path is not None
+        db = sqlite3.connect(self.path)
+        try:
+            with self._lock, db:
+                db.executescript(_CACHE_SCHEMA)
+                row = db.execute("SELECT value FROM meta WHERE key = 'digest'").fetchone()
+                if row is None or row[0] != _cache_digest():
+                    return
+                rows = db.execute("SELECT grammar, source, ast FROM entries ORDER BY pos").fetchall()
+                loaded = [((source, SupportedGrammars(grammar)), pickle.loads(ast)) for grammar, source, ast in rows]
+                for key, ast in loaded:
+                    self._insert(key, ast)
+        except (sqlite3.DatabaseError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            # A corrupt file is just a cold cache.
+            return
+        finally:
+            db.close()
+
+    def save(self) -> None:
+        """Write the current entries to ``path``, replacing what it held. A no-op without ``path``."""
+        if self.path is None:
+            return
+        with self._lock:
+            rows = [
+                (pos, str(grammar.value), source, pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL))
+                for pos, ((source, grammar), ast) in enumerate(self._entries.items())
+            ]
+        db = sqlite3.connect(self.path)
+        try:
+            with db:
+                db.executescript(_CACHE_SCHEMA)
+                _ = db.execute("DELETE FROM entries")
+                _ = db.execute("INSERT OR REPLACE INTO meta VALUES ('digest', ?)", (_cache_digest(),))
+                _ = db.executemany("INSERT INTO entries VALUES (?, ?, ?, ?)", rows)
+        finally:
+            db.close()
+
+    def close(self) -> None:
+        """Persist the cache (see :meth:`save`)."""
+        self.save()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+_PARSE_CACHE: ParseCache | None = None
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def enable_parse_cache(maxsize: int = 4096, *, path: str | os.PathLike[str] | None = None) -> ParseCache:
+    """Route :func:`logic_asts.parse_expr` through a new process-wide :class:`ParseCache`.
+
+    Any previously enabled cache is closed (and so persisted) first. A cache
+    with a ``path`` is also persisted when the interpreter exits.
+    """
+    global _PARSE_CACHE
+    cache = ParseCache(maxsize, path=path)
+    with _PARSE_CACHE_LOCK:
+        previous, _PARSE_CACHE = _PARSE_CACHE, cache
+    if previous is not None:
+        atexit.unregister(previous.close)
+        previous.close()
+    if path is not None:
+        atexit.register(cache.close)
+    return cache
+
+
+def disable_parse_cache() -> None:
+    """Stop caching in :func:`logic_asts.parse_expr`, closing (and so persisting) the active cache."""
+    global _PARSE_CACHE
+    with _PARSE_CACHE_LOCK:
+        previous, _PARSE_CACHE = _PARSE_CACHE, None
+    if previous is not None:
+        atexit.unregister(previous.close)
+        previous.close()
+
+
+def get_parse_cache() -> ParseCache | None:
+    """The cache :func:`logic_asts.parse_expr` currently uses, if any."""
+    return _PARSE_CACHE
+
+
+__all__ = [
+    "ParseCache",
+    "ParseCacheInfo",
+    "ParseError",
+    "ParseResult",
+    "disable_parse_cache",
+    "enable_parse_cache",
+    "get_parse_cache",
+    "parse_many",
+]
@@ -70,7 +70,7 @@ def _validates_psl(_instance: object, attribute: object, value: object) -> None:
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class SuffixImpliesUniv(LogicOp, Generic[Var]):
     r"""``{r}[]-> f`` (universal suffix implication)."""
 
@@ -78,8 +78,8 @@ class SuffixImpliesUniv(LogicOp, Generic[Var]):
     formula: PSLFormula[Var] = field(validator=_validates_psl)
 
     @override
-    def __str__(self) -> str:
-        return f"{{{self.sere}}}[]-> {self.formula}"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("{", self.sere, "}[]-> ", self.formula)
 
     @override
     def children(self) -> Iterator[Expr]:
@@ -88,28 +88,35 @@ class SuffixImpliesUniv(LogicOp, Generic[Var]):
 
     @override
     def expand(self) -> SuffixImpliesUniv[Var]:
-        return SuffixImpliesUniv(
-            self.sere.expand(),
-            self.formula.expand(),
-        )
+        return cast(SuffixImpliesUniv[Var], super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> PSLFormula[Var]:
+        return cast(PSLFormula[Var], super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> PSLFormula[Var]:
-        if expand:
-            return self.expand().to_nnf(negate=negate, expand=False)
-        new_formula = self.formula.to_nnf(negate=negate, expand=False)
+    def _expand_node(self) -> Expr:
+        return self
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        # ``pos[1]``/``neg[1]`` are for the formula; the SERE is kept as is.
         if negate:
             # !({r}[]-> f) = {r}<>-> !f
-            return SuffixImpliesExist(self.sere, new_formula)
-        return SuffixImpliesUniv(self.sere, new_formula)
+            return SuffixImpliesExist(self.sere, cast(PSLFormula[Var], neg[1]))
+        return SuffixImpliesUniv(self.sere, cast(PSLFormula[Var], pos[1]))
+
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((), (negate,))
 
     @override
-    def horizon(self) -> int | float:
-        return self.sere.horizon() + self.formula.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0] + horizons[1]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class SuffixImpliesExist(LogicOp, Generic[Var]):
     r"""``{r}<>-> f`` (existential suffix implication)."""
 
@@ -117,8 +124,8 @@ class SuffixImpliesExist(LogicOp, Generic[Var]):
     formula: PSLFormula[Var] = field(validator=_validates_psl)
 
     @override
-    def __str__(self) -> str:
-        return f"{{{self.sere}}}<>-> {self.formula}"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("{", self.sere, "}<>-> ", self.formula)
 
     @override
     def children(self) -> Iterator[Expr]:
@@ -127,36 +134,43 @@ class SuffixImpliesExist(LogicOp, Generic[Var]):
 
     @override
     def expand(self) -> SuffixImpliesExist[Var]:
-        return SuffixImpliesExist(
-            self.sere.expand(),
-            self.formula.expand(),
-        )
+        return cast(SuffixImpliesExist[Var], super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> PSLFormula[Var]:
+        return cast(PSLFormula[Var], super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> PSLFormula[Var]:
-        if expand:
-            return self.expand().to_nnf(negate=negate, expand=False)
-        new_formula = self.formula.to_nnf(negate=negate, expand=False)
+    def _expand_node(self) -> Expr:
+        return self
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        # ``pos[1]``/``neg[1]`` are for the formula; the SERE is kept as is.
         if negate:
             # !({r}<>-> f) = {r}[]-> !f
-            return SuffixImpliesUniv(self.sere, new_formula)
-        return SuffixImpliesExist(self.sere, new_formula)
+            return SuffixImpliesUniv(self.sere, cast(PSLFormula[Var], neg[1]))
+        return SuffixImpliesExist(self.sere, cast(PSLFormula[Var], pos[1]))
+
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((), (negate,))
 
     @override
-    def horizon(self) -> int | float:
-        return self.sere.horizon() + self.formula.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0] + horizons[1]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class WeakClosure(LogicOp, Generic[Var]):
     r"""``{r}`` (weak closure)."""
 
     sere: SEREExpr[Var] = field(validator=_validates_sere)
 
     @override
-    def __str__(self) -> str:
-        return f"{{{self.sere}}}"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("{", self.sere, "}")
 
     @override
     def children(self) -> Iterator[Expr]:
@@ -164,30 +178,40 @@ class WeakClosure(LogicOp, Generic[Var]):
 
     @override
     def expand(self) -> WeakClosure[Var]:
-        return WeakClosure(self.sere.expand())
+        return cast(WeakClosure[Var], super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> PSLFormula[Var]:
+        return cast(PSLFormula[Var], super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> PSLFormula[Var]:
-        if expand:
-            return self.expand().to_nnf(negate=negate, expand=False)
+    def _expand_node(self) -> Expr:
+        return self
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         # No NNF dual for a weak closure; block negation from passing through.
         return Not(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
-        return self.sere.horizon()
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((),)
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class StrongClosure(LogicOp, Generic[Var]):
     r"""``{r}!`` (strong closure)."""
 
     sere: SEREExpr[Var] = field(validator=_validates_sere)
 
     @override
-    def __str__(self) -> str:
-        return f"{{{self.sere}}}!"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("{", self.sere, "}!")
 
     @override
     def children(self) -> Iterator[Expr]:
@@ -195,18 +219,28 @@ class StrongClosure(LogicOp, Generic[Var]):
 
     @override
     def expand(self) -> SuffixImpliesExist[Var]:
-        return SuffixImpliesExist(self.sere.expand(), Literal(True))
+        return cast(SuffixImpliesExist[Var], super().expand())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> PSLFormula[Var]:
-        if expand:
-            return self.expand().to_nnf(negate=negate, expand=False)
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> PSLFormula[Var]:
+        return cast(PSLFormula[Var], super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        return SuffixImpliesExist(self.sere, Literal(True))
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         # No NNF dual for a strong closure; block negation from passing through.
         return Not(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
-        return self.sere.horizon()
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((),)
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0]
 
 
 def is_psl_formula_node[_T: Hashable](node: object, check_type: type[_T] | None = None) -> TypeGuard[PSLFormula[_T]]:
@@ -51,7 +51,7 @@ from logic_asts.base import Variable as Variable
 from logic_asts.base import Xor as Xor
 from logic_asts.base import is_bool_node as is_bool_node
 from logic_asts.spec import ChildExpr, Expr, ExprVisitor, RegexOp
-from logic_asts.utils import flatten_nary_args, nary_fold
+from logic_asts.utils import flatten_nary_args, infix_parts, nary_fold
 
 
 def is_sere_node[_T: Hashable](node: object, check_type: type[_T] | None = None) -> TypeGuard[SEREExpr[_T]]:
@@ -75,8 +75,28 @@ def _normalize_low(value: int | None) -> int:
     return 0 if value is None else value
 
 
+def _without_parens(expr: Expr) -> tuple[str | Expr, ...]:
+    """The rendering of ``expr`` (as :meth:`~logic_asts.spec.Expr._str_parts`), less its enclosing parentheses."""
+    parts = expr._str_parts()
+    if not (_outermost(parts, 0).startswith("(") and _outermost(parts, -1).endswith(")")):
+        return parts
+    first, last = parts[0], parts[-1]
+    if len(parts) > 1 and isinstance(first, str) and isinstance(last, str):
+        return (first[1:], *parts[1:-1], last[:-1])
+    # The parentheses belong to a subformula's text.
+    return (str(expr)[1:-1],)
+
+
+def _outermost(parts: tuple[str | Expr, ...], index: int) -> str:
+    """The first (``index=0``) or last (``index=-1``) piece of text among ``parts``."""
+    item = parts[index]
+    while not isinstance(item, str):
+        item = item._str_parts()[index]
+    return item
+
+
 @final
-@frozen
+@frozen(cache_hash=True)
 class Empty(RegexOp):
     r"""Zero-length matching input: :math:`\varepsilon`
 
@@ -84,16 +104,16 @@ class Empty(RegexOp):
     """
 
     @override
-    def __str__(self) -> str:
-        return str(Repeat(Literal(True), 0, 0))
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return (Repeat(Literal(True), 0, 0),)
 
     @override
     def expand(self) -> Self:
         return self
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> Repeat | Empty:
-        _ = expand
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> Repeat | Empty:
+        _ = expand, extended
         if negate:
             return Repeat(Literal(True), low=1, high=None)
         else:
@@ -107,9 +127,21 @@ class Empty(RegexOp):
     def horizon(self) -> int | float:
         return 0
 
+    @override
+    def _expand_node(self) -> Self:
+        return self
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return self.to_nnf(negate=negate)
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return 0
+
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Repeat(RegexOp, Generic[ChildExpr]):
     r"""Repetition: ``r[*low..high]``.
 
@@ -131,7 +163,7 @@ class Repeat(RegexOp, Generic[ChildExpr]):
             object.__setattr__(self, "arg", Literal(True))
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         lo = _normalize_low(self.low)
         hi = self.high
         if lo == 0 and hi is None:
@@ -144,8 +176,9 @@ class Repeat(RegexOp, Generic[ChildExpr]):
             suffix = f"[*{lo}]"
         else:
             suffix = f"[*{lo}..{hi}]"
-        arg_str = f"({self.arg})" if isinstance(self.arg, Repeat) else str(self.arg)
-        return f"{arg_str}{suffix}"
+        if isinstance(self.arg, Repeat):
+            return ("(", self.arg, ")" + suffix)
+        return (self.arg, suffix)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -153,39 +186,44 @@ class Repeat(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        arg = self.arg.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        arg = self.arg
         low = _normalize_low(self.low)
         high = self.high
         if isinstance(arg, Empty):
             # epsilon repeated any number of times is still epsilon
-            return cast(ChildExpr, Empty())
+            return Empty()
         if low == high == 0:
-            return cast(ChildExpr, Empty())
+            return Empty()
         if low == high == 1:
-            return cast(ChildExpr, arg)
-        return cast(ChildExpr, Repeat(arg, low, high))
+            return arg
+        return Repeat(arg, low, high)
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             if isinstance(self.arg, Literal) and self.arg.value is True and self.low == 1 and self.high is None:
                 # this is the complement of the epsilon node, do return epsilon.
-                return cast(ChildExpr, Empty())
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+                return Empty()
+            return Complement(self)
+        return self
 
     @override
-    def horizon(self) -> int | float:
-        arg_hrz = self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         if self.high is None:
             return math.inf
-        return self.high * arg_hrz
+        return self.high * horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Concat(RegexOp, Generic[ChildExpr]):
     r"""SERE concatenation: ``r1 ; r2 ; ... ; rn``."""
 
@@ -197,8 +235,8 @@ class Concat(RegexOp, Generic[ChildExpr]):
     )
 
     @override
-    def __str__(self) -> str:
-        return "(" + " ; ".join(str(a) for a in self.args) + ")"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return infix_parts(" ; ", self.args)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -206,30 +244,33 @@ class Concat(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        args = (a.expand() for a in self.args)
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         # Flatten nested Concat
-        args = flatten_nary_args(Concat, args)
+        args = flatten_nary_args(Concat, self.args)
         # Empty is the identity of concatenation; drop it. nary_fold
         # collapses to the single survivor, or to Empty() when every
         # operand is absorbed, avoiding the Concat min_len(2) validator.
         args = (a for a in args if not isinstance(a, Empty))
-        return cast(ChildExpr, nary_fold(Concat, args, identity=Empty()))
+        return nary_fold(Concat, args, identity=Empty())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
-        return sum((a.horizon() for a in self.args), start=0)
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return sum(horizons, start=0)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Fusion(RegexOp, Generic[ChildExpr]):
     r"""SERE fusion: ``r1 : r2 : ... : rn``."""
 
@@ -241,8 +282,8 @@ class Fusion(RegexOp, Generic[ChildExpr]):
     )
 
     @override
-    def __str__(self) -> str:
-        return "(" + " : ".join(str(a) for a in self.args) + ")"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return infix_parts(" : ", self.args)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -250,26 +291,29 @@ class Fusion(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        args = (a.expand() for a in self.args)
-        args = flatten_nary_args(Fusion, args)
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        args = flatten_nary_args(Fusion, self.args)
         # TODO: Maybe handle the Epsilon case?
-        return cast(ChildExpr, Fusion(tuple(args)))
+        return Fusion(tuple(args))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
-        return sum((a.horizon() for a in self.args), start=0)
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return sum(horizons, start=0)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Alt(RegexOp, Generic[ChildExpr]):
     r"""SERE alternation: ``r1 | r2 | ... | rn``."""
 
@@ -281,8 +325,8 @@ class Alt(RegexOp, Generic[ChildExpr]):
     )
 
     @override
-    def __str__(self) -> str:
-        return "(" + " | ".join(str(a) for a in self.args) + ")"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return infix_parts(" | ", self.args)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -290,25 +334,28 @@ class Alt(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        args = (a.expand() for a in self.args)
-        args = flatten_nary_args(Alt, args)
-        return cast(ChildExpr, Alt(tuple(args)))
+        return cast(ChildExpr, super().expand())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def horizon(self) -> int | float:
-        return max(a.horizon() for a in self.args)
+    def _expand_node(self) -> Expr:
+        args = flatten_nary_args(Alt, self.args)
+        return Alt(tuple(args))
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return max(horizons)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Inter(RegexOp, Generic[ChildExpr]):
     r"""SERE length-matching intersection: ``r1 && r2 && ... && rn``."""
 
@@ -320,8 +367,8 @@ class Inter(RegexOp, Generic[ChildExpr]):
     )
 
     @override
-    def __str__(self) -> str:
-        return "(" + " && ".join(str(a) for a in self.args) + ")"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return infix_parts(" && ", self.args)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -329,25 +376,28 @@ class Inter(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        args = (a.expand() for a in self.args)
-        args = flatten_nary_args(Inter, args)
-        return cast(ChildExpr, Inter(tuple(args)))
+        return cast(ChildExpr, super().expand())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def horizon(self) -> int | float:
-        return max(a.horizon() for a in self.args)
+    def _expand_node(self) -> Expr:
+        args = flatten_nary_args(Inter, self.args)
+        return Inter(tuple(args))
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return max(horizons)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class NLMInter(RegexOp, Generic[ChildExpr]):
     r"""SERE non-length-matching intersection: ``r1 & r2 & ... & rn``.
 
@@ -368,8 +418,8 @@ class NLMInter(RegexOp, Generic[ChildExpr]):
     )
 
     @override
-    def __str__(self) -> str:
-        return "(" + " & ".join(str(a) for a in self.args) + ")"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return infix_parts(" & ", self.args)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -377,25 +427,28 @@ class NLMInter(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        args = (a.expand() for a in self.args)
-        args = flatten_nary_args(NLMInter, args)
-        return cast(ChildExpr, NLMInter(tuple(args)))
+        return cast(ChildExpr, super().expand())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def horizon(self) -> int | float:
-        return max(a.horizon() for a in self.args)
+    def _expand_node(self) -> Expr:
+        args = flatten_nary_args(NLMInter, self.args)
+        return NLMInter(tuple(args))
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return max(horizons)
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Complement(RegexOp, Generic[ChildExpr]):
     r"""SERE complement: ``~r``.
 
@@ -411,7 +464,7 @@ class Complement(RegexOp, Generic[ChildExpr]):
     arg: ChildExpr = attrs.field(validator=_validate_sere_child)
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         inner = self.arg
         if isinstance(inner, (Concat, Fusion, Alt, Inter, NLMInter, Repeat)):
             # Brace-group operands that would otherwise create round-trip
@@ -419,11 +472,8 @@ class Complement(RegexOp, Generic[ChildExpr]):
             # "(...)" so we strip those and re-wrap in braces. ``Repeat``
             # carries a postfix suffix (``[*]`` etc.) that would otherwise
             # bind to the outer ``~`` and re-parse as ``Repeat(Complement)``.
-            body = str(inner)
-            if body.startswith("(") and body.endswith(")"):
-                body = body[1:-1]
-            return f"~{{{body}}}"
-        return f"~{inner}"
+            return ("~{", *_without_parens(inner), "}")
+        return ("~", inner)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -431,32 +481,41 @@ class Complement(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
         if isinstance(self.arg, Complement):
             # Flatten it
-            return cast(ChildExpr, self.arg.arg.expand())
+            unwrapped: Expr = self.arg.arg
+            return unwrapped
         if isinstance(self.arg, Literal):
             # Push the negation inwards
-            return cast(ChildExpr, Literal(not self.arg.value))
+            return Literal(not self.arg.value)
         if isinstance(self.arg, Empty):
             # Complement of epsilon is the language of all non-empty words: T[+].
-            return cast(ChildExpr, Repeat(Literal(True), 1, None))
-        return cast(ChildExpr, Complement(self.arg.expand()))
+            return Repeat(Literal(True), 1, None)
+        return self
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, self.arg.to_nnf(negate=False, expand=False))
-        return cast(ChildExpr, self)
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return pos[0] if negate else self
 
     @override
-    def horizon(self) -> int | float:
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((False,),) if negate else ((),)
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         return math.inf
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class FirstMatch(RegexOp, Generic[ChildExpr]):
     r"""SERE first-match restriction: ``first_match(r)``.
 
@@ -467,11 +526,8 @@ class FirstMatch(RegexOp, Generic[ChildExpr]):
     arg: ChildExpr = attrs.field(validator=_validate_sere_child)
 
     @override
-    def __str__(self) -> str:
-        body = str(self.arg)
-        if body.startswith("(") and body.endswith(")"):
-            body = body[1:-1]
-        return f"first_match({body})"
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        return ("first_match(", *_without_parens(self.arg), ")")
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -479,23 +535,27 @@ class FirstMatch(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        return cast(ChildExpr, FirstMatch(self.arg.expand()))
+        return cast(ChildExpr, super().expand())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def horizon(self) -> int | float:
-        return self.arg.horizon()
+    def _expand_node(self) -> Expr:
+        return self
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
+
+    @override
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class FusionRepeat(RegexOp, Generic[ChildExpr]):
     r"""Fusion-iteration: ``r[:*low..high]``.
 
@@ -519,7 +579,7 @@ class FusionRepeat(RegexOp, Generic[ChildExpr]):
             raise ValueError(f"FusionRepeat.low ({self.low}) must be <= FusionRepeat.high ({self.high})")
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         lo = _normalize_low(self.low)
         hi = self.high
         if lo == 0 and hi is None:
@@ -532,8 +592,9 @@ class FusionRepeat(RegexOp, Generic[ChildExpr]):
             suffix = f"[:*{lo}]"
         else:
             suffix = f"[:*{lo}..{hi}]"
-        arg_str = f"({self.arg})" if isinstance(self.arg, (Repeat, FusionRepeat)) else str(self.arg)
-        return f"{arg_str}{suffix}"
+        if isinstance(self.arg, (Repeat, FusionRepeat)):
+            return ("(", self.arg, ")" + suffix)
+        return (self.arg, suffix)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -541,17 +602,25 @@ class FusionRepeat(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        e = self.arg.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        e = self.arg
         lo = _normalize_low(self.low)
         hi = self.high
         if hi is None:
-            return cast(ChildExpr, FusionRepeat(e, self.low, None))
+            return self
         if lo == 0 and hi == 0:
-            return cast(ChildExpr, Literal(True))
+            return Literal(True)
         if lo == 1 and hi == 1:
-            return cast(ChildExpr, e)
+            return e
         if lo == hi:
-            return cast(ChildExpr, Fusion(tuple(e for _ in range(lo))))
+            return Fusion(tuple(e for _ in range(lo)))
         parts: list[Expr] = []
         for k in range(lo, hi + 1):
             if k == 0:
@@ -560,25 +629,21 @@ class FusionRepeat(RegexOp, Generic[ChildExpr]):
                 parts.append(e)
             else:
                 parts.append(Fusion(tuple(e for _ in range(k))))
-        return cast(ChildExpr, Alt(tuple(parts)))
+        return Alt(tuple(parts))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         if self.high is None:
             return math.inf
-        return self.high * self.arg.horizon()
+        return self.high * horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class GotoRepeat(RegexOp, Generic[ChildExpr]):
     r"""Goto-repetition: ``r[->low..high]``.
 
@@ -604,7 +669,7 @@ class GotoRepeat(RegexOp, Generic[ChildExpr]):
             raise ValueError(f"GotoRepeat.low ({self.low}) must be <= GotoRepeat.high ({self.high})")
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         lo = _normalize_low(self.low)
         hi = self.high
         if lo == 1 and hi == 1:
@@ -615,8 +680,9 @@ class GotoRepeat(RegexOp, Generic[ChildExpr]):
             suffix = f"[->{lo}]"
         else:
             suffix = f"[->{lo}..{hi}]"
-        arg_str = f"({self.arg})" if isinstance(self.arg, (Repeat, FusionRepeat, GotoRepeat)) else str(self.arg)
-        return f"{arg_str}{suffix}"
+        if isinstance(self.arg, (Repeat, FusionRepeat, GotoRepeat)):
+            return ("(", self.arg, ")" + suffix)
+        return (self.arg, suffix)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -624,33 +690,37 @@ class GotoRepeat(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        # Preserve operand identity in the expansion: do NOT call .expand()
-        # on the outer Repeat, because Concat.expand would flatten a SERE
-        # operand ``r`` (which may itself be a Concat) into the surrounding
-        # body. Downstream consumers like morphata pattern-match on the
-        # expanded shape, so the body's tuple must stay (~r[*], r).
-        e = self.arg.expand()
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        # Preserve operand identity in the expansion: do NOT expand the outer
+        # Repeat, because Concat._expand_node would flatten a SERE operand
+        # ``r`` (which may itself be a Concat) into the surrounding body.
+        # Downstream consumers like morphata pattern-match on the expanded
+        # shape, so the body's tuple must stay (~r[*], r).
+        e = self.arg
         body = Concat((Repeat(Complement(e), 0, None), e))
         lo = _normalize_low(self.low)
         if lo == 1 and self.high == 1:
-            return cast(ChildExpr, body)
-        return cast(ChildExpr, Repeat(body, self.low, self.high))
+            return body
+        return Repeat(body, self.low, self.high)
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         return math.inf
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class EqualRepeat(RegexOp, Generic[ChildExpr]):
     r"""Equal-count repetition: ``r[=low..high]``.
 
@@ -676,7 +746,7 @@ class EqualRepeat(RegexOp, Generic[ChildExpr]):
             raise ValueError(f"EqualRepeat.low ({self.low}) must be <= EqualRepeat.high ({self.high})")
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         lo = _normalize_low(self.low)
         hi = self.high
         if lo == 0 and hi is None:
@@ -687,8 +757,9 @@ class EqualRepeat(RegexOp, Generic[ChildExpr]):
             suffix = f"[={lo}]"
         else:
             suffix = f"[={lo}..{hi}]"
-        arg_str = f"({self.arg})" if isinstance(self.arg, (Repeat, FusionRepeat, GotoRepeat, EqualRepeat)) else str(self.arg)
-        return f"{arg_str}{suffix}"
+        if isinstance(self.arg, (Repeat, FusionRepeat, GotoRepeat, EqualRepeat)):
+            return ("(", self.arg, ")" + suffix)
+        return (self.arg, suffix)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -696,24 +767,28 @@ class EqualRepeat(RegexOp, Generic[ChildExpr]):
 
     @override
     def expand(self) -> ChildExpr:
-        # Preserve operand identity by reusing GotoRepeat.expand (which
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        # Preserve operand identity by reusing GotoRepeat._expand_node (which
         # already avoids the flattening trap) and tacking on the
         # complement-closure tail without re-flattening through
-        # Concat.expand.
-        goto_part = GotoRepeat(self.arg, self.low, self.high).expand()
-        tail = Repeat(Complement(self.arg.expand()), 0, None)
-        return cast(ChildExpr, Concat((goto_part, tail)))
+        # Concat._expand_node.
+        goto_part = GotoRepeat(self.arg, self.low, self.high)._expand_node()
+        tail = Repeat(Complement(self.arg), 0, None)
+        return Concat((goto_part, tail))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
-        if negate:
-            return cast(ChildExpr, Complement(self))
-        return cast(ChildExpr, self)
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        return Complement(self) if negate else self
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         return math.inf
 
 
@@ -3,9 +3,9 @@
 from __future__ import annotations
 
 import typing as ty
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
 from collections import deque
-from collections.abc import Collection, Hashable, Iterator
+from collections.abc import Callable, Collection, Hashable, Iterator
 from typing import TYPE_CHECKING, Generic, TypeAlias
 
 from typing_extensions import Self, TypeVar, overload, override
@@ -16,12 +16,33 @@ if TYPE_CHECKING:
 
 Var = TypeVar("Var", bound=Hashable)
 ChildExpr = TypeVar("ChildExpr", bound="Expr", default="Expr", covariant=True)
+_R = TypeVar("_R")
 
 
-class Expr(ABC):
+class _ExprMeta(ABCMeta):
+    """Metaclass of :class:`Expr`.
+
+    On every node class built by attrs, it swaps the generated ``__eq__`` and
+    ``__hash__`` for ones that walk the formula with an explicit stack, so that
+    comparing and hashing work at any depth (see
+    :func:`logic_asts.utils.install_structural_dunders`).
+
+    :mod:`logic_asts.interning` installs a ``__call__`` on it while interning
+    is enabled, so that node construction only pays for the hook when it is in use.
+    """
+
+    def __init__(cls, name: str, bases: tuple[type, ...], namespace: dict[str, object], /, **kwargs: object) -> None:
+        super().__init__(name, bases, namespace, **kwargs)
+        # attrs builds each slotted node class twice; only the final one has the fields.
+        if "__attrs_attrs__" in namespace:
+            from logic_asts.utils import install_structural_dunders
+
+            install_structural_dunders(ty.cast("type[Expr]", cls))
+
+
+class Expr(ABC, metaclass=_ExprMeta):
     """Abstract base class for logical expressions."""
 
-    @abstractmethod
     def expand(self) -> Expr:
         r"""Expand derived operators to basic form.
 
@@ -31,12 +52,19 @@ class Expr(ABC):
         - :math:`\phi \equiv \psi \equiv (\phi \vee \neg\psi) \wedge (\neg\phi \vee \psi)`
         - :math:`\phi \oplus \psi \equiv (\phi \wedge \neg\psi) \vee (\neg\phi \wedge \psi)`
 
+        This is a :meth:`fold`: each distinct subformula is expanded once,
+        bottom-up, by its node class's ``_expand_node`` rule.
+
         Returns:
             An equivalent expression using only And, Or, Not, Variable, and Literal.
         """
+        return _expand(self, extended=False)
 
     @abstractmethod
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> Expr:
+    def _expand_node(self) -> Expr:
+        """The :meth:`expand` rule for this node, whose children are already expanded."""
+
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> Expr:
         r"""Convert to Negation Normal Form (NNF).
 
         NNF is a canonical form where negation appears only over atomic
@@ -49,22 +77,62 @@ class Expr(ABC):
 
         Args:
             negate: When True, return the NNF of the *negation* of this
-                expression (negation is pushed down to atoms). Used internally
-                by the recursion; callers normally leave it False.
+                expression (negation is pushed down to atoms).
             expand: When True (default), :meth:`expand` is applied first so that
                 derived/bounded operators are eliminated before NNF rewriting.
-                The recursion threads ``expand=False`` once the tree is expanded.
+            extended: When True, return the *extended* NNF, in which
+                :class:`~logic_asts.base.Equiv` and :class:`~logic_asts.base.Xor`
+                are kept as connectives (negation turns one into the other)
+                instead of being expanded. Expanding them uses each operand
+                twice, so the *tree* size of the plain NNF doubles with every
+                nesting level, while the extended NNF stays linear.
 
         Returns:
             An expression in NNF with negations only over atoms.
 
         Note:
-            Each concrete node class implements this with a precise ``ChildExpr``
+            Each concrete node class narrows this with a precise ``ChildExpr``
             (or leaf-specific) return type, so calling ``to_nnf()`` on a dialect
             union (e.g. ``LTLExpr[AP]``) yields that union rather than bare
-            ``Expr``. Implementations push negation toward atoms using each
-            operator's NNF dual.
+            ``Expr``. Each node class's ``_nnf_node`` rule pushes negation
+            toward atoms using the operator's NNF dual. The rules are applied
+            on demand, once per distinct ``(subformula, polarity)`` pair that
+            the result needs, and equal results are merged, so the output is
+            a maximally shared DAG.
         """
+        tree = _expand(self, extended=extended) if expand else self
+        return _to_nnf(tree, negate=negate, extended=extended)
+
+    @abstractmethod
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+        """The :meth:`to_nnf` rule for this node.
+
+        ``pos[i]`` and ``neg[i]`` are the NNF of the ``i``-th child and of its
+        negation; returns the NNF of this node, or of its negation if ``negate``.
+        Only the entries requested by :meth:`_nnf_needs` are NNFs; the others
+        hold the child itself.
+        """
+
+    @abstractmethod
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        """For each child, the polarities (``False`` for ``pos``, ``True`` for ``neg``) that ``_nnf_node`` reads."""
+
+    def __str__(self) -> str:
+        """The formula in the syntax of its dialect, built without recursion from each node's ``_str_parts``."""
+        out: list[str] = []
+        stack: list[str | Expr] = [self]
+        emit, push, pop = out.append, stack.extend, stack.pop
+        while stack:
+            item = pop()
+            if type(item) is str:
+                emit(item)
+            else:
+                push(ty.cast(Expr, item)._str_parts()[::-1])
+        return "".join(out)
+
+    @abstractmethod
+    def _str_parts(self) -> tuple[str | Expr, ...]:
+        """The text of this node: strings, and the subformulas to render in their place."""
 
     @abstractmethod
     def children(self) -> Iterator[Expr]:
@@ -78,23 +146,26 @@ class Expr(ABC):
         """
 
     @overload
-    def iter_subtree(self) -> Iterator[Expr]: ...
+    def iter_subtree(self, *, order: TraversalOrder = ...) -> Iterator[Expr]: ...
 
     @overload
-    def iter_subtree(self, *, kind: type[_T]) -> Iterator[_T]: ...
+    def iter_subtree(self, *, kind: type[_T], order: TraversalOrder = ...) -> Iterator[_T]: ...
 
-    def iter_subtree(self, *, kind: type[Expr] | None = None) -> Iterator[Expr]:
+    def iter_subtree(self, *, kind: type[Expr] | None = None, order: TraversalOrder = "post") -> Iterator[Expr]:
         r"""Perform post-order traversal of the expression tree.
 
         Iterates over all sub-expressions in post-order, visiting each
         expression exactly once. In post-order, children are yielded before
         their parents, making this suitable for bottom-up processing.
+        See :class:`ExprVisitor` for details.
 
         Args:
             kind: Optional concrete node class to filter by. When given,
                 only nodes that are instances of ``kind`` are yielded, but
                 the entire tree is still traversed. The return type is
                 narrowed to ``Iterator[kind]`` by the type-checker.
+            order: ``"post"`` (default), or ``"pre"`` for pre-order or
+                ``"bfs"`` for breadth-first order.
 
         Yields:
             Each node in the expression tree in post-order sequence, filtered
@@ -114,7 +185,7 @@ class Expr(ABC):
             Those functions also validate that the tree contains no
             out-of-dialect nodes, raising ``TypeError`` if it does.
         """
-        nodes = iter(ExprVisitor[Expr](Expr, self))
+        nodes = iter(ExprVisitor[Expr](Expr, self, order=order))
         if kind is None:
             return nodes
         return (node for node in nodes if isinstance(node, kind))
@@ -163,50 +234,50 @@ class Expr(ABC):
             True
 
         Note:
-            This method visits each node at most once, so duplicate variable
-            references in the tree will only yield one result per unique object.
+            Each distinct atom is yielded once, even if it occurs several
+            times in the tree, in left-to-right order of first occurrence.
         """
         from logic_asts.base import Not, Variable
 
-        stack: deque[Expr] = deque([self])
-        visited: set[Expr] = set()
-
+        # Atoms are leaves for this traversal, so pre-order yields them in
+        # left-to-right order of first occurrence. Nodes are visited once per
+        # object, and atoms yielded once per distinct (equal) atom.
+        visited: set[int] = set()
+        seen: set[Expr] = set()
+        stack: list[Expr] = [self]
         while stack:
-            subexpr = stack[-1]
-            need_to_visit_children: set[Expr] = set()
-            if assume_nnf and isinstance(subexpr, Not) and isinstance(subexpr.arg, Variable):
-                yield subexpr
-            elif isinstance(subexpr, Variable):
-                yield subexpr
+            subexpr = stack.pop()
+            if id(subexpr) in visited:
+                continue
+            visited.add(id(subexpr))
+            if isinstance(subexpr, Variable) or (
+                assume_nnf and isinstance(subexpr, Not) and isinstance(subexpr.arg, Variable)
+            ):
+                if subexpr not in seen:
+                    seen.add(subexpr)
+                    yield subexpr
             else:
-                # Either assume nnf is false or we are looking at a non-atom
-                need_to_visit_children = {
-                    child
-                    for child in subexpr.children()  # We need to visit `child`
-                    if child not in visited  # if it hasn't already been visited
-                }
-
-            if visited.issuperset(need_to_visit_children):
-                # subexpr is a leaf (the set is empty) or it's children have been
-                # yielded get rid of it from the stack
-                _ = stack.pop()
-                # Add subexpr to visited
-                visited.add(subexpr)
-            else:
-                # mid-level node or an empty set
-                # Add relevant children to stack
-                stack.extend(need_to_visit_children)
+                stack.extend(child for child in reversed(tuple(subexpr.children())) if id(child) not in visited)
 
-    @abstractmethod
     def horizon(self) -> int | float:
         r"""Compute the lookahead depth required for this formula.
 
         For propositional logic, horizon is always 0 (no temporal lookahead).
         Subclasses extending to temporal logics may return positive values.
+        Computed with :meth:`fold`, once per distinct subformula.
 
         Returns:
             Non-negative integer or float('inf') for unbounded formulas.
         """
+        return self.fold(_horizon_node)
+
+    @abstractmethod
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        """The :meth:`horizon` rule for this node, given the horizons of its children."""
+
+    def fold(self, fn: Callable[[Expr, tuple[_R, ...]], _R], *, memo: bool = True) -> _R:
+        """Compute ``fn`` bottom-up over this formula; see :func:`fold`."""
+        return fold(self, fn, memo=memo)
 
     @abstractmethod
     def __invert__(self) -> Expr:
@@ -271,6 +342,11 @@ class LogicOp(Expr, ABC):
 
         return Or((self, other))
 
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        # Most logic operators have a dual taking the children in the same polarity.
+        return tuple([(negate,) for _ in self.children()])
+
 
 class RegexOp(Expr, ABC):
     r"""Mixin supplying the regular-expression (SERE) operator algebra.
@@ -312,6 +388,11 @@ class RegexOp(Expr, ABC):
 
         return Alt((self, other))
 
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        # SEREs are not rewritten into NNF; a negated one is complemented whole.
+        return tuple([() for _ in self.children()])
+
 
 _T = TypeVar("_T", bound=Expr)
 _SomeExprType: TypeAlias = type[_T] | (type[_T] | type[_T]) | Collection[type[_T]]  # noqa: PYI016
@@ -349,17 +430,36 @@ def _validate_and_normalize(tp: object) -> tuple[type[Expr], ...]:
     return tuple(dict.fromkeys(normalized))
 
 
+TraversalOrder: TypeAlias = ty.Literal["post", "pre", "bfs"]
+"""Node orders supported by :class:`ExprVisitor` and :meth:`Expr.iter_subtree`.
+
+- ``"post"``: depth-first post-order, children (left to right) before their parent.
+- ``"pre"``: depth-first pre-order, a parent before its children (left to right).
+- ``"bfs"``: breadth-first, level by level, left to right.
+"""
+
+
 class ExprVisitor(Generic[_T]):
-    """A generic Expr visitor that performs post-order traversal of the expression tree.
+    """A generic Expr visitor that traverses the expression tree, post-order by default.
+
+    Iterates over all sub-expressions, visiting each distinct node object
+    exactly once: a subexpression object shared by several parents is yielded
+    the first time it is reached. The order is deterministic, with children
+    taken in :meth:`Expr.children` order. In post-order, children are yielded
+    before their parents, making this suitable for bottom-up processing.
 
-    Iterates over all sub-expressions in post-order, visiting each
-    expression exactly once. In post-order, children are yielded before
-    their parents, making this suitable for bottom-up processing.
+    Each node is visited a constant number of times (its ``children()`` are
+    iterated once and bookkeeping is by identity, never hashing subtrees), so
+    a traversal is linear in the size of the formula DAG and works on
+    arbitrarily deep trees.
 
     Moreover, it ensures that each subexpression is of the given `_T` type parameter.
 
+    Args:
+        order: ``"post"`` (default), ``"pre"`` or ``"bfs"``; see :data:`TraversalOrder`.
+
     Yields:
-        Each node in the expression tree in post-order sequence.
+        Each node in the expression tree, in the requested order.
 
     Raises:
         TypeError: If the expression contains a subexpression that is not of the specified type
@@ -367,41 +467,197 @@ class ExprVisitor(Generic[_T]):
 
     _types: tuple[type[Expr], ...]
     _expr: _T
+    _order: TraversalOrder
 
-    def __init__(self, expr_type: _SomeExprType[_T], expr: _T) -> None:
+    def __init__(self, expr_type: _SomeExprType[_T], expr: _T, *, order: TraversalOrder = "post") -> None:
+        if order not in ("post", "pre", "bfs"):
+            raise ValueError(f"unknown traversal order {order!r}")
         self._types = _validate_and_normalize(expr_type)
         self._expr = expr
+        self._order = order
 
     def _is_expected(self, expr: Expr) -> ty.TypeGuard[_T]:
         return isinstance(expr, self._types)
 
-    def __iter__(self) -> Iterator[_T]:
-        stack: deque[_T] = deque([self._expr])
-        visited: set[_T] = set()
+    def _children_of(self, expr: _T) -> tuple[_T, ...]:
+        children = tuple(expr.children())
+        if Expr not in self._types:
+            for child in children:
+                if not self._is_expected(child):
+                    raise TypeError(f"Expected expression of type {self._types}, got {type(child).__name__}")
+        return children  # type: ignore[return-value]
 
+    def __iter__(self) -> Iterator[_T]:
+        if self._order == "pre":
+            return self._pre_order()
+        if self._order == "bfs":
+            return self._breadth_first()
+        return self._post_order()
+
+    # The traversals key ``visited`` by ``id``: every node stays alive for the
+    # whole traversal (the root references it), so ids are never reused.
+
+    def _post_order(self) -> Iterator[_T]:
+        visited: set[int] = set()
+        # A node is pushed once to be expanded and, on expansion, once more
+        # (with ``True``) to be yielded after its children.
+        stack: list[tuple[_T, bool]] = [(self._expr, False)]
         while stack:
-            subexpr = stack[-1]
-            unvisited_children = {
-                child
-                for child in subexpr.children()  # We need to visit `child`
-                if child not in visited  # if it hasn't already been visited
-            }
-
-            if not unvisited_children:
-                # subexpr is a leaf (the set is empty) or it's children have been
-                # yielded get rid of it from the stack
-                _ = stack.pop()
-                # Add subexpr to visited
-                visited.add(subexpr)
-                # post-order return it
-                yield subexpr
-            else:
-                # mid-level node or an empty set
-                # Add relevant children to stack
-                # After checking if they are the correct type
-                for e in unvisited_children:
-                    if not self._is_expected(e):
-                        raise TypeError(f"Expected expression of type {self._types}, got {type(e).__name__}")
-                    stack.append(e)
-        # Yield the remaining nodes in the stack in reverse order
-        yield from reversed(stack)
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+            elif id(node) not in visited:
+                visited.add(id(node))
+                stack.append((node, True))
+                stack.extend([(child, False) for child in reversed(self._children_of(node)) if id(child) not in visited])
+
+    def _pre_order(self) -> Iterator[_T]:
+        visited: set[int] = set()
+        stack: list[_T] = [self._expr]
+        while stack:
+            node = stack.pop()
+            if id(node) not in visited:
+                visited.add(id(node))
+                yield node
+                stack.extend([child for child in reversed(self._children_of(node)) if id(child) not in visited])
+
+    def _breadth_first(self) -> Iterator[_T]:
+        visited = {id(self._expr)}
+        queue: deque[_T] = deque([self._expr])
+        while queue:
+            node = queue.popleft()
+            yield node
+            for child in self._children_of(node):
+                if id(child) not in visited:
+                    visited.add(id(child))
+                    queue.append(child)
+
+
+def fold(expr: Expr, fn: Callable[[Expr, tuple[_R, ...]], _R], *, memo: bool = True) -> _R:
+    """Compute ``fn`` bottom-up over the formula ``expr`` (a catamorphism).
+
+    ``fn(node, results)`` is called with a node and the results for its
+    children, in :meth:`Expr.children` order, and the result for ``expr`` is
+    returned. The traversal is iterative, so arbitrarily deep formulas are fine.
+
+    Args:
+        memo: When True (default), ``fn`` runs exactly once per distinct node
+            object, and its result is reused wherever that subformula is
+            shared. When False, ``fn`` runs once per *occurrence* of a node in
+            the tree, which for heavily shared formulas can be exponentially
+            more often.
+
+    Examples:
+        >>> from logic_asts.base import Variable
+        >>> p = Variable("p")
+        >>> shared = p & ~p
+        >>> expr = shared | shared
+        >>> fold(expr, lambda node, sizes: 1 + sum(sizes))  # size of the tree
+        9
+        >>> calls = []
+        >>> fold(expr, lambda node, _: calls.append(node))
+        >>> len(calls)  # one call per distinct node: p, ~p, shared and expr
+        4
+    """
+    if not memo:
+        return _fold_tree(expr, fn)
+    # Keyed by ``id``: ``expr`` keeps every node alive, so ids are never reused.
+    results: dict[int, _R] = {}
+    # ``(node, None)`` expands a node, ``(node, children)`` combines the
+    # results of its children. A node is only expanded once: the formula is
+    # acyclic, so a node's pending combine is never above another entry for it.
+    stack: list[tuple[Expr, tuple[Expr, ...] | None]] = [(expr, None)]
+    while stack:
+        node, children = stack.pop()
+        if children is not None:
+            results[id(node)] = fn(node, tuple([results[id(child)] for child in children]))
+        elif id(node) not in results:
+            children = tuple(node.children())
+            stack.append((node, children))
+            stack.extend([(child, None) for child in reversed(children) if id(child) not in results])
+    return results[id(expr)]
+
+
+def _fold_tree(expr: Expr, fn: Callable[[Expr, tuple[_R, ...]], _R]) -> _R:
+    values: list[_R] = []
+    # ``(node, -1)`` expands a node, ``(node, n)`` combines the last ``n`` values.
+    stack: list[tuple[Expr, int]] = [(expr, -1)]
+    while stack:
+        node, n_children = stack.pop()
+        if n_children < 0:
+            children = tuple(node.children())
+            stack.append((node, len(children)))
+            stack.extend([(child, -1) for child in reversed(children)])
+        else:
+            start = len(values) - n_children
+            result = fn(node, tuple(values[start:]))
+            del values[start:]
+            values.append(result)
+    return values[0]
+
+
+def _expand(expr: Expr, *, extended: bool) -> Expr:
+    """:meth:`Expr.expand`, leaving ``Equiv`` and ``Xor`` in place if ``extended``."""
+    from logic_asts.base import Equiv, Xor
+    from logic_asts.utils import replace_children
+
+    kept = (Equiv, Xor) if extended else ()
+
+    def expand_node(node: Expr, children: tuple[Expr, ...]) -> Expr:
+        node = replace_children(node, children)
+        return node if type(node) in kept else node._expand_node()
+
+    return expr.fold(expand_node)
+
+
+def _to_nnf(expr: Expr, *, negate: bool, extended: bool) -> Expr:
+    """The NNF of ``expr``, or of its negation, as a maximally shared DAG.
+
+    ``(node, polarity)`` pairs are converted on demand with an explicit stack,
+    each one once, and results are hash-consed, so that equal subformulas of
+    the output are the same object.
+    """
+    from logic_asts.base import Equiv, Xor
+
+    kept = (Equiv, Xor) if extended else ()
+    # The results for each polarity, keyed by the id of the input node.
+    done: tuple[dict[int, Expr], dict[int, Expr]] = ({}, {})
+    shared: dict[Expr, Expr] = {}
+    shared_ids: set[int] = set()
+    stack: list[tuple[Expr, bool, tuple[Expr, ...] | None]] = [(expr, negate, None)]
+    push, pop = stack.append, stack.pop
+    positive, negative = done
+    while stack:
+        node, polarity, children = pop()
+        key = id(node)
+        results = done[polarity]
+        if key in results:
+            continue
+        if children is None:
+            children = tuple(node.children())
+            if children:
+                # Convert the children first, in the polarities the rule reads.
+                push((node, polarity, children))
+                needs = ((False,), (False,)) if type(node) in kept else node._nnf_needs(negate=polarity)
+                for child, polarities in zip(children, needs):
+                    for child_polarity in polarities:
+                        if id(child) not in done[child_polarity]:
+                            push((child, child_polarity, None))
+                continue
+        pos = tuple([positive.get(id(child), child) for child in children])
+        if kept and type(node) in kept:
+            # !(a <-> b) = a ^ b and !(a ^ b) = a <-> b
+            dual = Xor if (type(node) is Equiv) == polarity else Equiv
+            result: Expr = dual(pos[0], pos[1])
+        else:
+            neg = tuple([negative.get(id(child), child) for child in children])
+            result = node._nnf_node(pos, neg, negate=polarity)
+        if id(result) not in shared_ids:
+            result = shared.setdefault(result, result)
+            shared_ids.add(id(result))
+        results[key] = result
+    return done[negate][id(expr)]
+
+
+def _horizon_node(node: Expr, horizons: tuple[int | float, ...]) -> int | float:
+    return node._horizon_node(horizons)
@@ -256,7 +256,7 @@ class Quantifier(enum.Enum):
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class GraphIncoming(LogicOp, Generic[ChildExpr]):
     r"""Incoming graph operator: :math:`\text{In}^{(W,\#)}_\text{(G,E)} \phi`.
 
@@ -291,54 +291,54 @@ class GraphIncoming(LogicOp, Generic[ChildExpr]):
     quantifier: Quantifier
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         graphs_str = "{" + ",".join(sorted(self.graphs)) + "}"
-        return f"(In^{{{self.weights},{self.quantifier}}}_{{{graphs_str},{self.edge_count}}} {self.arg})"
+        return (f"(In^{{{self.weights},{self.quantifier}}}_{{{graphs_str},{self.edge_count}}} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        """Graph operators don't expand further; recursively expand subformula."""
-        return cast(
-            ChildExpr,
-            GraphIncoming(
-                arg=self.arg.expand(),
-                graphs=frozenset(self.graphs),
-                edge_count=self.edge_count,
-                weights=self.weights,
-                quantifier=self.quantifier,
-            ),
-        )
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        """Graph operators don't expand further; the subformula is already expanded."""
+        return self
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         # TODO: unsure what the dual to these is
-        arg_nnf = cast(Expr, self.arg).to_nnf(expand=False)
         evolved: Expr = GraphIncoming(
-            arg=cast(ChildExpr, arg_nnf),
+            arg=pos[0],
             graphs=frozenset(self.graphs),
             edge_count=self.edge_count,
             weights=self.weights,
             quantifier=self.quantifier,
         )
         if negate:
-            return cast(ChildExpr, Not(evolved))
+            return Not(evolved)
         else:
-            return cast(ChildExpr, evolved)
+            return evolved
+
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((False,),)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         """Horizon of graph operators depends on the subformula."""
-        return self.arg.horizon()
+        return horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class GraphOutgoing(LogicOp, Generic[ChildExpr]):
     r"""Outgoing graph operator: :math:`\text{Out}^{(W,\#)}_\text{(G,E)} \phi`.
 
@@ -373,50 +373,50 @@ class GraphOutgoing(LogicOp, Generic[ChildExpr]):
     quantifier: Quantifier
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         graphs_str = "{" + ",".join(sorted(self.graphs)) + "}"
-        return f"(Out^{{{self.weights},{self.quantifier}}}_{{{graphs_str},{self.edge_count}}} {self.arg})"
+        return (f"(Out^{{{self.weights},{self.quantifier}}}_{{{graphs_str},{self.edge_count}}} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        """Graph operators don't expand further; recursively expand subformula."""
-        return cast(
-            ChildExpr,
-            GraphOutgoing(
-                arg=self.arg.expand(),
-                graphs=frozenset(self.graphs),
-                edge_count=self.edge_count,
-                weights=self.weights,
-                quantifier=self.quantifier,
-            ),
-        )
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        """Graph operators don't expand further; the subformula is already expanded."""
+        return self
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         # TODO: unsure what the dual to these is
-        arg_nnf = cast(Expr, self.arg).to_nnf(expand=False)
         evolved: Expr = GraphOutgoing(
-            arg=cast(ChildExpr, arg_nnf),
+            arg=pos[0],
             graphs=frozenset(self.graphs),
             edge_count=self.edge_count,
             weights=self.weights,
             quantifier=self.quantifier,
         )
         if negate:
-            return cast(ChildExpr, Not(evolved))
+            return Not(evolved)
         else:
-            return cast(ChildExpr, evolved)
+            return evolved
+
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((False,),)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
         """Horizon of graph operators depends on the subformula."""
-        return self.arg.horizon()
+        return horizons[0]
 
 
 Var = TypeVar("Var")
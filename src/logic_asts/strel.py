@@ -115,7 +115,7 @@ class DistanceInterval:
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Everywhere(LogicOp, Generic[ChildExpr]):
     r"""Universal spatial operator: :math:`\square^d \phi`.
 
@@ -140,34 +140,41 @@ class Everywhere(LogicOp, Generic[ChildExpr]):
     dist_fn: str | None = None
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         dist_fn = self.dist_fn and f"^{shlex.quote(self.dist_fn)}" or ""
-        return f"(everywhere{dist_fn}{self.interval} {self.arg})"
+        return (f"(everywhere{dist_fn}{self.interval} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        return cast(ChildExpr, Not(Somewhere(Not(self.arg), self.interval, self.dist_fn)).expand())
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _expand_node(self) -> Expr:
+        somewhere = Somewhere(Not(self.arg)._expand_node(), self.interval, self.dist_fn)._expand_node()
+        return Not(somewhere)._expand_node()
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # !(E A) = E S (negate dual: Everywhere to Somewhere)
-            return cast(ChildExpr, Somewhere(self.arg.to_nnf(negate=True, expand=False), self.interval, self.dist_fn))
-        return cast(ChildExpr, Everywhere(self.arg.to_nnf(expand=False), self.interval, self.dist_fn))
+            return Somewhere(neg[0], self.interval, self.dist_fn)
+        return Everywhere(pos[0], self.interval, self.dist_fn)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        return self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Somewhere(LogicOp, Generic[ChildExpr]):
     r"""Existential spatial operator: :math:`\diamond^d \phi`.
 
@@ -192,34 +199,40 @@ class Somewhere(LogicOp, Generic[ChildExpr]):
     dist_fn: str | None = None
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         dist_fn = self.dist_fn and f"^{shlex.quote(self.dist_fn)}" or ""
-        return f"(somewhere{dist_fn}{self.interval} {self.arg})"
+        return (f"(somewhere{dist_fn}{self.interval} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        return cast(ChildExpr, Reach(Literal(True), self.arg.expand(), self.interval, self.dist_fn))
+        return cast(ChildExpr, super().expand())
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        return Reach(Literal(True), self.arg, self.interval, self.dist_fn)
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         if negate:
             # !(E S) = E A (negate dual: Somewhere to Everywhere)
-            return cast(ChildExpr, Everywhere(self.arg.to_nnf(negate=True, expand=False), self.interval, self.dist_fn))
-        return cast(ChildExpr, Somewhere(self.arg.to_nnf(expand=False), self.interval, self.dist_fn))
+            return Everywhere(neg[0], self.interval, self.dist_fn)
+        return Somewhere(pos[0], self.interval, self.dist_fn)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        return self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Escape(LogicOp, Generic[ChildExpr]):
     r"""Escape operator: escape from a region.
 
@@ -242,38 +255,47 @@ class Escape(LogicOp, Generic[ChildExpr]):
     dist_fn: str | None = None
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         dist_fn = self.dist_fn and f"^{shlex.quote(self.dist_fn)}" or ""
-        return f"(escape{dist_fn}{self.interval} {self.arg})"
+        return (f"(escape{dist_fn}{self.interval} ", self.arg, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        return cast(ChildExpr, Escape(self.arg.expand(), self.interval, self.dist_fn))
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
+
+    @override
+    def _expand_node(self) -> Expr:
+        return self
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         # TODO: there isn't a real dual to Escape
         # prevent negation from passing through
-        arg_nnf = cast(Expr, self.arg).to_nnf(expand=False)
-        evolved: Expr = Escape(cast(ChildExpr, arg_nnf), self.interval, self.dist_fn)
+        evolved: Expr = Escape(pos[0], self.interval, self.dist_fn)
         if negate:
-            return cast(ChildExpr, Not(evolved))
+            return Not(evolved)
         else:
-            return cast(ChildExpr, evolved)
+            return evolved
+
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((False,),)
 
     @override
     def children(self) -> Iterator[ChildExpr]:
         yield self.arg
 
     @override
-    def horizon(self) -> int | float:
-        return self.arg.horizon()
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return horizons[0]
 
 
 @final
-@frozen
+@frozen(cache_hash=True)
 class Reach(LogicOp, Generic[ChildExpr]):
     r"""Reachability operator: :math:`\phi \leadsto^d \psi`.
 
@@ -299,35 +321,35 @@ class Reach(LogicOp, Generic[ChildExpr]):
     dist_fn: str | None = None
 
     @override
-    def __str__(self) -> str:
+    def _str_parts(self) -> tuple[str | Expr, ...]:
         dist_fn = self.dist_fn and f"^{shlex.quote(self.dist_fn)}" or ""
-        return f"({self.lhs} reach{dist_fn}{self.interval} {self.rhs})"
+        return ("(", self.lhs, f" reach{dist_fn}{self.interval} ", self.rhs, ")")
 
     @override
     def expand(self) -> ChildExpr:
-        return cast(
-            ChildExpr,
-            Reach(
-                lhs=self.lhs.expand(),
-                rhs=self.rhs.expand(),
-                interval=self.interval,
-                dist_fn=self.dist_fn,
-            ),
-        )
+        return cast(ChildExpr, super().expand())
+
+    @override
+    def to_nnf(self, *, negate: bool = False, expand: bool = True, extended: bool = False) -> ChildExpr:
+        return cast(ChildExpr, super().to_nnf(negate=negate, expand=expand, extended=extended))
 
     @override
-    def to_nnf(self, *, negate: bool = False, expand: bool = True) -> ChildExpr:
-        if expand:
-            return cast(ChildExpr, self.expand().to_nnf(negate=negate, expand=False))
+    def _expand_node(self) -> Expr:
+        return self
+
+    @override
+    def _nnf_node(self, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
         # TODO: there isn't a real dual to Reach
         # prevent negation from passing through
-        lhs_nnf = cast(Expr, self.lhs).to_nnf(expand=False)
-        rhs_nnf = cast(Expr, self.rhs).to_nnf(expand=False)
-        evolved: Expr = Reach(cast(ChildExpr, lhs_nnf), cast(ChildExpr, rhs_nnf), self.interval, self.dist_fn)
+        evolved: Expr = Reach(pos[0], pos[1], self.interval, self.dist_fn)
         if negate:
-            return cast(ChildExpr, Not(evolved))
+            return Not(evolved)
         else:
-            return cast(ChildExpr, evolved)
+            return evolved
+
+    @override
+    def _nnf_needs(self, *, negate: bool) -> tuple[tuple[bool, ...], ...]:
+        return ((False,), (False,))
 
     @override
     def children(self) -> Iterator[ChildExpr]:
@@ -335,8 +357,8 @@ class Reach(LogicOp, Generic[ChildExpr]):
         yield self.rhs
 
     @override
-    def horizon(self) -> int | float:
-        return max(self.lhs.horizon(), self.rhs.horizon())
+    def _horizon_node(self, horizons: tuple[int | float, ...]) -> int | float:
+        return max(horizons)
 
 
 Var = TypeVar("Var")
@@ -2,14 +2,22 @@
 # pyright: reportExplicitAny=false
 from __future__ import annotations
 
+import functools
+import itertools
+import threading
 import typing
-from collections.abc import Iterable
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
 from numbers import Real
 from typing import TYPE_CHECKING, Any
 
 import attrs
 
+from logic_asts.spec import _ExprMeta
+
 if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
     from logic_asts.spec import Expr
 
 
@@ -64,3 +72,341 @@ def flatten_nary_args[E: Expr, Child: Expr](cls: type[E], args: Iterable[Child])
             yield from typing.cast(Iterable[Child], a.children())
         else:
             yield a
+
+
+def infix_parts(sep: str, args: Iterable[Expr]) -> tuple[str | Expr, ...]:
+    """``_str_parts`` of the parenthesized n-ary operator ``(a sep b sep ...)``."""
+    parts: list[str | Expr] = ["("]
+    for i, arg in enumerate(args):
+        if i:
+            parts.append(sep)
+        parts.append(arg)
+    parts.append(")")
+    return tuple(parts)
+
+
+def last_uses(order: Sequence[Expr]) -> dict[Expr, int]:
+    """Map each node of a post-order sequence of distinct nodes to the position of its last parent in it."""
+    last: dict[Expr, int] = {}
+    for position, node in enumerate(order):
+        for child in node.children():
+            last[child] = position
+    return last
+
+
+def bool_columns[K: Hashable](
+    columns: Mapping[K, npt.ArrayLike] | npt.ArrayLike,
+    index: Mapping[K, int] | Sequence[K] | None,
+) -> tuple[int, Callable[[K, int, int], npt.NDArray[np.bool_] | None]]:
+    """Validate boolean data given by columns, and return its number of rows and a column reader.
+
+    ``columns`` is either a mapping from keys to 1-D arrays of the same length,
+    or a 2-D array with an ``index`` of the keys (a mapping to column
+    positions, or a sequence of keys in column order). The reader returns rows
+    ``start:stop`` of the column of a key as a contiguous boolean array, or
+    ``None`` for keys without a column. Requires NumPy.
+    """
+    import numpy as np
+
+    if index is None:
+        if not isinstance(columns, Mapping):
+            raise TypeError("an index of the atoms is required to evaluate a 2-D array")
+        arrays = {key: np.asarray(column, dtype=np.bool_) for key, column in columns.items()}
+        shapes = sorted({array.shape for array in arrays.values()})
+        if not shapes:
+            raise ValueError("cannot infer the number of rows from an empty mapping of columns")
+        if len(shapes) != 1 or len(shapes[0]) != 1:
+            raise ValueError(f"expected 1-D columns of a single length, got shapes {shapes}")
+
+        def column(key: K, start: int, stop: int) -> npt.NDArray[np.bool_] | None:
+            array = arrays.get(key)
+            return None if array is None else array[start:stop]
+
+        return shapes[0][0], column
+
+    if isinstance(columns, Mapping):
+        raise TypeError("an index of the atoms is only allowed with a 2-D array")
+    matrix = np.asarray(columns, dtype=np.bool_)
+    if matrix.ndim != 2:
+        raise ValueError(f"expected a 2-D array, got shape {matrix.shape}")
+    positions = dict(index) if isinstance(index, Mapping) else {key: i for i, key in enumerate(index)}
+    for key, position in positions.items():
+        if not -matrix.shape[1] <= position < matrix.shape[1]:
+            raise ValueError(f"column {position} of {key!r} is out of range for {matrix.shape[1]} columns")
+
+    def matrix_column(key: K, start: int, stop: int) -> npt.NDArray[np.bool_] | None:
+        position = positions.get(key)
+        # Copy the strided column once so that every use of it is contiguous.
+        return None if position is None else np.ascontiguousarray(matrix[start:stop, position])
+
+    return matrix.shape[0], matrix_column
+
+
+def bool_trace_batch[K: Hashable](
+    traces: Mapping[K, npt.ArrayLike] | npt.ArrayLike,
+    index: Mapping[K, int] | Sequence[K] | None,
+    lengths: npt.ArrayLike | None,
+) -> tuple[npt.NDArray[np.intp], int, Callable[[K], npt.NDArray[np.bool_] | None]]:
+    """Validate a batch of boolean traces, and return their lengths, the padded length and a column reader.
+
+    The traces are either padded to a common length, as a mapping from keys
+    to 2-D arrays of shape ``(traces, time)`` or a 3-D array of shape
+    ``(traces, time, keys)``, or concatenated along the time axis as for
+    :func:`bool_columns`, which requires their ``lengths``. The reader
+    returns the padded ``(traces, time)`` array of a key, or ``None`` for keys
+    without a column; steps past the length of a trace are unspecified in
+    padded input, and false in concatenated input. Requires NumPy.
+    """
+    import numpy as np
+
+    padded = isinstance(traces, Mapping) and any(np.ndim(column) == 2 for column in traces.values())
+    padded = padded or (not isinstance(traces, Mapping) and np.ndim(traces) == 3)
+    if padded:
+        if index is None:
+            if not isinstance(traces, Mapping):
+                raise TypeError("an index of the atoms is required to evaluate a 3-D array")
+            arrays = {key: np.asarray(column, dtype=np.bool_) for key, column in traces.items()}
+            shapes = sorted({array.shape for array in arrays.values()})
+            if len(shapes) != 1:
+                raise ValueError(f"expected 2-D columns of a single shape, got shapes {shapes}")
+            n_traces, size = shapes[0]
+
+            def column(key: K) -> npt.NDArray[np.bool_] | None:
+                return arrays.get(key)
+
+        else:
+            if isinstance(traces, Mapping):
+                raise TypeError("an index of the atoms is only allowed with an array")
+            batch = np.asarray(traces, dtype=np.bool_)
+            n_traces, size, n_columns = batch.shape
+            positions = dict(index) if isinstance(index, Mapping) else {key: i for i, key in enumerate(index)}
+            for key, position in positions.items():
+                if not -n_columns <= position < n_columns:
+                    raise ValueError(f"column {position} of {key!r} is out of range for {n_columns} columns")
+
+            def column(key: K) -> npt.NDArray[np.bool_] | None:
+                position = positions.get(key)
+                return None if position is None else np.ascontiguousarray(batch[:, :, position])
+
+        counts = np.full(n_traces, size, dtype=np.intp) if lengths is None else _trace_lengths(lengths)
+        if len(counts) != n_traces or (len(counts) and counts.max() > size):
+            raise ValueError(f"expected {n_traces} lengths of at most {size}, got {counts.tolist()}")
+        return counts, size, column
+
+    if lengths is None:
+        raise ValueError("the lengths of the traces are required to split concatenated traces")
+    counts = _trace_lengths(lengths)
+    total, flat_column = bool_columns(traces, index)
+    if counts.sum() != total:
+        raise ValueError(f"the lengths of the traces add up to {counts.sum()}, but they have {total} steps")
+    size = int(counts.max(initial=0))
+    valid = np.arange(size) < counts[:, np.newaxis]
+
+    def split_column(key: K) -> npt.NDArray[np.bool_] | None:
+        flat = flat_column(key, 0, total)
+        if flat is None:
+            return None
+        # Row-major order of the mask is the order of the concatenation.
+        array = np.zeros(valid.shape, dtype=np.bool_)
+        array[valid] = flat
+        return array
+
+    return counts, size, split_column
+
+
+def _trace_lengths(lengths: npt.ArrayLike) -> npt.NDArray[np.intp]:
+    import numpy as np
+
+    counts = np.asarray(lengths)
+    if counts.ndim != 1 or not (np.issubdtype(counts.dtype, np.integer) or counts.size == 0):
+        raise ValueError(f"expected a 1-D array of integer lengths, got {counts!r}")
+    if len(counts) and counts.min() < 0:
+        raise ValueError(f"lengths of traces must be non-negative, got {counts.tolist()}")
+    return counts.astype(np.intp)
+
+
+@functools.cache
+def node_fields(cls: type[Expr]) -> tuple[tuple[str, str], ...]:
+    """``(attribute name, __init__ argument name)`` of every field of a node class."""
+    return tuple((f.name, f.alias) for f in attrs.fields(typing.cast("type[attrs.AttrsInstance]", cls)) if f.init)
+
+
+def is_expr(value: object) -> bool:
+    """``isinstance(value, Expr)``, minus the (much slower) ABC machinery."""
+    # Every node class is created by ``_ExprMeta``.
+    return isinstance(type(value), _ExprMeta)
+
+
+ATOMIC_TYPES = frozenset({type(None), bool, int, float, str})
+
+
+def typed_key(value: object) -> Hashable:
+    """A hashable key for a node's field value that also distinguishes the types of equal values.
+
+    Values that compare equal but print differently, like ``1`` and ``1.0`` or
+    ``1`` and ``True``, get different keys, so tables keyed by it never merge them.
+    """
+    tp = type(value)
+    if tp in ATOMIC_TYPES:
+        return (tp, value)
+    if attrs.has(tp):
+        return (tp, *(typed_key(getattr(value, f.name)) for f in attrs.fields(tp)))
+    if tp is tuple:
+        return (tuple, *(typed_key(v) for v in typing.cast(tuple[object, ...], value)))
+    return (tp, value)
+
+
+def replace_children[E: Expr](node: E, children: Sequence[Expr]) -> E:
+    """``node`` rebuilt with ``children`` (in :meth:`~logic_asts.spec.Expr.children` order) in place of its own.
+
+    Returns ``node`` itself when every new child is the same object as the old one.
+    """
+    if not children:
+        return node
+    new = iter(children)
+    changed = False
+    kwargs: dict[str, object] = {}
+    for name, alias in node_fields(type(node)):
+        value = getattr(node, name)
+        if is_expr(value):
+            value_new = next(new)
+            changed = changed or value_new is not value
+            value = value_new
+        elif type(value) is tuple and value and all(is_expr(v) for v in value):
+            values_new = tuple(itertools.islice(new, len(value)))
+            changed = changed or any(a is not b for a, b in zip(values_new, value))
+            value = values_new
+        kwargs[alias] = value
+    if not changed:
+        return node
+    return type(node)(**kwargs)
+
+
+# Slot in which attrs keeps the hash of a ``cache_hash=True`` class, ``None`` until computed.
+_HASH_CACHE = "_attrs_cached_hash"
+
+# The ``__eq__`` and ``__hash__`` attrs generated for each node class. They
+# compare and hash the fields, and so call ``==`` and ``hash`` on the children.
+_ATTRS_EQ: dict[type[Expr], typing.Callable[[Expr, Expr], bool]] = {}
+_ATTRS_HASH: dict[type[Expr], typing.Callable[[Expr], int]] = {}
+
+# Up to this many nested calls the generated methods are used as is; deeper
+# subformulas are compared and hashed with an explicit stack instead.
+_MAX_NESTING = 100
+
+
+class _Nesting(threading.local):
+    """The number of nested ``__eq__``/``__hash__`` calls in progress, per thread."""
+
+    depth = 0
+
+
+_nesting = _Nesting()
+
+
+def install_structural_dunders(cls: type[Expr]) -> None:
+    """Make the ``__eq__`` and ``__hash__`` that attrs generated for node class ``cls`` safe at any depth.
+
+    The generated methods recurse once per level of the formula. They are kept
+    for the top levels, where they are the fastest, and the rest of the
+    formula is handled by :func:`structurally_equal` and :func:`structural_hash`.
+    """
+    namespace = vars(cls)
+    if "__eq__" in namespace:
+        _ATTRS_EQ[cls] = namespace["__eq__"]
+        cls.__eq__ = _node_eq  # type: ignore[assignment,method-assign]
+    if _HASH_CACHE in namespace.get("__slots__", ()) and namespace.get("__hash__") is not None:
+        _ATTRS_HASH[cls] = namespace["__hash__"]
+        cls.__hash__ = _node_hash  # type: ignore[assignment,method-assign]
+
+
+def _node_eq(self: Expr, other: object) -> Any:
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+    nesting = _nesting
+    depth = nesting.depth
+    if depth >= _MAX_NESTING:
+        return structurally_equal(self, other)
+    nesting.depth = depth + 1
+    try:
+        return _ATTRS_EQ[type(self)](self, other)
+    finally:
+        nesting.depth = depth
+
+
+def _node_hash(self: Expr) -> int:
+    cached: int | None = getattr(self, _HASH_CACHE)
+    if cached is not None:
+        return cached
+    nesting = _nesting
+    depth = nesting.depth
+    if depth >= _MAX_NESTING:
+        return structural_hash(self)
+    nesting.depth = depth + 1
+    try:
+        return _ATTRS_HASH[type(self)](self)
+    finally:
+        nesting.depth = depth
+
+
+def structural_hash(expr: Expr) -> int:
+    """``hash(expr)``, computed bottom-up without recursion.
+
+    The hashes of the subformulas that are not cached yet are computed
+    children-first, so each one only looks up the cached hashes of its children.
+    """
+    cached: int | None = getattr(expr, _HASH_CACHE)
+    if cached is not None:
+        return cached
+    stack: list[tuple[Expr, bool]] = [(expr, False)]
+    while stack:
+        node, ready = stack.pop()
+        if getattr(node, _HASH_CACHE, 0) is not None:
+            continue
+        if ready:
+            _ATTRS_HASH[type(node)](node)
+        else:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children() if getattr(child, _HASH_CACHE, 0) is None)
+    cached = getattr(expr, _HASH_CACHE)
+    assert cached is not None
+    return cached
+
+
+def structurally_equal(left: Expr, right: Expr) -> bool:
+    """``left == right`` by structure: same node classes and equal fields, compared without recursion.
+
+    Pairs of identical nodes, and pairs already compared, are not walked
+    again, and nodes whose cached hashes differ are unequal right away.
+    """
+    stack: list[tuple[Expr, Expr]] = [(left, right)]
+    seen: set[tuple[int, int]] = set()
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        cls = type(a)
+        if type(b) is not cls:
+            return False
+        hash_a: int | None = getattr(a, _HASH_CACHE, None)
+        hash_b: int | None = getattr(b, _HASH_CACHE, None)
+        if hash_a is not None and hash_b is not None and hash_a != hash_b:
+            return False
+        key = (id(a), id(b))
+        if key in seen:
+            continue
+        seen.add(key)
+        for name, _ in node_fields(cls):
+            value_a = getattr(a, name)
+            value_b = getattr(b, name)
+            if is_expr(value_a):
+                if not is_expr(value_b):
+                    return False
+                stack.append((value_a, value_b))
+            elif type(value_a) is tuple and value_a and all(is_expr(v) for v in value_a):
+                if type(value_b) is not tuple or len(value_b) != len(value_a) or not all(is_expr(v) for v in value_b):
+                    return False
+                stack.extend(zip(value_a, value_b))
+            elif value_a != value_b:
+                return False
+    return True
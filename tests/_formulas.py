@@ -0,0 +1,86 @@
+"""Random formulas and traces shared by the tests that check evaluators against each other."""
+
+from __future__ import annotations
+
+import random
+
+from logic_asts.base import And, BaseExpr, Equiv, Implies, Literal, Not, Or, Variable, Xor
+from logic_asts.ltl import (
+    Always,
+    Eventually,
+    LTLExpr,
+    Next,
+    Release,
+    StrongNext,
+    StrongRelease,
+    TimeInterval,
+    Until,
+    WeakUntil,
+)
+
+ATOMS = ["a", "b", "c", "d"]
+LTL_ATOMS = ["a", "b", "c"]
+Trace = dict[str, list[bool]]
+
+
+def random_bool_formula(rng: random.Random, depth: int) -> BaseExpr[str]:
+    """A random propositional formula over :data:`ATOMS`, with every Boolean operator."""
+    if depth == 0 or rng.random() < 0.2:
+        if rng.random() < 0.1:
+            return Literal(rng.random() < 0.5)
+        return Variable(rng.choice(ATOMS))
+    op = rng.randrange(6)
+    if op == 0:
+        return Not(random_bool_formula(rng, depth - 1))
+    if op in (1, 2):
+        args = tuple(random_bool_formula(rng, depth - 1) for _ in range(rng.randrange(2, 4)))
+        return And(args) if op == 1 else Or(args)
+    binary = (Implies, Equiv, Xor)[op - 3]
+    return binary(random_bool_formula(rng, depth - 1), random_bool_formula(rng, depth - 1))
+
+
+def random_interval(rng: random.Random, *, bounded: bool = False) -> TimeInterval:
+    """A random interval starting at most at step 3, and ending within 4 steps of its start if ``bounded``."""
+    start = rng.choice([None, 0, 1, 2, 3])
+    end = (start or 0) + rng.randrange(1, 5)
+    return TimeInterval(start, end if bounded or rng.random() < 0.5 else None)
+
+
+def random_ltl_formula(rng: random.Random, depth: int, *, bounded: bool = False) -> LTLExpr[str]:
+    """A random LTL formula over :data:`LTL_ATOMS`, with every Boolean and temporal operator.
+
+    If ``bounded``, every interval has an end, so the formula only looks a
+    bounded number of steps ahead.
+    """
+    if depth == 0 or rng.random() < 0.15:
+        if rng.random() < 0.05:
+            return Literal(rng.random() < 0.5)
+        return Variable(rng.choice(LTL_ATOMS))
+
+    def sub() -> LTLExpr[str]:
+        return random_ltl_formula(rng, depth - 1, bounded=bounded)
+
+    op = rng.randrange(13)
+    if op == 0:
+        return Not(sub())
+    if op == 1:
+        return And((sub(), sub()))
+    if op == 2:
+        return Or((sub(), sub(), sub()))
+    if op == 3:
+        return (Implies, Equiv, Xor)[rng.randrange(3)](sub(), sub())
+    if op == 4:
+        return Next(sub(), rng.choice([None, 2, 3]))
+    if op == 5:
+        return StrongNext(sub(), rng.choice([None, 2, 3]))
+    if op == 6:
+        return Eventually(sub(), random_interval(rng, bounded=bounded), strong=rng.random() < 0.5)
+    if op == 7:
+        return Always(sub(), random_interval(rng, bounded=bounded), strong=rng.random() < 0.5)
+    binary = (Until, WeakUntil, Release, StrongRelease)[rng.randrange(4)]
+    return binary(sub(), sub(), random_interval(rng, bounded=bounded))
+
+
+def random_trace(rng: random.Random, n: int) -> Trace:
+    """A random trace of length ``n`` over :data:`LTL_ATOMS`."""
+    return {atom: [rng.random() < 0.5 for _ in range(n)] for atom in LTL_ATOMS}
@@ -0,0 +1,135 @@
+"""Tests for the array-backed formula arena."""
+
+from __future__ import annotations
+
+import itertools
+import sys
+
+import pytest
+
+import logic_asts
+from logic_asts.arena import FormulaArena
+from logic_asts.base import And, Not, Or, Variable, simple_eval
+from logic_asts.grammars import SupportedGrammars
+from logic_asts.ltl import Next
+from logic_asts.spec import Expr
+
+_SAMPLES: dict[SupportedGrammars, list[str]] = {
+    SupportedGrammars.BASE: ["(a & !b) | c -> d <-> e ^ TRUE", "!(x | y) & FALSE"],
+    SupportedGrammars.LTL: [
+        "G[0,5!] (req -> F grant) & X[3!] p U[1,4] q & a W b & X[2] c",
+        "G (a -> F[0,2] b) & (a -> F[0,2] b) R c & X!(d M e)",
+    ],
+    SupportedGrammars.STREL: ["G everywhere^hops[0,5] !obstacle & a reach[0,2] b", "somewhere[1,2] p | escape^d[0,3] q"],
+    SupportedGrammars.STL_GO: ["in^[0,1]{E}_{c,s}[1,3] consensus & F out^[-inf,inf]{A}_{m}[1,2] x"],
+    SupportedGrammars.SERE: ["first_match(~a) ; b[->3] : c[*1..2] && d[=2] | e[+]", "{a;b}[*2] & c[*]"],
+    SupportedGrammars.PSL: ["{a;b[*]}[]-> F c & {d}! & G {e}<>=> f", "{a[*2]}[]=> b"],
+}
+
+_CASES = [(syntax, text) for syntax, texts in _SAMPLES.items() for text in texts]
+
+
+@pytest.mark.parametrize(("syntax", "text"), _CASES)
+def test_roundtrip(syntax: SupportedGrammars, text: str) -> None:
+    """Converting to the arena and back gives an equal formula with the same text."""
+    expr = logic_asts.parse_expr(text, syntax=syntax)  # type: ignore[call-overload]
+    arena = FormulaArena()
+    root = arena.add(expr)
+    back = arena.to_expr(root)
+    assert back == expr
+    assert str(back) == str(expr)
+    assert len(arena) == len(set(expr.iter_subtree()))
+
+
+@pytest.mark.parametrize(("syntax", "text"), _CASES)
+def test_queries_match_expr(syntax: SupportedGrammars, text: str) -> None:
+    expr = logic_asts.parse_expr(text, syntax=syntax)  # type: ignore[call-overload]
+    arena = FormulaArena()
+    root = arena.add(expr)
+    assert arena.horizon(root) == expr.horizon()
+    assert {arena.to_expr(n) for n in arena.iter_subtree(root)} == set(expr.iter_subtree())
+    for assume_nnf in (False, True):
+        atoms = [arena.to_expr(n) for n in arena.atomic_predicates(root, assume_nnf=assume_nnf)]
+        assert atoms == list(expr.atomic_predicates(assume_nnf=assume_nnf))
+
+
+def test_subtree_is_post_order_and_filters_by_kind() -> None:
+    arena = FormulaArena()
+    root = arena.add(logic_asts.parse_expr("(a & b) | !(a & c)"))
+    order = list(arena.iter_subtree(root))
+    assert order[-1] == root
+    position = {n: i for i, n in enumerate(order)}
+    assert all(position[c] < position[n] for n in order for c in arena.children(n))
+    assert {arena.atom(n) for n in arena.iter_subtree(root, kind=Variable)} == {"a", "b", "c"}
+    assert [arena.kind(n) for n in arena.iter_subtree(root, kind=And)] == [And, And]
+
+
+def test_structural_sharing_across_formulas() -> None:
+    arena = FormulaArena()
+    f = arena.add(logic_asts.parse_expr("G (a -> F[0,2] b)", syntax="ltl"))
+    size = len(arena)
+    g = arena.add(logic_asts.parse_expr("G (a -> F[0,2] b)", syntax="ltl"))
+    assert f == g
+    assert len(arena) == size
+    h = arena.add(logic_asts.parse_expr("(a -> F[0,2] b) U c", syntax="ltl"))
+    assert len(arena) == size + 2  # only ``c`` and the ``U`` node are new
+    assert arena.to_expr(h).horizon() == arena.horizon(h)
+
+
+def test_params_and_atoms_are_typed() -> None:
+    """Equal-comparing values of different types (``1 == True``) stay distinct."""
+    arena = FormulaArena()
+    one = arena.add(Variable(1))
+    true = arena.add(Variable(True))
+    assert one != true
+    assert type(arena.atom(one)) is int
+    assert type(arena.atom(true)) is bool
+    assert arena.to_expr(arena.add(Next(Variable("p"), 1))) == Next(Variable("p"), 1)
+    assert arena.to_expr(arena.add(Next(Variable("p")))) == Next(Variable("p"))
+
+
+def test_to_expr_preserves_sharing() -> None:
+    arena = FormulaArena()
+    shared = And((Variable("a"), Variable("b")))
+    back = arena.to_expr(arena.add(Or((shared, Not(shared)))))
+    assert isinstance(back, Or)
+    first, second = back.args
+    assert isinstance(second, Not)
+    assert first is second.arg
+
+
+def test_simple_eval_matches_expr() -> None:
+    arena = FormulaArena()
+    expr = logic_asts.parse_expr("((a & !b) | c -> d <-> e ^ TRUE) & !(a | FALSE)")
+    root = arena.add(expr)
+    atoms = ["a", "b", "c", "d", "e"]
+    for bits in itertools.product((False, True), repeat=len(atoms)):
+        world = {name for name, bit in zip(atoms, bits) if bit}
+        assert arena.simple_eval(root, world) == simple_eval(expr, world)
+
+    with pytest.raises(TypeError):
+        _ = arena.simple_eval(arena.add(Next(Variable("a"))), set())
+
+
+def test_drop_index_keeps_sharing() -> None:
+    arena = FormulaArena()
+    f = arena.add(logic_asts.parse_expr("a & b"))
+    arena.drop_index()
+    assert arena.add(logic_asts.parse_expr("a & b")) == f
+    assert arena.nbytes > 0
+
+
+def test_deep_formula_does_not_recurse() -> None:
+    depth = 5 * sys.getrecursionlimit()
+    expr: Expr = Variable("p")
+    for _ in range(depth):
+        expr = Next(expr)
+    arena = FormulaArena()
+    root = arena.add(expr)
+    assert len(arena) == depth + 1
+    assert arena.horizon(root) == depth
+    back = arena.to_expr(root)
+    for _ in range(depth):
+        assert isinstance(back, Next)
+        back = back.arg
+    assert back == Variable("p")
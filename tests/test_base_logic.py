@@ -499,6 +499,21 @@ class TestParsing:
         assert parsed == expected
         assert parsed.horizon() == expected.horizon() == 0
 
+    @pytest.mark.parametrize("op, cls", [("&", And), ("|", Or)])
+    def test_parse_long_chain(self, op: str, cls: type[Expr]) -> None:
+        """Long ``&``/``|`` chains parse to a single flat n-ary node."""
+        n = 20_000
+        parsed = logic_asts.parse_expr(f" {op} ".join(f"x{i}" for i in range(n)), syntax="base")
+        assert isinstance(parsed, cls)
+        assert tuple(parsed.children()) == tuple(Variable(f"x{i}") for i in range(n))
+
+    def test_parse_chain_flattens_parenthesized_operands(self) -> None:
+        """Parenthesized sub-chains of the same operator are still spliced in."""
+        p, q, r, s = Variable("p"), Variable("q"), Variable("r"), Variable("s")
+        assert logic_asts.parse_expr("(p & q) & r & (s)", syntax="base") == And((p, q, r, s))
+        assert logic_asts.parse_expr("p | (q | r) | s", syntax="base") == Or((p, q, r, s))
+        assert logic_asts.parse_expr("(p | q) & r", syntax="base") == And((Or((p, q)), r))
+
 
 class TestSimpleEvaluation:
     """Tests for simple_eval function."""
@@ -0,0 +1,105 @@
+"""Tests for ``compile_eval``, which turns propositional formulas into Python functions."""
+
+from __future__ import annotations
+
+import itertools
+import random
+import sys
+
+import pytest
+
+import logic_asts
+from logic_asts.base import (
+    And,
+    BaseExpr,
+    Equiv,
+    Implies,
+    Not,
+    Or,
+    Variable,
+    Xor,
+    compile_eval,
+    simple_eval,
+)
+from tests._formulas import ATOMS, random_bool_formula
+
+
+class _CountingSet(set[str]):
+    lookups = 0
+
+    def __contains__(self, item: object) -> bool:
+        type(self).lookups += 1
+        return super().__contains__(item)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_simple_eval(seed: int) -> None:
+    expr = random_bool_formula(random.Random(seed), 6)
+    by_set = compile_eval(expr)
+    by_position = compile_eval(expr, ATOMS)
+    for bits in itertools.product((False, True), repeat=len(ATOMS)):
+        world = {atom for atom, bit in zip(ATOMS, bits) if bit}
+        expected = simple_eval(expr, world)
+        assert by_set(world) is expected
+        assert by_position(bits) is expected
+        # Truth values are read by their truthiness, and the result is a bool.
+        assert by_position([2 * bit for bit in bits]) is expected
+
+
+def test_truthy_values() -> None:
+    p, q = Variable("p"), Variable("q")
+    assert compile_eval(Xor(p, q), ["p", "q"])((2, 1)) is False
+    assert compile_eval(Equiv(p, q), ["p", "q"])((2, 1)) is True
+    assert compile_eval(And((p, q)), ["p", "q"])((2, 1)) is True
+    assert compile_eval(Or((p, q)), ["p", "q"])((0, "")) is False
+
+
+def test_unassigned_atoms_are_false() -> None:
+    expr = logic_asts.parse_expr("a | !z")
+    assert compile_eval(expr)(set()) is True
+    assert compile_eval(expr)({"z"}) is False
+    fn = compile_eval(expr, ["a"])
+    assert fn((False,)) is True
+    assert compile_eval(Variable("z"), ["a"])((True,)) is False
+
+
+def test_compiled_functions_are_cached() -> None:
+    expr = logic_asts.parse_expr("a & (b | !c)")
+    assert compile_eval(expr) is compile_eval(logic_asts.parse_expr("a & (b | !c)"))
+    assert compile_eval(expr, ["a", "b", "c"]) is compile_eval(expr, ("a", "b", "c"))
+    assert compile_eval(expr, ["a", "b", "c"]) is not compile_eval(expr, ["c", "b", "a"])
+
+
+def test_shared_subformulas_are_evaluated_once() -> None:
+    a, b = Variable("a"), Variable("b")
+    shared: BaseExpr[str] = Xor(a, b)
+    expr: BaseExpr[str] = And((Or((shared, a)), Equiv(shared, b), Implies(Xor(a, b), Not(b))))
+    fn = compile_eval(expr)
+    for world in ({"a"}, {"b"}, {"a", "b"}, set()):
+        _CountingSet.lookups = 0
+        assert fn(_CountingSet(world)) is simple_eval(expr, world)
+        # ``a`` and ``b`` are each looked up once, however often they occur.
+        assert _CountingSet.lookups <= 2
+
+
+def test_short_circuits() -> None:
+    fn = compile_eval(logic_asts.parse_expr("a | b | c"))
+    _CountingSet.lookups = 0
+    assert fn(_CountingSet({"a"})) is True
+    assert _CountingSet.lookups == 1
+
+
+def test_deep_formula() -> None:
+    depth = 5 * sys.getrecursionlimit()
+    expr: BaseExpr[str] = Variable("a")
+    for i in range(depth):
+        expr = Not(expr) if i % 2 else And((expr, Variable("b")))
+    assert compile_eval(expr)({"a", "b"}) is simple_eval(expr, {"a", "b"})
+    assert compile_eval(expr)({"a"}) is simple_eval(expr, {"a"})
+
+
+def test_rejects_temporal_operators() -> None:
+    with pytest.raises(TypeError, match="propositional"):
+        _ = compile_eval(logic_asts.parse_expr("X b", syntax="ltl"))  # type: ignore[arg-type]
+    with pytest.raises(TypeError):
+        _ = compile_eval(logic_asts.parse_expr("a & X b", syntax="ltl"))  # type: ignore[arg-type]
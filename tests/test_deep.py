@@ -0,0 +1,125 @@
+"""Operations on formulas far deeper than the interpreter's recursion limit."""
+
+from __future__ import annotations
+
+import sys
+import threading
+from collections.abc import Callable
+from typing import cast
+
+import pytest
+
+from logic_asts.base import Not, Or, Variable
+from logic_asts.ltl import Next, StrongNext, Until
+from logic_asts.psl import PSLFormula, SuffixImpliesUniv, WeakClosure
+from logic_asts.sere import Complement, Concat, FirstMatch, Repeat
+from logic_asts.spec import Expr
+from logic_asts.stl_go import EdgeCountInterval, GraphIncoming, Quantifier, WeightInterval
+from logic_asts.strel import DistanceInterval, Everywhere, Reach
+from logic_asts.utils import _nesting
+
+p, q = Variable("p"), Variable("q")
+
+_STEPS = 10**6
+
+
+@pytest.fixture(scope="module")
+def next_chain() -> Expr:
+    """``X[10**6] p``, expanded into a chain of a million ``Next`` nodes."""
+    return Next(p, _STEPS).expand()
+
+
+def test_expand_million_steps(next_chain: Expr) -> None:
+    node = next_chain
+    for _ in range(_STEPS):
+        assert isinstance(node, Next)
+        assert node.steps is None
+        node = node.arg
+    assert node is p
+
+
+def test_str_million_steps(next_chain: Expr) -> None:
+    assert str(next_chain) == "(X " * _STEPS + "p" + ")" * _STEPS
+
+
+def test_to_nnf_million_steps(next_chain: Expr) -> None:
+    nnf = Not(next_chain).to_nnf()
+    for _ in range(_STEPS):
+        assert isinstance(nnf, StrongNext)
+        nnf = nnf.arg
+    assert nnf == Not(p)
+
+
+def test_eq_and_hash_million_steps(next_chain: Expr) -> None:
+    other: Expr = Next(Variable("p"), _STEPS).expand()
+    assert other is not next_chain
+    assert hash(other) == hash(next_chain)
+    assert other == next_chain
+    assert other != Next(next_chain)
+    assert Next(other) != Next(StrongNext(next_chain))
+
+
+def test_eq_and_hash_in_threads() -> None:
+    """The nesting of ``__eq__``/``__hash__`` calls is counted per thread."""
+    errors: list[BaseException] = []
+
+    def compare() -> None:
+        try:
+            for _ in range(3):
+                lhs, rhs = Next(p, 5 * sys.getrecursionlimit()).expand(), Next(p, 5 * sys.getrecursionlimit()).expand()
+                assert hash(lhs) == hash(rhs) and lhs == rhs
+            assert _nesting.depth == 0
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=compare) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert _nesting.depth == 0
+
+
+# For every dialect, a node built on top of ``e``, with the text it adds
+# before and after the text of ``e``.
+_WRAPPERS: dict[str, tuple[Callable[[Expr], Expr], str, str]] = {
+    "base": (lambda e: Or((Not(e), q)), "(!", " | q)"),
+    "ltl": (lambda e: Until(Next(e, 2), q), "((X[2] ", ") U q)"),
+    "strel": (
+        lambda e: Everywhere(Reach(e, q, DistanceInterval(0, 2), "hops"), DistanceInterval(None, 3)),
+        "(everywhere[, 3] (",
+        " reach^hops[0, 2] q))",
+    ),
+    "stl_go": (
+        lambda e: GraphIncoming(e, frozenset({"c"}), EdgeCountInterval(1, 3), WeightInterval(0, 1), Quantifier.EXISTS),
+        "(In^{[, 1],exists}_{{c},[1, 3]} ",
+        ")",
+    ),
+    "sere": (lambda e: Concat((FirstMatch(Complement(Repeat(e, 1, 2))), q)), "(first_match(~{", "[*1..2]}) ; q)"),
+    "psl": (
+        lambda e: SuffixImpliesUniv(Concat((p, q)), Or((WeakClosure(Repeat(p)), cast(PSLFormula[str], e)))),
+        "{(p ; q)}[]-> ({p[*]} | ",
+        ")",
+    ),
+}
+
+
+@pytest.mark.parametrize("dialect", list(_WRAPPERS))
+def test_every_dialect(dialect: str) -> None:
+    wrap, prefix, suffix = _WRAPPERS[dialect]
+    assert str(wrap(p)) == prefix + "p" + suffix
+
+    depth = 2 * sys.getrecursionlimit()
+    first: Expr = p
+    second: Expr = Variable("p")
+    for _ in range(depth):
+        first, second = wrap(first), wrap(second)
+    assert str(first) == prefix * depth + "p" + suffix * depth
+    assert hash(first) == hash(second)
+    assert first == second
+    assert first != wrap(second)
+    assert first.horizon() == second.horizon()
+    assert first.expand() == second.expand()
+    assert first.to_nnf() == second.to_nnf()
+    assert first.to_nnf(negate=True) == second.to_nnf(negate=True)
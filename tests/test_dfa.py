@@ -0,0 +1,109 @@
+"""Tests for the on-the-fly LTLf automata of ``logic_asts.dfa``."""
+
+from __future__ import annotations
+
+import pickle
+import random
+import threading
+
+import pytest
+
+import logic_asts
+from logic_asts.base import Literal, Variable, simple_eval
+from logic_asts.dfa import DFA
+from logic_asts.ltl import LTLExpr, Next, StrongNext, progress
+from tests._formulas import LTL_ATOMS, random_ltl_formula
+
+
+def _holds(expr: LTLExpr[str], trace: list[set[str]]) -> bool:
+    """Whether ``expr`` holds on ``trace``, by progressing it through every state."""
+    for i, state in enumerate(trace):
+        expr = progress(expr, state, last=i == len(trace) - 1)
+    return expr == Literal(True)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_accepts_satisfying_traces(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 3)
+    dfa = DFA(expr)
+    for _ in range(30):
+        trace = [{atom for atom in LTL_ATOMS if rng.random() < 0.5} for _ in range(rng.randrange(1, 9))]
+        assert dfa.accepts(trace) == _holds(expr, trace), (str(expr), trace)
+    assert not dfa.accepts([])
+
+    # Every state has exactly one transition per state of the trace, and its label says which.
+    count = dfa.explore()
+    assert count == len(dfa)
+    table = dfa.transitions()
+    for q in range(count):
+        edges = dfa.edges(q)
+        assert len({target for _, target in edges}) == len(edges)
+        for letter in range(1 << len(dfa.atoms)):
+            state = {atom for position, atom in enumerate(dfa.atoms) if letter >> position & 1}
+            [target] = [target for label, target in edges if simple_eval(label, state)]
+            assert dfa.step(q, state) == target
+        assert {target for (source, _), target in table.items() if source == q} == {target for _, target in edges}
+    assert dfa.explore() == count
+
+
+def test_response_automaton() -> None:
+    dfa = DFA(logic_asts.parse_expr("G (req -> F grant) & idle", syntax="ltl"))
+    assert dfa.atoms == ("req", "grant", "idle")
+    assert dfa.explore() == 4
+    assert [dfa.is_accepting(q) for q in range(4)] == [False, True, False, False]
+    assert [str(dfa.formula(q)) for q in range(4)] == [
+        "((G (req -> (F grant))) & idle)",
+        "(G (req -> (F grant)))",
+        "((F grant) & (G (req -> (F grant))))",
+        "0",
+    ]
+    assert [(str(label), target) for label, target in dfa.edges(dfa.initial)] == [
+        ("((req & grant & idle) | (!req & idle))", 1),
+        ("(req & !grant & idle)", 2),
+        ("!idle", 3),
+    ]
+    assert [(str(label), target) for label, target in dfa.edges(2)] == [("grant", 1), ("!grant", 2)]
+    # From state 1 on, ``idle`` is never read.
+    assert all(letter < 4 for q, letter in dfa.transitions() if q > 0)
+    assert dfa.run([{"idle", "req"}, set(), {"grant"}]) == 1
+    assert dfa.run([{"idle", "req"}, {"idle"}]) == 2
+    assert dfa.run([{"req"}]) == 3
+
+
+def test_lazy_construction_and_pickling() -> None:
+    dfa = DFA(logic_asts.parse_expr("G (req -> F[0, 3] grant)", syntax="ltl"))
+    assert len(dfa) == 1 and dfa.transitions() == {}
+    assert dfa.accepts([{"req"}, set(), {"grant"}])
+    built = dict(dfa.transitions())
+    assert len(built) == 3
+    copy = pickle.loads(pickle.dumps(dfa))
+    assert copy.transitions() == built and len(copy) == len(dfa)
+    assert [copy.formula(q) for q in range(len(copy))] == [dfa.formula(q) for q in range(len(dfa))]
+    trace: list[set[str]] = [{"req"}, set(), set(), set(), set()]
+    assert copy.accepts(trace) is dfa.accepts(trace) is False
+    assert copy.explore() == dfa.explore() and copy.transitions() == dfa.transitions()
+
+    # Racing threads build every transition once.
+    dfa = DFA(logic_asts.parse_expr("G (a -> X[!] (b U[0, 3] c))", syntax="ltl"))
+    rng = random.Random(0)
+    traces = [[{atom for atom in "abc" if rng.random() < 0.5} for _ in range(50)] for _ in range(8)]
+    threads = [threading.Thread(target=dfa.run, args=(trace,)) for trace in traces]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    fresh = DFA(dfa.expr)
+    assert [dfa.accepts(trace) for trace in traces] == [fresh.accepts(trace) for trace in traces]
+    assert len(dfa) == len(fresh)
+    assert len({(dfa.formula(q), dfa.is_accepting(q)) for q in range(len(dfa))}) == len(dfa)
+
+
+def test_inputs_and_errors() -> None:
+    assert DFA(Literal(True)).accepts([set()])
+    assert not DFA(Literal(True)).accepts([])
+    assert DFA(Next(Variable("p"))).accepts([{"q"}])
+    assert not DFA(StrongNext(Variable("p"))).accepts([{"p"}])
+    assert DFA(Variable(1)).accepts([{1, 2}])
+    with pytest.raises(TypeError):
+        _ = DFA(logic_asts.parse_expr("{a ; b}", syntax="sere"))  # type: ignore[arg-type]
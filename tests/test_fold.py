@@ -0,0 +1,101 @@
+"""Tests for the memoized bottom-up ``fold`` and the operations built on it."""
+
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+import logic_asts
+from logic_asts.base import And, Implies, Literal, Not, Or, Variable
+from logic_asts.ltl import Always, Next, StrongNext, TimeInterval
+from logic_asts.spec import Expr, fold
+
+p, q = Variable("p"), Variable("q")
+
+
+def _ladder(levels: int) -> Expr:
+    """Every level uses the previous one twice: 3 * 2**levels - 2 tree nodes, 2 * levels + 1 distinct ones."""
+    node: Expr = p
+    for _ in range(levels):
+        node = Implies(node, Next(node))
+    return node
+
+
+def test_children_results_in_order() -> None:
+    expr = logic_asts.parse_expr("(a & !b) | (c -> d)")
+
+    def render(node: Expr, parts: tuple[str, ...]) -> str:
+        if not parts:
+            return str(node)
+        return f"{type(node).__name__}({', '.join(parts)})"
+
+    assert expr.fold(render) == "Or(And(a, Not(b)), Implies(c, d))"
+    assert fold(expr, render) == expr.fold(render) == logic_asts.fold(expr, render)
+
+
+@pytest.mark.parametrize("memo", [True, False])
+def test_call_counts(memo: bool) -> None:
+    levels = 12
+    calls: list[Expr] = []
+
+    def size(node: Expr, sizes: tuple[int, ...]) -> int:
+        calls.append(node)
+        return 1 + sum(sizes)
+
+    tree_size = fold(_ladder(levels), size, memo=memo)
+    assert tree_size == 3 * 2**levels - 2
+    if memo:
+        assert len(calls) == 2 * levels + 1
+        assert len({id(node) for node in calls}) == len(calls)
+    else:
+        assert len(calls) == tree_size
+
+
+def test_shared_dag_operations_are_linear() -> None:
+    """Without memoization these would take about 2**200 steps."""
+    expr = _ladder(200)
+    assert expr.horizon() == 200
+    expanded = expr.expand()
+    assert len(set(map(id, expanded.iter_subtree()))) < 10 * 200
+    nnf = expr.to_nnf()
+    assert len(set(map(id, nnf.iter_subtree()))) < 10 * 200
+    assert not any(isinstance(node, Implies) for node in nnf.iter_subtree())
+
+
+def test_expand_keeps_unchanged_subtrees() -> None:
+    expr = And((Or((p, Next(q))), Not(p)))
+    assert expr.expand() is expr
+    mixed = Or((expr, Implies(p, q)))
+    expanded = mixed.expand()
+    assert isinstance(expanded, Or)
+    assert expanded.args[0] is expr
+
+
+def test_expand_reaches_under_derived_operators() -> None:
+    expr = Implies(p, Always(q, TimeInterval(1, 2)))
+    expanded = expr.expand()
+    assert not any(isinstance(node, Always) for node in expanded.iter_subtree())
+    assert expanded == Or((Not(p), Next(And((q, Next(q))))))
+
+
+def test_nnf_of_negation() -> None:
+    expr: Expr = Not(And((p, Or((q, Literal(False))))))
+    assert expr.to_nnf() == Or((Not(p), Not(q)))
+    assert expr.to_nnf(negate=True) == And((p, q))
+
+
+def test_deep_formula_does_not_recurse() -> None:
+    depth = 5 * sys.getrecursionlimit()
+    expr: Expr = p
+    for _ in range(depth):
+        expr = Not(Next(expr))
+    assert expr.horizon() == depth
+    assert fold(expr, lambda _, depths: 1 + max(depths, default=0)) == 2 * depth + 1
+    assert fold(expr, lambda _, depths: 1 + max(depths, default=0), memo=False) == 2 * depth + 1
+    assert expr.expand() is expr
+    nnf = expr.to_nnf()
+    for i in range(depth):
+        assert isinstance(nnf, StrongNext if i % 2 == 0 else Next)
+        nnf = nnf.arg
+    assert nnf == (Not(p) if depth % 2 else p)
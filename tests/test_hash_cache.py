@@ -0,0 +1,66 @@
+"""Tests for the cached structural hashes of expression nodes."""
+
+from __future__ import annotations
+
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+import logic_asts
+from logic_asts.base import And, BaseExpr, Not, Variable
+from logic_asts.spec import Expr
+
+_SAMPLES = [
+    ("base", "(a & !b) | c -> d <-> e ^ TRUE"),
+    ("ltl", "G[0,5!] (req -> F grant) & X[3!] p U[1,4] q & a W b"),
+    ("strel", "G everywhere^hops[0,5] !obstacle & a reach[0,2] b"),
+    ("stl_go", "in^[0,1]{E}_{c,s}[1,3] consensus & F out^[-inf,inf]{A}_{m}[1,2] x"),
+    ("sere", "first_match(~a) ; b[->3] : c[*1..2] && d[=2] | e[+]"),
+    ("psl", "{a;b[*]}[]-> F c & {d}! & G {e}<>=> f"),
+]
+
+
+@pytest.mark.parametrize("syntax, text", _SAMPLES)
+def test_equal_nodes_hash_equal(syntax: str, text: str) -> None:
+    first = logic_asts.parse_expr(text, syntax=syntax)  # type: ignore[call-overload]
+    second = logic_asts.parse_expr(text, syntax=syntax)  # type: ignore[call-overload]
+    assert first is not second
+    for a, b in zip(first.iter_subtree(), second.iter_subtree(), strict=True):
+        assert a == b
+        assert hash(a) == hash(b) == hash(a)
+
+
+def test_repeated_hash_is_constant_time() -> None:
+    """Once every node was hashed, hashing the root no longer walks the tree."""
+    expr: BaseExpr[str] = Variable("x0")
+    for i in range(1, 2_000):
+        expr = And((Not(expr), Variable(f"x{i}")))
+        _ = hash(expr)  # each node hashes on top of its children's cached hashes
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(100)
+    try:
+        assert hash(expr) == hash(expr)
+        assert expr in {expr}
+    finally:
+        sys.setrecursionlimit(limit)
+
+
+def test_cached_hash_is_not_pickled() -> None:
+    """String hashes differ between interpreters, so a cached hash must not travel with the node."""
+    expr: Expr = logic_asts.parse_expr("G (p -> F[0,3] q) & r", syntax="ltl")
+    _ = hash(expr)
+    code = (
+        "import pickle, sys, logic_asts\n"
+        "e = pickle.loads(sys.stdin.buffer.read())\n"
+        "f = logic_asts.parse_expr('G (p -> F[0,3] q) & r', syntax='ltl')\n"
+        "assert hash(e) == hash(f) and e in {f}\n"
+    )
+    _ = subprocess.run(
+        [sys.executable, "-c", code],
+        input=pickle.dumps(expr),
+        check=True,
+        env={**os.environ, "PYTHONHASHSEED": "12345"},
+    )
@@ -0,0 +1,75 @@
+"""Import-time regression guard: ``import logic_asts`` must stay light.
+
+Uses ``python -X importtime`` in a fresh interpreter to record every module
+imported by a statement.
+"""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must only be imported on demand.
+_LAZY_MODULES = [
+    "lark",
+    "logic_asts.dfa",
+    "logic_asts.grammars",
+    "logic_asts.ltl",
+    "logic_asts.monitor",
+    "logic_asts.parsing",
+    "logic_asts.psl",
+    "logic_asts.sere",
+    "logic_asts.stl_go",
+    "logic_asts.strel",
+    "numpy",
+]
+
+
+def _imported_modules(code: str) -> dict[str, int]:
+    """Run ``code`` in a fresh interpreter and return ``{module: cumulative import time in us}``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_is_lazy() -> None:
+    modules = _imported_modules(
+        "import logic_asts\n"
+        "from logic_asts.base import Variable, simple_eval\n"
+        "assert simple_eval(logic_asts.Variable('p') & ~Variable('q'), {'p'})\n"
+    )
+    assert "logic_asts" in modules
+    assert [m for m in _LAZY_MODULES if m in modules or any(k.startswith(m + ".") for k in modules)] == []
+
+
+def test_parse_expr_loads_grammars_on_first_use() -> None:
+    modules = _imported_modules("import logic_asts\nlogic_asts.parse_expr('G p', syntax='ltl')\n")
+    assert {"lark", "logic_asts.grammars", "logic_asts.ltl"} <= modules.keys()
+
+
+@pytest.mark.parametrize("name", ["ltl", "SupportedGrammars", "parse_many", "LTLExpr", "get_parser"])
+def test_lazy_attributes_resolve(name: str) -> None:
+    import logic_asts
+
+    assert name in logic_asts.__all__
+    assert name in dir(logic_asts)
+    assert getattr(logic_asts, name) is getattr(logic_asts, name)
+
+
+def test_unknown_attribute() -> None:
+    import logic_asts
+
+    with pytest.raises(AttributeError):
+        _ = logic_asts.does_not_exist  # type: ignore[attr-defined]
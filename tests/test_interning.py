@@ -0,0 +1,109 @@
+"""Tests for opt-in hash-consing of expression nodes."""
+
+from __future__ import annotations
+
+import gc
+from collections.abc import Iterator
+
+import pytest
+
+import logic_asts
+from logic_asts.base import And, Literal, Not, Or, Variable
+from logic_asts.interning import (
+    disable_interning,
+    enable_interning,
+    intern,
+    interned_count,
+    interning,
+    is_interning_enabled,
+)
+from logic_asts.ltl import Next, TimeInterval, Until
+from logic_asts.sere import Concat, Repeat
+
+
+@pytest.fixture(autouse=True)
+def _interning_off() -> Iterator[None]:
+    disable_interning()
+    yield
+    disable_interning()
+
+
+def test_disabled_by_default() -> None:
+    assert not is_interning_enabled()
+    assert Variable("p") is not Variable("p")
+
+
+def test_construction_returns_canonical_nodes() -> None:
+    with interning():
+        assert is_interning_enabled()
+        p, q = Variable("p"), Variable("q")
+        assert Variable("p") is p
+        assert (p & ~q) is And((Variable("p"), Not(Variable("q"))))
+        assert Until(p, q, TimeInterval(0, 3)) is Until(p, q, TimeInterval(0, 3))
+        assert Next(p) is Next(p, 1)  # converted fields are compared after conversion
+        assert Concat((Repeat(p, 1, 2), q)) is Concat((Repeat(p, 1, 2), q))
+        assert Until(p, q, TimeInterval(0, 3)) is not Until(p, q, TimeInterval(0, 4))
+    assert not is_interning_enabled()
+
+
+def test_equal_but_differently_typed_values_are_not_merged() -> None:
+    with interning():
+        assert Variable(1) is not Variable(True)
+        assert Variable(1) is not Variable(1.0)
+        assert Literal(True) is Literal(True)
+        assert Variable(("a", 1)) is not Variable(("a", True))
+
+
+def test_parsed_formulas_share_subterms() -> None:
+    with interning():
+        e = logic_asts.parse_expr("(a & b) | X (a & b) | G (a & b)", syntax="ltl")
+        f = logic_asts.parse_expr("(a & b) | X (a & b) | G (a & b)", syntax="ltl")
+    assert e is f
+    assert isinstance(e, Or)
+    shared = e.args[0]
+    assert all(arg is shared or next(arg.children()) is shared for arg in e.args)
+
+
+def test_intern_existing_tree() -> None:
+    p1, p2 = Variable("p"), Variable("p")
+    e = Or((And((p1, Variable("q"))), And((p2, Variable("q")))))
+    assert e.args[0] is not e.args[1]
+
+    canonical = intern(e)
+    assert canonical == e
+    assert isinstance(canonical, Or)
+    assert canonical.args[0] is canonical.args[1]
+    assert intern(Or((And((Variable("p"), Variable("q"))),) * 2)) is canonical
+    assert intern(canonical) is canonical
+    assert not is_interning_enabled()
+
+
+def test_intern_deep_tree() -> None:
+    e: logic_asts.ltl.LTLExpr[str] = Variable("p")
+    for _ in range(20_000):
+        e = Next(e)
+    canonical = intern(e)
+    assert canonical is intern(canonical)
+    with interning():
+        assert Next(canonical.arg) is canonical  # type: ignore[union-attr]
+
+
+def test_table_is_weak() -> None:
+    gc.collect()
+    before = interned_count()
+    with interning():
+        e = And(tuple(Variable(f"weak{i}") for i in range(100)))
+    assert interned_count() >= before + 101
+    del e
+    gc.collect()
+    assert interned_count() == before
+
+
+def test_nested_context_managers_restore_state() -> None:
+    enable_interning()
+    with interning(False):
+        assert not is_interning_enabled()
+        with interning():
+            assert is_interning_enabled()
+        assert not is_interning_enabled()
+    assert is_interning_enabled()
@@ -254,6 +254,16 @@ class TestUntilOperator:
         assert math.isinf(expr1.horizon())
         assert expr2.horizon() == 10
 
+    def test_weak_until_horizon(self) -> None:
+        """Test that W and M also need their lhs at the end of the interval."""
+        p = Variable("p")
+        q = Variable("q")
+        interval = ltl.TimeInterval(0, 10)
+        assert ltl.Until(ltl.Next(p), q, interval).horizon() == 10
+        assert ltl.WeakUntil(ltl.Next(p), q, interval).horizon() == 11
+        assert ltl.StrongRelease(ltl.Next(p), q, interval).horizon() == 11
+        assert ltl.WeakUntil(p, ltl.Next(q), interval).horizon() == 11
+
     def test_until_to_nnf(self) -> None:
         """Test NNF conversion of Until."""
         p = Variable("p")
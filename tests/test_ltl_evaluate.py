@@ -0,0 +1,330 @@
+"""Tests for finite-trace (LTLf) evaluation of LTL formulas with ``ltl.evaluate`` and ``ltl.progress``."""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING
+
+import pytest
+
+import logic_asts
+from logic_asts.base import And, Equiv, Implies, Literal, Not, Or, Variable, Xor
+from logic_asts.ltl import (
+    Always,
+    Eventually,
+    LTLExpr,
+    Next,
+    Release,
+    StrongNext,
+    StrongRelease,
+    TimeInterval,
+    Until,
+    WeakUntil,
+    _progress_root,
+    evaluate,
+    evaluate_batch,
+    evaluate_packed,
+    progress,
+)
+from tests._formulas import LTL_ATOMS, Trace, random_ltl_formula, random_trace
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = pytest.importorskip("numpy")
+
+
+def _window(interval: TimeInterval, i: int, n: int) -> range:
+    """The steps of ``[i + a, i + b]`` inside a trace of length ``n``."""
+    start = i + (interval.start or 0)
+    return range(start, n if interval.end is None else min(n, i + interval.end + 1))
+
+
+def _holds(expr: LTLExpr[str], trace: Trace, n: int, i: int) -> bool:
+    """Reference semantics, straight from the definitions."""
+
+    def at(sub: LTLExpr[str], j: int) -> bool:
+        return _holds(sub, trace, n, j)
+
+    match expr:
+        case Literal(value):
+            return value
+        case Variable(name):
+            return trace.get(name, [False] * n)[i]
+        case Not(arg):
+            return not at(arg, i)
+        case And(args):
+            return all(at(arg, i) for arg in args)
+        case Or(args):
+            return any(at(arg, i) for arg in args)
+        case Xor(lhs, rhs):
+            return at(lhs, i) != at(rhs, i)
+        case Equiv(lhs, rhs):
+            return at(lhs, i) == at(rhs, i)
+        case Implies(lhs, rhs):
+            return not at(lhs, i) or at(rhs, i)
+        case Next(arg, steps):
+            return i + (steps or 1) >= n or at(arg, i + (steps or 1))
+        case StrongNext(arg, steps):
+            return i + (steps or 1) < n and at(arg, i + (steps or 1))
+        case Eventually(arg, interval, strong):
+            found = any(at(arg, j) for j in _window(interval, i, n))
+            if interval.end is None:
+                return found or (not strong and i + (interval.start or 0) >= n)
+            return found or (not strong and i + interval.end >= n)
+        case Always(arg, interval, strong):
+            holds = all(at(arg, j) for j in _window(interval, i, n))
+            if interval.end is None:
+                return holds and (not strong or i + (interval.start or 0) < n)
+            return holds and (not strong or i + interval.end < n)
+        case Until(lhs, rhs, interval):
+            return any(at(rhs, j) and all(at(lhs, k) for k in range(i, j)) for j in _window(interval, i, n))
+        case WeakUntil(lhs, rhs, interval):
+            return _holds(Until(lhs, rhs, interval), trace, n, i) or all(
+                at(lhs, k) for k in _window(TimeInterval(None, interval.end), i, n)
+            )
+        case Release(lhs, rhs, interval):
+            return all(at(rhs, j) or any(at(lhs, k) for k in range(i, j)) for j in _window(interval, i, n))
+        case StrongRelease(lhs, rhs, interval):
+            return _holds(Release(lhs, rhs, interval), trace, n, i) and any(
+                at(lhs, k) for k in _window(TimeInterval(None, interval.end), i, n)
+            )
+        case _:
+            raise TypeError(type(expr))
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_matches_reference(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 4)
+    for n in (1, 2, 5, 12):
+        trace = random_trace(rng, n)
+        expected = [_holds(expr, trace, n, i) for i in range(n)]
+        assert evaluate(expr, trace).tolist() == expected, (str(expr), trace)
+        matrix = np.array([trace[atom] for atom in LTL_ATOMS]).T
+        assert evaluate(expr, matrix, index=LTL_ATOMS).tolist() == expected
+        assert evaluate_packed(expr, trace).tolist() == expected
+
+
+def test_next_at_end_of_trace() -> None:
+    p = Variable("p")
+    trace = {"p": [False, True, True]}
+    assert evaluate(Next(p), trace).tolist() == [True, True, True]
+    assert evaluate(StrongNext(p), trace).tolist() == [True, True, False]
+    assert evaluate(Next(p, 2), trace).tolist() == [True, True, True]
+    assert evaluate(StrongNext(p, 2), trace).tolist() == [True, False, False]
+    assert evaluate(Next(Not(p)), trace).tolist() == [False, False, True]
+    assert evaluate(StrongNext(Not(p)), trace).tolist() == [False, False, False]
+
+
+def test_parsed_formulas() -> None:
+    trace = {"req": [True, False, False, True, False], "grant": [False, False, True, False, False]}
+    cases = {
+        "G (req -> F grant)": [False, False, False, False, True],
+        "F[0, 2] grant": [True, True, True, True, True],
+        "F[0, 2!] grant": [True, True, True, False, False],
+        "(req | !grant) U[1, 2] grant": [True, True, False, False, False],
+        "!req W grant": [False, True, True, False, True],
+        "X[!] X[!] grant": [True, False, False, False, False],
+    }
+    for text, expected in cases.items():
+        expr = logic_asts.parse_expr(text, syntax="ltl")
+        assert evaluate(expr, trace).tolist() == expected, text
+
+
+@pytest.mark.parametrize("text", ["G F p", "p U (q R !p)", "X[3] (p W X[!] q)", "(p M q) <-> !(!p W !q)"])
+def test_unbounded_formulas_match_their_expansion(text: str) -> None:
+    rng = random.Random(0)
+    expr = logic_asts.parse_expr(text, syntax="ltl")
+    for n in (1, 4, 9):
+        trace = {"p": [rng.random() < 0.5 for _ in range(n)], "q": [rng.random() < 0.5 for _ in range(n)]}
+        assert evaluate(expr, trace).tolist() == evaluate(expr.expand(), trace).tolist()
+
+
+def test_long_trace_and_wide_interval() -> None:
+    n = 200_000
+    p = np.zeros(n, dtype=bool)
+    p[::1000] = True
+    interval = TimeInterval(0, 10**9)
+    # The windows of the weak ``F`` that run past the end of the trace hold.
+    assert evaluate(Always(Eventually(Variable("p"), TimeInterval(0, 999)), interval), {"p": p}).all()
+    result = evaluate(Eventually(Variable("p"), interval, strong=True), {"p": p})
+    assert result[: n - 999].all()
+    assert not result[n - 999 :].any()
+    assert (evaluate_packed(Eventually(Variable("p"), interval, strong=True), {"p": p}) == result).all()
+
+
+@pytest.mark.parametrize("text", ["G (a -> F[0, 70] b)", "a U[3, 130] b", "(a | c) W X[65] b", "!a M[64, 200] !b"])
+def test_packed_across_words(text: str) -> None:
+    expr = logic_asts.parse_expr(text, syntax="ltl")
+    rng = np.random.default_rng(0)
+    for n in (0, 63, 64, 65, 1000):
+        trace = {"a": rng.random(n) < 0.97, "b": rng.random(n) < 0.02, "c": rng.random(n) < 0.5}
+        assert (evaluate_packed(expr, trace) == evaluate(expr, trace)).all(), n
+
+
+def test_inputs_and_errors() -> None:
+    expr = Until(Variable("a"), Variable("b"))
+    assert evaluate(expr, {"a": [True, True], "b": [False, True]}).dtype == np.bool_
+    assert evaluate(Variable("z"), {"a": [True, True]}).tolist() == [False, False]
+    assert evaluate(expr, np.zeros((0, 2), dtype=bool), index=["a", "b"]).shape == (0,)
+    a = np.array([True, False])
+    result = evaluate(Variable("a"), {"a": a})
+    result[0] = False
+    assert a[0]
+    with pytest.raises(TypeError):
+        _ = evaluate(expr, np.zeros((2, 2)))
+    with pytest.raises(ValueError, match="1-D"):
+        _ = evaluate(expr, {"a": [True], "b": [True, False]})
+    with pytest.raises(TypeError):
+        _ = evaluate(logic_asts.parse_expr("{a ; b}", syntax="sere"), {"a": [True]})  # type: ignore[arg-type]
+    assert evaluate_packed(Variable("z"), {"a": [True, True]}).tolist() == [False, False]
+    assert evaluate_packed(expr, np.zeros((0, 2), dtype=bool), index=["a", "b"]).shape == (0,)
+    assert evaluate_packed(expr, {"a": [True, True], "b": [False, True]}).dtype == np.bool_
+    with pytest.raises(TypeError):
+        _ = evaluate_packed(logic_asts.parse_expr("{a ; b}", syntax="sere"), {"a": [True]})  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_batch_matches_each_trace(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 4)
+    lengths = [rng.randrange(0, 10) for _ in range(rng.randrange(1, 6))]
+    traces = [random_trace(rng, n) for n in lengths]
+    size = max(lengths)
+    expected = np.zeros((len(lengths), size), dtype=bool)
+    for k, (trace, n) in enumerate(zip(traces, lengths, strict=True)):
+        expected[k, :n] = evaluate(expr, trace) if n else []
+
+    # Padded with random values, which must not leak into the traces.
+    padded = np.array(
+        [
+            [[*trace[atom], *(rng.random() < 0.5 for _ in range(size - len(trace[atom])))] for atom in LTL_ATOMS]
+            for trace in traces
+        ]
+    )
+    batch = padded.transpose(0, 2, 1)
+    assert (evaluate_batch(expr, batch, index=LTL_ATOMS, lengths=lengths) == expected).all(), str(expr)
+    columns = {atom: padded[:, i] for i, atom in enumerate(LTL_ATOMS)}
+    assert (evaluate_batch(expr, columns, lengths=lengths) == expected).all()
+
+    concatenated = {atom: [value for trace in traces for value in trace[atom]] for atom in LTL_ATOMS}
+    assert (evaluate_batch(expr, concatenated, lengths=lengths) == expected).all()
+    matrix = np.array([concatenated[atom] for atom in LTL_ATOMS], dtype=bool).reshape(len(LTL_ATOMS), -1).T
+    assert (evaluate_batch(expr, matrix, index=LTL_ATOMS, lengths=lengths) == expected).all()
+
+
+def test_batch_next_at_each_trace_end() -> None:
+    p = Variable("p")
+    columns = {"p": [[False, True, True, True], [True, True, True, True]]}
+    lengths = [3, 2]
+    assert evaluate_batch(Next(p), columns, lengths=lengths).tolist() == [
+        [True, True, True, False],
+        [True, True, False, False],
+    ]
+    assert evaluate_batch(StrongNext(p), columns, lengths=lengths).tolist() == [
+        [True, True, False, False],
+        [True, False, False, False],
+    ]
+    assert evaluate_batch(Next(Not(p), 2), columns, lengths=lengths).tolist() == [
+        [False, True, True, False],
+        [True, True, False, False],
+    ]
+    assert evaluate_batch(Always(p), columns).tolist() == [[False, True, True, True], [True, True, True, True]]
+    assert evaluate_batch(Always(p), columns, lengths=lengths).tolist() == [
+        [False, True, True, False],
+        [True, True, False, False],
+    ]
+
+
+def test_batch_inputs_and_errors() -> None:
+    expr = Until(Variable("a"), Variable("b"))
+    assert evaluate_batch(expr, np.zeros((3, 0, 2), dtype=bool), index=["a", "b"]).shape == (3, 0)
+    assert evaluate_batch(expr, {"a": [], "b": []}, lengths=[0, 0]).shape == (2, 0)
+    assert evaluate_batch(Variable("z"), {"a": [[True, True]]}).tolist() == [[False, False]]
+    a = np.array([[True, False]])
+    result = evaluate_batch(Variable("a"), {"a": a})
+    result[0, 0] = False
+    assert a[0, 0]
+    with pytest.raises(TypeError):
+        _ = evaluate_batch(expr, np.zeros((2, 2, 2)))
+    with pytest.raises(TypeError):
+        _ = evaluate_batch(expr, {"a": [[True]]}, index=["a"])
+    with pytest.raises(ValueError, match="required"):
+        _ = evaluate_batch(expr, {"a": [True, False]})
+    with pytest.raises(ValueError, match="add up"):
+        _ = evaluate_batch(expr, {"a": [True, False]}, lengths=[1, 2])
+    with pytest.raises(ValueError, match="at most"):
+        _ = evaluate_batch(expr, {"a": [[True, False]]}, lengths=[3])
+    with pytest.raises(ValueError, match="non-negative"):
+        _ = evaluate_batch(expr, {"a": [True, False]}, lengths=[3, -1])
+    with pytest.raises(ValueError, match="single shape"):
+        _ = evaluate_batch(expr, {"a": [[True]], "b": [[True, False]]})
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_progress_matches_reference(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 4)
+    for n in (1, 2, 5, 12):
+        trace = random_trace(rng, n)
+        states = [{atom for atom in LTL_ATOMS if trace[atom][i]} for i in range(n)]
+        for i in range(n):
+            progressed = expr
+            for k in range(i, n):
+                progressed = progress(progressed, states[k], last=k == n - 1)
+            assert progressed == Literal(_holds(expr, trace, n, i)), (str(expr), trace, i)
+
+
+def test_progress_examples() -> None:
+    p, q = Variable("p"), Variable("q")
+    cases: list[tuple[LTLExpr[str], set[str], str]] = [
+        (Eventually(p, TimeInterval(2, 4)), set(), "(F[1, 3] p)"),
+        (Eventually(p, TimeInterval(0, 4), strong=True), set(), "(F[0, 3!] p)"),
+        (Eventually(p, TimeInterval(0, 1)), set(), "p"),
+        (Always(p, TimeInterval(0, 3)), {"p"}, "(G[0, 2] p)"),
+        (Always(p, TimeInterval(0, 3)), set(), "0"),
+        (Next(p, 3), set(), "(X[2] p)"),
+        (StrongNext(p), set(), "p"),
+        (Until(p, q), {"p"}, "(p U q)"),
+        (Until(p, q, TimeInterval(1, 3)), {"p"}, "(p U[0, 2] q)"),
+        (WeakUntil(p, q, TimeInterval(0, 1)), {"p"}, "(q | p)"),
+        (Release(p, q), {"q"}, "(p R q)"),
+        (StrongRelease(p, q, TimeInterval(0, 1)), {"q"}, "(p & q)"),
+        (And((p, Or((q, Not(q))))), {"p"}, "1"),
+        (Equiv(Next(q), Eventually(q)), set(), "(q <-> (F q))"),
+        (Xor(p, Next(q)), {"p"}, "!q"),
+    ]
+    for expr, state, expected in cases:
+        assert str(progress(expr, state)) == expected, str(expr)
+    assert progress(Next(p), set(), last=True) == Literal(True)
+    assert progress(StrongNext(p), set(), last=True) == Literal(False)
+    assert progress(Eventually(p, TimeInterval(0, 2)), set(), last=True) == Literal(True)
+    assert progress(Eventually(p, TimeInterval(0, 2), strong=True), set(), last=True) == Literal(False)
+    assert progress(Release(p, q), {"q"}, last=True) == Literal(True)
+
+
+def test_progress_shares_formulas() -> None:
+    spec = logic_asts.parse_expr("G (req -> F[0, 3] grant) & (busy U done)", syntax="ltl")
+    assert isinstance(spec, And)
+    rng = random.Random(0)
+    states = [{atom for atom in ("req", "grant", "busy") if rng.random() < 0.5} for _ in range(200)]
+    progressed: LTLExpr[str] = spec
+    seen: dict[LTLExpr[str], LTLExpr[str]] = {}
+    for state in states:
+        progressed = progress(progressed, state)
+        # Equal formulas are the same object.
+        assert seen.setdefault(progressed, progressed) is progressed
+    # The formula stays small: a few pending obligations.
+    assert len(seen) < 30
+    before = _progress_root.cache_info()
+    again: LTLExpr[str] = spec
+    for state in states:
+        again = progress(again, set(state))
+    assert again is progressed
+    after = _progress_root.cache_info()
+    assert after.misses == before.misses
+    assert after.hits == before.hits + len(states)
+    assert progress(spec, {"done"}) is progress(spec.args[0], set())
+    with pytest.raises(TypeError):
+        _ = progress(logic_asts.parse_expr("{a ; b}", syntax="sere"), {"a"})  # type: ignore[arg-type]
@@ -0,0 +1,238 @@
+"""Tests for online monitoring of LTL formulas with ``monitor.LTLMonitor``."""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import TYPE_CHECKING
+
+import pytest
+
+import logic_asts
+from logic_asts.base import Variable
+from logic_asts.ltl import TimeInterval, Until, evaluate
+from logic_asts.monitor import IncrementalEvaluator, LTLMonitor, Verdict
+from tests._formulas import LTL_ATOMS, Trace, random_ltl_formula, random_trace
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    np = pytest.importorskip("numpy")
+
+
+def _states(trace: Trace, n: int) -> list[set[str]]:
+    return [{atom for atom in LTL_ATOMS if trace[atom][i]} for i in range(n)]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_bounded_formulas_are_exact(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 4, bounded=True)
+    horizon = expr.horizon()
+    assert not math.isinf(horizon)
+    n = 60
+    trace = random_trace(rng, n)
+    expected = [Verdict.TRUE if value else Verdict.FALSE for value in evaluate(expr, trace).tolist()]
+
+    monitor = LTLMonitor(expr)
+    assert monitor.lookahead == horizon
+    verdicts: list[Verdict] = []
+    for t, state in enumerate(_states(trace, n)):
+        verdicts += monitor.step(state)
+        assert monitor.position == len(verdicts) == max(0, t + 1 - horizon)
+    assert verdicts + monitor.finish() == expected
+
+    # The same verdicts in batches of random sizes.
+    verdicts, start = [], 0
+    while start < n:
+        stop = min(n, start + rng.randrange(1, 8))
+        verdicts += monitor.extend({atom: column[start:stop] for atom, column in trace.items()})
+        start = stop
+    assert verdicts + monitor.finish() == expected
+
+    # Mixing single states and batches, with verdicts delayed past the horizon.
+    lookahead = int(horizon) + rng.randrange(3)
+    monitor = LTLMonitor(expr, lookahead=lookahead)
+    states = _states(trace, n)
+    verdicts, start = [], 0
+    while start < n:
+        if rng.random() < 0.6:
+            verdicts += monitor.step(states[start])
+            start += 1
+        else:
+            # Long batches are evaluated at once, short ones state by state.
+            stop = min(n, start + rng.choice([1, 3, 40]))
+            verdicts += monitor.extend({atom: column[start:stop] for atom, column in trace.items()})
+            start = stop
+        assert monitor.position == len(verdicts) == max(0, start - lookahead)
+    assert verdicts + monitor.finish() == expected
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_three_valued_verdicts_are_sound(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 4, bounded=False)
+    n = 12
+    trace = random_trace(rng, n)
+    monitor = LTLMonitor(expr, lookahead=rng.randrange(4))
+    states = _states(trace, n)
+    for t, state in enumerate(states):
+        verdicts = monitor.step(state)
+        first = monitor.position - len(verdicts)
+        # A conclusive verdict holds on every continuation of the stream seen so far, including none.
+        for extra in (0, 1, 3, 8):
+            continuation = random_trace(rng, extra)
+            full = {atom: trace[atom][: t + 1] + continuation[atom] for atom in LTL_ATOMS}
+            values = evaluate(expr, full).tolist()
+            for i, verdict in enumerate(verdicts, start=first):
+                if verdict is not Verdict.INCONCLUSIVE:
+                    assert (verdict is Verdict.TRUE) == values[i], (str(expr), i, full)
+    remaining = monitor.finish()
+    assert [v is Verdict.TRUE for v in remaining] == evaluate(expr, trace).tolist()[n - len(remaining) :]
+
+
+def test_three_valued_examples() -> None:
+    monitor = LTLMonitor(logic_asts.parse_expr("F p", syntax="ltl"), lookahead=2)
+    assert monitor.lookahead == 2 and math.isinf(monitor.horizon)
+    assert monitor.extend({"p": [False, False, True, False, False]}) == [Verdict.TRUE, Verdict.TRUE, Verdict.TRUE]
+    assert monitor.finish() == [Verdict.FALSE, Verdict.FALSE]
+
+    monitor = LTLMonitor(logic_asts.parse_expr("G (req -> X[!] grant)", syntax="ltl"))
+    assert monitor.lookahead == 1
+    verdicts = [monitor.step(state) for state in ({"req"}, {"grant"}, {"req"}, set(), {"grant"})]
+    assert verdicts == [[], [Verdict.INCONCLUSIVE], [Verdict.INCONCLUSIVE], [Verdict.FALSE], [Verdict.INCONCLUSIVE]]
+    assert monitor.finish() == [Verdict.TRUE]
+
+    # A verdict is only given by lookahead states, even if later ones decide it.
+    monitor = LTLMonitor(logic_asts.parse_expr("p U q", syntax="ltl"), lookahead=0)
+    assert monitor.step({"p"}) == [Verdict.INCONCLUSIVE]
+    assert monitor.step({"q"}) == [Verdict.TRUE]
+    assert monitor.step(set()) == [Verdict.FALSE]
+
+
+def test_long_stream_in_constant_memory() -> None:
+    expr = logic_asts.parse_expr("G[0, 50] (req -> F[0, 200] grant)", syntax="ltl")
+    monitor = LTLMonitor(expr)
+    assert monitor.lookahead == 250
+    rng = np.random.default_rng(0)
+    n, chunk = 100_000, 7_919
+    trace = {"req": rng.random(n) < 0.01, "grant": rng.random(n) < 0.05}
+    verdicts: list[Verdict] = []
+    for start in range(0, n, chunk):
+        verdicts += monitor.extend({atom: column[start : start + chunk] for atom, column in trace.items()})
+        assert monitor.position == len(verdicts) == min(start + chunk, n) - 250
+    verdicts += monitor.finish()
+    assert [v is Verdict.TRUE for v in verdicts] == evaluate(expr, trace).tolist()
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["a U[0, 300] b", "!a R[5, 300] !b", "(a | c) W[0, 200] X[3] b", "!a M[0, 250] !b", "G[10, 400] (a -> F[0, 50] b)"],
+)
+def test_wide_windows_state_by_state(text: str) -> None:
+    expr = logic_asts.parse_expr(text, syntax="ltl")
+    rng = np.random.default_rng(1)
+    n = 2000
+    trace = {"a": rng.random(n) < 0.995, "b": rng.random(n) < 0.004, "c": rng.random(n) < 0.5}
+    monitor = LTLMonitor(expr)
+    verdicts: list[Verdict] = []
+    for i in range(n):
+        verdicts += monitor.step({atom for atom, column in trace.items() if column[i]})
+    verdicts += monitor.finish()
+    assert [v is Verdict.TRUE for v in verdicts] == evaluate(expr, trace).tolist()
+
+
+def test_inputs_and_errors() -> None:
+    monitor = LTLMonitor(Until(Variable("a"), Variable("b"), TimeInterval(0, 2)))
+    matrix = np.array([[True, False], [False, True], [True, True]])
+    assert monitor.extend(matrix, index=["a", "b"]) == [Verdict.TRUE]
+    assert monitor.extend({"z": [True]}) == [Verdict.TRUE]
+    assert monitor.finish() == [Verdict.TRUE, Verdict.FALSE]
+    assert monitor.position == 0
+    assert monitor.finish() == []
+    assert LTLMonitor(Variable("a")).step({"a", "z"}) == [Verdict.TRUE]
+    with pytest.raises(TypeError):
+        _ = monitor.extend(matrix)
+    with pytest.raises(ValueError, match="non-negative"):
+        _ = LTLMonitor(Variable("a"), lookahead=-1)
+    with pytest.raises(TypeError):
+        _ = LTLMonitor(logic_asts.parse_expr("{a ; b}", syntax="sere"))  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_incremental_evaluation(seed: int) -> None:
+    rng = random.Random(seed)
+    expr = random_ltl_formula(rng, 4, bounded=seed % 2 == 0)
+    n = 40
+    trace = random_trace(rng, n)
+    states = _states(trace, n)
+    evaluator = IncrementalEvaluator(expr)
+    previous: list[bool] = []
+    start = 0
+    while start < n:
+        if rng.random() < 0.5:
+            stop = start + 1
+            changed = evaluator.append(states[start])
+        else:
+            stop = min(n, start + rng.choice([2, 5, 13]))
+            changed = evaluator.extend({atom: column[start:stop] for atom, column in trace.items()})
+        expected = evaluate(expr, {atom: column[:stop] for atom, column in trace.items()}).tolist()
+        assert len(evaluator) == stop
+        assert evaluator.values.tolist() == expected, str(expr)
+        differs = [i for i in range(start) if previous[i] != expected[i]]
+        assert changed == (differs[0] if differs else start)
+        # No continuation of the trace changes the settled steps.
+        settled = evaluator.settled
+        if not math.isinf(expr.horizon()):
+            assert settled >= stop - expr.horizon()
+        for extra in (1, 4):
+            continuation = random_trace(rng, extra)
+            full = {atom: trace[atom][:stop] + continuation[atom] for atom in LTL_ATOMS}
+            assert evaluate(expr, full).tolist()[:settled] == expected[:settled]
+        previous, start = expected, stop
+
+
+def test_incremental_examples() -> None:
+    evaluator = IncrementalEvaluator(logic_asts.parse_expr("G (req -> F grant)", syntax="ltl"))
+    assert evaluator.extend({"req": [False, True, False], "grant": [False, False, False]}) == 0
+    assert evaluator.values.tolist() == [False, False, True]
+    assert evaluator.settled == 0
+    assert evaluator.append({"grant"}) == 0
+    assert evaluator.values.tolist() == [True, True, True, True]
+    assert evaluator.append({"req"}) == 0
+    assert evaluator.values.tolist() == [False, False, False, False, False]
+    assert evaluator.settled == 0
+    assert evaluator.append(set()) == 5
+
+    evaluator = IncrementalEvaluator(logic_asts.parse_expr("p U q", syntax="ltl"))
+    assert evaluator.extend({"p": [True, True, False, True]}) == 0
+    assert evaluator.settled == 3
+    assert evaluator.append({"q"}) == 3
+    assert evaluator.values.tolist() == [False, False, False, True, True]
+    assert evaluator.settled == 5
+
+
+def test_incremental_long_trace() -> None:
+    expr = logic_asts.parse_expr("G (req -> F[0, 20] grant) & (!err U (err & X[!] reset))", syntax="ltl")
+    rng = np.random.default_rng(0)
+    n, chunk = 50_000, 997
+    trace = {"req": rng.random(n) < 0.05, "grant": rng.random(n) < 0.2, "err": rng.random(n) < 0.001}
+    trace["reset"] = rng.random(n) < 0.5
+    evaluator = IncrementalEvaluator(expr)
+    for start in range(0, n, chunk):
+        _ = evaluator.extend({atom: column[start : start + chunk] for atom, column in trace.items()})
+    assert (evaluator.values == evaluate(expr, trace)).all()
+
+
+def test_incremental_inputs_and_errors() -> None:
+    evaluator = IncrementalEvaluator(Until(Variable("a"), Variable("b"), TimeInterval(0, 2)))
+    assert len(evaluator) == 0 and evaluator.values.shape == (0,)
+    assert evaluator.extend(np.array([[True, False], [True, False]]), index=["a", "b"]) == 0
+    assert evaluator.extend({"z": [True]}) == 2
+    assert evaluator.values.tolist() == [False, False, False]
+    with pytest.raises(ValueError):
+        evaluator.values[0] = True
+    with pytest.raises(TypeError):
+        _ = evaluator.extend(np.zeros((2, 2), dtype=bool))
+    with pytest.raises(TypeError):
+        _ = IncrementalEvaluator(logic_asts.parse_expr("{a ; b}", syntax="sere"))  # type: ignore[arg-type]
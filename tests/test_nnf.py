@@ -0,0 +1,120 @@
+"""Tests for the on-demand, shared NNF conversion and the extended NNF."""
+
+from __future__ import annotations
+
+import itertools
+from collections.abc import Callable
+
+import pytest
+
+import logic_asts
+from logic_asts.base import And, BaseExpr, Equiv, Literal, Not, Or, Variable, Xor, simple_eval
+from logic_asts.ltl import Next, StrongNext
+from logic_asts.spec import Expr, fold
+
+p, q, r = Variable("p"), Variable("q"), Variable("r")
+
+
+def _nested_equiv(depth: int) -> BaseExpr[str]:
+    expr: BaseExpr[str] = Variable("x0")
+    for i in range(1, depth + 1):
+        expr = (Equiv if i % 2 else Xor)(Not(expr), Variable(f"x{i}"))
+    return expr
+
+
+def _tree_size(expr: Expr) -> int:
+    return fold(expr, lambda _, sizes: 1 + sum(sizes))
+
+
+def _is_nnf(expr: Expr, *, extended: bool = False) -> bool:
+    allowed = (And, Or, Variable, Literal, Not) + ((Equiv, Xor) if extended else ())
+    return all(
+        isinstance(node, allowed) and (not isinstance(node, Not) or isinstance(node.arg, (Variable, Literal)))
+        for node in expr.iter_subtree()
+    )
+
+
+def test_only_needed_polarities_are_built(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: list[tuple[type[Expr], bool]] = []
+
+    def counting(rule: Callable[..., Expr]) -> Callable[..., Expr]:
+        def counted(self: Expr, pos: tuple[Expr, ...], neg: tuple[Expr, ...], *, negate: bool) -> Expr:
+            calls.append((type(self), negate))
+            return rule(self, pos, neg, negate=negate)
+
+        return counted
+
+    for cls in (Next, StrongNext):
+        monkeypatch.setattr(cls, "_nnf_node", counting(cls._nnf_node))
+
+    depth = 50
+    expr: Expr = p
+    for _ in range(depth):
+        expr = Next(Not(expr))
+    nnf = expr.to_nnf()
+    # Each ``Next`` is reached in a single polarity, alternating down the
+    # chain; the rules run innermost first.
+    assert calls == [(Next, (depth - 1 - i) % 2 == 1) for i in range(depth)]
+    assert isinstance(nnf, Next)
+
+
+def test_equal_results_are_shared() -> None:
+    expr = logic_asts.parse_expr("X (a & !b) | !(!a | b) | X !(!a | b)", syntax="ltl")
+    a_not_b = And((Variable("a"), Not(Variable("b"))))
+    nnf = expr.to_nnf()
+    assert nnf == Or((Next(a_not_b), a_not_b, Next(a_not_b)))
+    assert isinstance(nnf, Or)
+    first, second, third = nnf.args
+    assert first is third
+    assert isinstance(first, Next)
+    assert first.arg is second
+    nodes = list(nnf.iter_subtree())
+    assert len({id(node) for node in nodes}) == len(set(nodes))
+
+
+def test_negated_dag_is_linear() -> None:
+    expr: Expr = p
+    for _ in range(100):
+        expr = And((Or((expr, q)), Not(expr)))
+    for negate in (False, True):
+        nnf = expr.to_nnf(negate=negate)
+        assert _is_nnf(nnf)
+        assert len({id(node) for node in nnf.iter_subtree()}) < 10 * 100
+
+
+@pytest.mark.parametrize("negate", [False, True])
+def test_extended_nnf_keeps_equiv_and_xor(negate: bool) -> None:
+    depth = 6
+    expr = _nested_equiv(depth)
+    plain = expr.to_nnf(negate=negate)
+    extended = expr.to_nnf(negate=negate, extended=True)
+    assert _is_nnf(plain)
+    assert _is_nnf(extended, extended=True)
+    assert sum(isinstance(node, (Equiv, Xor)) for node in extended.iter_subtree()) == depth
+    atoms = [f"x{i}" for i in range(depth + 1)]
+    for bits in itertools.product((False, True), repeat=len(atoms)):
+        world = {name for name, bit in zip(atoms, bits) if bit}
+        expected = simple_eval(expr, world) != negate
+        assert simple_eval(plain, world) == expected
+        assert simple_eval(extended, world) == expected
+
+
+def test_extended_nnf_dualizes_connectives() -> None:
+    def extended(expr: Expr, *, negate: bool = False, expand: bool = True) -> Expr:
+        return expr.to_nnf(negate=negate, expand=expand, extended=True)
+
+    assert extended(Not(Equiv(p, q))) == Xor(p, q)
+    assert extended(Not(Xor(p, q))) == Equiv(p, q)
+    assert extended(Equiv(p, q), negate=True) == Xor(p, q)
+    assert extended(Equiv(Not(And((p, q))), r)) == Equiv(Or((Not(p), Not(q))), r)
+    assert extended(Xor(p, Not(Not(q))), negate=True, expand=False) == Equiv(p, q)
+
+
+def test_extended_nnf_size_is_linear() -> None:
+    depth = 40
+    expr = _nested_equiv(depth)
+    assert _tree_size(expr.to_nnf(extended=True)) <= 3 * _tree_size(expr)
+    # The plain NNF is small as a DAG, but its tree doubles at every level.
+    plain = expr.to_nnf()
+    assert len({id(node) for node in plain.iter_subtree()}) < 10 * depth
+    assert _tree_size(plain) > 2**depth
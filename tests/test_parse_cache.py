@@ -0,0 +1,130 @@
+"""Tests for the opt-in LRU parse cache."""
+
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from lark.exceptions import LarkError
+
+import logic_asts
+from logic_asts import ParseCache, disable_parse_cache, enable_parse_cache, get_parse_cache
+from logic_asts.grammars import SupportedGrammars
+from logic_asts.parsing import ParseCacheInfo
+
+
+@pytest.fixture(autouse=True)
+def _no_global_cache() -> Iterator[None]:
+    disable_parse_cache()
+    yield
+    disable_parse_cache()
+
+
+def test_hits_misses_and_evictions() -> None:
+    cache = ParseCache(maxsize=2)
+    a = cache.parse("a & b")
+    assert cache.parse("a & b") is a
+    _ = cache.parse("a & b", syntax="ltl")  # keyed by grammar too
+    assert cache.info() == ParseCacheInfo(hits=1, misses=2, evictions=0, maxsize=2, currsize=2)
+
+    _ = cache.parse("a & b")  # refresh, so the LTL entry is the least recently used
+    _ = cache.parse("c")
+    assert cache.info() == ParseCacheInfo(hits=2, misses=3, evictions=1, maxsize=2, currsize=2)
+    assert cache.parse("a & b") is a
+    _ = cache.parse("a & b", syntax=SupportedGrammars.LTL)
+    assert cache.info().misses == 4
+
+    cache.clear()
+    assert cache.info() == ParseCacheInfo(0, 0, 0, 2, 0)
+
+
+def test_failures_are_not_cached() -> None:
+    cache = ParseCache()
+    for _ in range(2):
+        with pytest.raises(LarkError):
+            _ = cache.parse("a &")
+    assert cache.info().currsize == 0
+
+
+def test_invalid_maxsize() -> None:
+    with pytest.raises(ValueError):
+        _ = ParseCache(maxsize=0)
+
+
+def test_enable_routes_parse_expr() -> None:
+    assert get_parse_cache() is None
+    assert logic_asts.parse_expr("G p", syntax="ltl") is not logic_asts.parse_expr("G p", syntax="ltl")
+
+    cache = enable_parse_cache(maxsize=8)
+    assert get_parse_cache() is cache
+    first = logic_asts.parse_expr("G p", syntax="ltl")
+    assert logic_asts.parse_expr("G p", syntax="ltl") is first
+    assert cache.info().hits == 1
+
+    disable_parse_cache()
+    assert get_parse_cache() is None
+    assert logic_asts.parse_expr("G p", syntax="ltl") is not first
+
+
+def test_persistence_roundtrip(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    with ParseCache(maxsize=3, path=path) as cache:
+        for text in ["a", "b & c", "G (p -> F q)", "d | e"]:
+            _ = cache.parse(text, syntax="ltl")
+        _ = cache.parse("b & c", syntax="ltl")
+        expected = {key: ast for key, ast in cache._entries.items()}
+
+    reloaded = ParseCache(maxsize=3, path=path)
+    assert reloaded._entries == expected
+    assert list(reloaded._entries) == list(expected)  # LRU order survives
+    assert reloaded.info() == ParseCacheInfo(0, 0, 0, 3, 3)
+    _ = reloaded.parse("G (p -> F q)", syntax="ltl")
+    assert reloaded.info().hits == 1
+
+    # A smaller cache keeps only the most recently used entries.
+    assert list(ParseCache(maxsize=1, path=path)._entries) == [("b & c", SupportedGrammars.LTL)]
+
+
+def test_persisted_entries_from_other_versions_are_ignored(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    with ParseCache(path=path) as cache:
+        _ = cache.parse("a & b")
+    with sqlite3.connect(path) as db:
+        _ = db.execute("UPDATE meta SET value = 'stale' WHERE key = 'digest'")
+    assert ParseCache(path=path).info().currsize == 0
+
+
+def test_unreadable_files_are_cold_caches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "cache.sqlite"
+    _ = path.write_bytes(b"not a database, " * 64)
+    assert ParseCache(path=path).info().currsize == 0
+
+    # Loading closes its connection, whether or not the file held entries.
+    path = tmp_path / "other.sqlite"
+    with ParseCache(path=path) as cache:
+        _ = cache.parse("a & b")
+    connections: list[sqlite3.Connection] = []
+    connect = sqlite3.connect
+
+    def tracked(database: str | Path) -> sqlite3.Connection:
+        connections.append(connect(database))
+        return connections[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", tracked)
+    assert ParseCache(path=path).info().currsize == 1
+    assert ParseCache(path=tmp_path / "new.sqlite").info().currsize == 0
+    assert len(connections) == 2
+    for db in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            _ = db.execute("SELECT 1")
+
+
+def test_enable_with_path_persists_on_disable(tmp_path: Path) -> None:
+    path = tmp_path / "cache.sqlite"
+    _ = enable_parse_cache(path=path)
+    _ = logic_asts.parse_expr("x -> y")
+    disable_parse_cache()
+    assert ParseCache(path=path).parse("x -> y") == logic_asts.parse_expr("x -> y")
+    assert ParseCache(path=path).info().currsize == 1
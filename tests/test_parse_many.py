@@ -0,0 +1,85 @@
+"""Tests for batch and parallel parsing with ``parse_many``."""
+
+from __future__ import annotations
+
+import itertools
+import pickle
+
+import pytest
+
+import logic_asts
+from logic_asts import ParseError, parse_many
+from logic_asts.base import Variable
+
+_LTL_INPUTS = [
+    "G (req -> F grant)",
+    "a U",
+    "X[3!] p & q W r",
+    "G[5,2] p",
+    "",
+    "F[0,10] (p | !q)",
+]
+
+
+def test_serial_matches_parse_expr() -> None:
+    results = list(parse_many(_LTL_INPUTS, syntax="ltl", chunksize=2))
+    assert [r.index for r in results] == list(range(len(_LTL_INPUTS)))
+    assert [r.text for r in results] == _LTL_INPUTS
+    assert [r.ok for r in results] == [True, False, True, False, False, True]
+    for r in results:
+        if r.ok:
+            assert r.expr == logic_asts.parse_expr(r.text, syntax="ltl")
+            assert r.unwrap() is r.expr
+        else:
+            assert r.expr is None
+            with pytest.raises(ParseError):
+                _ = r.unwrap()
+
+
+def test_errors_are_summarized() -> None:
+    syntax_error, build_error = (r.error for r in parse_many(["a U", "G[5,2] p"], syntax="ltl"))
+    assert syntax_error is not None and build_error is not None
+    assert syntax_error.kind == "UnexpectedToken"
+    # Errors raised by the node constructors are unwrapped from lark's VisitError.
+    assert build_error.kind == "ValueError"
+    assert "a > b" in str(build_error)
+
+    column_error = next(parse_many(["a $ b"])).error
+    assert column_error is not None
+    assert (column_error.line, column_error.column) == (1, 3)
+
+    copy = pickle.loads(pickle.dumps(column_error))
+    assert (str(copy), copy.kind, copy.line, copy.column) == (str(column_error), "UnexpectedCharacters", 1, 3)
+
+
+def test_input_is_consumed_lazily() -> None:
+    """An unbounded input stream can be consumed piecewise."""
+    stream = (f"x{i} & y{i}" for i in itertools.count())
+    first = list(itertools.islice(parse_many(stream, chunksize=3), 5))
+    assert [r.expr for r in first] == [Variable(f"x{i}") & Variable(f"y{i}") for i in range(5)]
+    # Only the chunks needed for the first five results have been read.
+    assert next(stream) == "x6 & y6"
+
+
+@pytest.mark.parametrize("chunksize", [1, 4, 1000])
+def test_process_pool_matches_serial(chunksize: int) -> None:
+    inputs = [text for _ in range(5) for text in _LTL_INPUTS]
+    serial = list(parse_many(inputs, syntax="ltl"))
+    parallel = list(parse_many(inputs, syntax="ltl", workers=2, chunksize=chunksize))
+    assert [(r.index, r.text, r.expr) for r in parallel] == [(r.index, r.text, r.expr) for r in serial]
+    assert [(r.error and (r.error.kind, str(r.error))) for r in parallel] == [
+        (r.error and (r.error.kind, str(r.error))) for r in serial
+    ]
+
+
+def test_process_pool_early_close() -> None:
+    """Closing the generator before the input is exhausted shuts the pool down."""
+    results = parse_many((f"p{i}" for i in itertools.count()), workers=2, chunksize=8)
+    assert next(results).expr == Variable("p0")
+    results.close()
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 0}, {"chunksize": 0}, {"syntax": "nope"}])
+def test_invalid_arguments(kwargs: dict[str, object]) -> None:
+    with pytest.raises(ValueError):
+        _ = parse_many(["a"], **kwargs)  # type: ignore[arg-type]
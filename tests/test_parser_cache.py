@@ -0,0 +1,161 @@
+"""Tests for the process-wide compiled-parser registry and pre-generated LALR tables."""
+
+from __future__ import annotations
+
+import inspect
+import pickle
+import shutil
+import threading
+from pathlib import Path
+
+import pytest
+from lark import Lark
+from lark.exceptions import VisitError
+
+import logic_asts
+from logic_asts.base import Variable
+from logic_asts.grammars import SupportedGrammars, _tables, clear_parser_cache, get_parser
+
+# One representative input per grammar, exercising its grammar-specific rules.
+_SAMPLES: dict[SupportedGrammars, str] = {
+    SupportedGrammars.BASE: "(a & !b) | c -> d <-> e ^ TRUE",
+    SupportedGrammars.LTL: "G[0,5!] (req -> F grant) & X[3!] p U[1,4] q & a W b & X[2] c",
+    SupportedGrammars.STREL: "G everywhere^hops[0,5] !obstacle & a reach[0,2] b",
+    SupportedGrammars.STL_GO: "in^[0,1]{E}_{c,s}[1,3] consensus & F out^[-inf,inf]{A}_{m}[1,2] x",
+    SupportedGrammars.SERE: "first_match(~a) ; b[->3] : c[*1..2] && d[=2] | e[+]",
+    SupportedGrammars.PSL: "{a;b[*]}[]-> F c & {d}! & G {e}<>=> f",
+}
+
+
+@pytest.mark.parametrize("syntax", list(SupportedGrammars))
+def test_get_parser_is_cached(syntax: SupportedGrammars) -> None:
+    """The same parser instance is returned for the enum and its string value."""
+    parser = get_parser(syntax)
+    assert isinstance(parser, Lark)
+    assert get_parser(syntax) is parser
+    assert get_parser(str(syntax.value)) is parser
+
+
+def test_clear_parser_cache_rebuilds() -> None:
+    """After clearing, a fresh parser is built and parsing still works."""
+    before = get_parser("ltl")
+    clear_parser_cache()
+    after = get_parser("ltl")
+    assert after is not before
+    assert logic_asts.parse_expr("G p", syntax="ltl") == logic_asts.ltl.Always(Variable("p"))
+
+
+def test_unknown_grammar_raises() -> None:
+    with pytest.raises(ValueError):
+        get_parser("not-a-grammar")
+
+
+def test_concurrent_first_use_builds_once() -> None:
+    """Racing threads on a cold cache all observe the same parser instance."""
+    clear_parser_cache()
+    barrier = threading.Barrier(8)
+    seen: list[Lark] = []
+
+    def worker() -> None:
+        barrier.wait()
+        seen.append(get_parser(SupportedGrammars.BASE))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(seen) == 8
+    assert all(p is seen[0] for p in seen)
+
+
+def test_top_level_reexports() -> None:
+    assert logic_asts.get_parser is get_parser
+    assert logic_asts.clear_parser_cache is clear_parser_cache
+
+
+@pytest.mark.parametrize("syntax", list(SupportedGrammars))
+def test_inline_transform_matches_tree_transform(syntax: SupportedGrammars) -> None:
+    """Running the transformer inside the LALR parser builds the same AST as transforming the tree."""
+    tree = get_parser(syntax).parse(_SAMPLES[syntax])
+    expected = syntax.get_transformer().transform(tree)
+    inline = get_parser(syntax, inline_transform=True).parse(_SAMPLES[syntax])
+    assert inline == expected
+    assert logic_asts.parse_expr(_SAMPLES[syntax], syntax=syntax) == expected  # type: ignore[call-overload]
+
+
+def test_inline_transform_wraps_errors() -> None:
+    """Errors raised while building nodes surface as ``VisitError`` in both parse modes."""
+    tree = get_parser("ltl").parse("G[5,2] p")
+    with pytest.raises(VisitError):
+        _ = SupportedGrammars.LTL.get_transformer().transform(tree)
+    with pytest.raises(VisitError):
+        _ = get_parser("ltl", inline_transform=True).parse("G[5,2] p")
+
+
+@pytest.mark.parametrize("syntax", list(SupportedGrammars))
+def test_tables_match_compiled_parser(syntax: SupportedGrammars, tmp_path: Path) -> None:
+    """Tables generated from the current sources load and parse exactly like a compiled parser."""
+    name = str(syntax.value)
+    _ = _tables.build_tables([name], dest=tmp_path)
+    loaded = _tables.load_tables(name, directory=tmp_path)
+    assert loaded is not None
+    compiled = _tables.compile_grammar(name)
+    assert loaded.parse(_SAMPLES[syntax]) == compiled.parse(_SAMPLES[syntax])
+
+
+def test_stale_tables_are_rejected(tmp_path: Path) -> None:
+    """Editing any grammar source invalidates previously generated tables."""
+    grammars = tmp_path / "grammars"
+    _ = shutil.copytree(_tables.GRAMMARS_DIR, grammars, ignore=shutil.ignore_patterns("*.py", "*.lalr", "__pycache__"))
+    _ = _tables.build_tables(["base"], grammars_dir=grammars)
+    assert _tables.load_tables("base", grammars_dir=grammars) is not None
+
+    with (grammars / "base.lark").open("a") as f:
+        _ = f.write("\n// edited\n")
+    _tables.sources_digest.cache_clear()
+    try:
+        assert _tables.load_tables("base", grammars_dir=grammars) is None
+    finally:
+        _tables.sources_digest.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        pytest.param(b"\x80", id="truncated"),
+        pytest.param(pickle.dumps({"data": None}), id="wrong-shape"),
+    ],
+)
+def test_malformed_tables_fall_back(content: bytes, tmp_path: Path) -> None:
+    path = _tables.tables_path("ltl", tmp_path)
+    _ = path.write_bytes(_tables.sources_digest().encode() + b"\n" + content)
+    assert _tables.load_tables("ltl", directory=tmp_path) is None
+    _ = path.write_bytes(b"\xff\xfe not a digest\n" + content)
+    assert _tables.load_tables("ltl", directory=tmp_path) is None
+
+
+def test_private_lark_load_api(tmp_path: Path) -> None:
+    """``load_tables`` relies on ``Lark._load(f, transformer=...)``, which is not public lark API.
+
+    ``load_tables`` falls back to compiling on any error, so this fails loudly
+    instead if a lark release changes it.
+    """
+    parameters = inspect.signature(Lark._load).parameters
+    assert "f" in parameters
+    assert "transformer" in parameters or any(p.kind is p.VAR_KEYWORD for p in parameters.values())
+    _ = _tables.build_tables(["base"], dest=tmp_path)
+    loaded = _tables.load_tables("base", directory=tmp_path, transformer=SupportedGrammars.BASE.get_transformer())
+    assert loaded is not None
+    assert loaded.parse("a") == Variable("a")
+
+
+@pytest.mark.parametrize("syntax", list(SupportedGrammars))
+def test_shipped_tables_are_current(syntax: SupportedGrammars) -> None:
+    """Any tables present in the package must have been generated from the current sources."""
+    path = _tables.tables_path(str(syntax.value))
+    if not path.exists():
+        pytest.skip("no pre-generated tables in this checkout")
+    with path.open("rb") as f:
+        assert f.readline().rstrip(b"\n").decode() == _tables.sources_digest(), "stale LALR tables; run `just tables`"
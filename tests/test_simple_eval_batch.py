@@ -0,0 +1,102 @@
+"""Tests for the NumPy-vectorized ``simple_eval_batch``."""
+
+from __future__ import annotations
+
+import itertools
+import random
+from typing import TYPE_CHECKING
+
+import pytest
+
+import logic_asts
+from logic_asts.base import And, BaseExpr, Not, Or, Variable, simple_eval, simple_eval_batch
+from tests._formulas import ATOMS, random_bool_formula
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+else:
+    np = pytest.importorskip("numpy")
+
+
+def _all_rows() -> NDArray[np.bool_]:
+    return np.array(list(itertools.product((False, True), repeat=len(ATOMS))), dtype=bool)
+
+
+def _expected(expr: BaseExpr[str], rows: NDArray[np.bool_]) -> list[bool]:
+    return [simple_eval(expr, {atom for atom, bit in zip(ATOMS, row) if bit}) for row in rows]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_simple_eval(seed: int) -> None:
+    expr = random_bool_formula(random.Random(seed), 5)
+    rows = _all_rows()
+    expected = _expected(expr, rows)
+    by_name = {atom: rows[:, i] for i, atom in enumerate(ATOMS)}
+    by_position = {atom: i for i, atom in enumerate(ATOMS)}
+
+    assert simple_eval_batch(expr, rows, index=ATOMS).tolist() == expected
+    assert simple_eval_batch(expr, rows, index=by_position).tolist() == expected
+    assert simple_eval_batch(expr, by_name).tolist() == expected
+    for chunk_size in (1, 3, len(rows), 2 * len(rows)):
+        assert simple_eval_batch(expr, by_name, chunk_size=chunk_size).tolist() == expected
+
+
+def test_result_dtype_and_inputs() -> None:
+    expr = logic_asts.parse_expr("a -> b")
+    columns = {"a": [1, 1, 0], "b": [0, 1, 0]}
+    result = simple_eval_batch(expr, columns)
+    assert result.dtype == np.bool_
+    assert result.tolist() == [False, True, True]
+    # The inputs are never written to.
+    a = np.array([True, False])
+    assert simple_eval_batch(Variable("a"), {"a": a}) is not a
+    assert simple_eval_batch(Not(Variable("a")), {"a": a}).tolist() == [False, True]
+    assert a.tolist() == [True, False]
+
+
+def test_missing_atoms_are_false() -> None:
+    expr = Or((Variable("a"), Variable("z")))
+    assert simple_eval_batch(expr, {"a": [True, False]}).tolist() == [True, False]
+    assert simple_eval_batch(Not(Variable("z")), np.zeros((3, 1)), index=["a"]).tolist() == [True] * 3
+
+
+def test_empty_batch() -> None:
+    result = simple_eval_batch(Variable("a"), np.zeros((0, 2), dtype=bool), index=["a", "b"], chunk_size=4)
+    assert result.shape == (0,)
+
+
+def test_shared_subformulas_are_evaluated_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+    logical_not = np.logical_not
+
+    def counting(x: NDArray[np.bool_]) -> NDArray[np.bool_]:
+        nonlocal calls
+        calls += 1
+        return logical_not(x)
+
+    monkeypatch.setattr(np, "logical_not", counting)
+    shared = Not(Variable("a"))
+    expr: BaseExpr[str] = And((Not(Variable("a")), Or((shared, Variable("b")))))
+    assert simple_eval_batch(expr, {"a": [False, True], "b": [True, True]}).tolist() == [True, False]
+    assert calls == 1
+
+
+def test_errors() -> None:
+    expr = logic_asts.parse_expr("a & b")
+    with pytest.raises(TypeError):
+        _ = simple_eval_batch(expr, np.zeros((2, 2)))
+    with pytest.raises(TypeError):
+        _ = simple_eval_batch(expr, {"a": [True]}, index=["a"])
+    with pytest.raises(ValueError, match="empty"):
+        _ = simple_eval_batch(expr, {})
+    with pytest.raises(ValueError, match="1-D"):
+        _ = simple_eval_batch(expr, {"a": [True], "b": [True, False]})
+    with pytest.raises(ValueError, match="2-D"):
+        _ = simple_eval_batch(expr, np.zeros(3), index=["a"])
+    with pytest.raises(ValueError, match="out of range"):
+        _ = simple_eval_batch(expr, np.zeros((2, 2)), index={"a": 0, "b": 2})
+    with pytest.raises(ValueError, match="chunk_size"):
+        _ = simple_eval_batch(expr, {"a": [True]}, chunk_size=0)
+    with pytest.raises(TypeError, match="propositional"):
+        _ = simple_eval_batch(logic_asts.parse_expr("X a", syntax="ltl"), {"a": [True]})  # type: ignore[arg-type]
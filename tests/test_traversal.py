@@ -0,0 +1,77 @@
+"""Tests for the traversal orders of ``ExprVisitor`` / ``Expr.iter_subtree``."""
+
+from __future__ import annotations
+
+import sys
+from typing import Any
+
+import pytest
+
+from logic_asts.base import And, Not, Or, Variable, bool_expr_iter
+from logic_asts.ltl import Eventually, Next
+from logic_asts.spec import Expr, ExprVisitor
+
+p, q, r = Variable("p"), Variable("q"), Variable("r")
+left = And((p, q))
+right = Or((q, Not(r)))
+tree = Or((left, right))
+
+
+def test_post_order_is_deterministic() -> None:
+    assert list(tree.iter_subtree()) == [p, q, left, r, Not(r), right, tree]
+
+
+def test_pre_order() -> None:
+    assert list(tree.iter_subtree(order="pre")) == [tree, left, p, q, right, Not(r), r]
+
+
+def test_breadth_first() -> None:
+    assert list(tree.iter_subtree(order="bfs")) == [tree, left, right, p, q, Not(r), r]
+
+
+def test_unknown_order() -> None:
+    with pytest.raises(ValueError, match="traversal order"):
+        _ = ExprVisitor(Expr, tree, order="in")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("order", ["post", "pre", "bfs"])
+def test_shared_nodes_are_visited_once(order: str) -> None:
+    """A ladder where every level uses the previous one twice has 2**n paths but n + 1 nodes."""
+    node: Expr = p
+    for _ in range(200):
+        node = And((node, node))
+    nodes = list(node.iter_subtree(order=order))  # type: ignore[call-overload]
+    assert len(nodes) == 201
+    assert len({id(n) for n in nodes}) == 201
+
+
+def test_equal_but_distinct_nodes_are_all_visited() -> None:
+    """Bookkeeping is by identity: equal subtrees that are separate objects are separate nodes."""
+    expr = And((Variable("p"), Variable("p")))
+    assert len(list(expr.iter_subtree())) == 3
+
+
+@pytest.mark.parametrize("order", ["post", "pre", "bfs"])
+def test_deep_tree_does_not_recurse(order: str) -> None:
+    depth = 5 * sys.getrecursionlimit()
+    node: Expr = p
+    for _ in range(depth):
+        node = Next(node)
+    nodes = list(node.iter_subtree(order=order))  # type: ignore[call-overload]
+    assert len(nodes) == depth + 1
+    assert (nodes[-1] if order == "post" else nodes[0]) is node
+
+
+def test_atomic_predicates_order() -> None:
+    expr = Or((And((q, Not(p))), Eventually(And((r, p)))))
+    assert list(expr.atomic_predicates()) == [q, p, r]
+    assert list(expr.atomic_predicates(assume_nnf=True)) == [q, Not(p), r, p]
+    # Equal atoms that are separate objects are yielded once.
+    expr = Or((And((Variable("p"), Variable("q"))), And((Variable("p"), Variable("q"))), Variable("p")))
+    assert list(expr.atomic_predicates()) == [p, q]
+
+
+def test_type_check_on_children() -> None:
+    mixed: Any = p & Next(q)
+    with pytest.raises(TypeError, match="Next"):
+        _ = list(bool_expr_iter(mixed))
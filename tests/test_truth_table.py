@@ -0,0 +1,104 @@
+"""Tests for the bit-parallel truth tables and the helpers built on them."""
+
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+import logic_asts
+from logic_asts.base import (
+    And,
+    BaseExpr,
+    Equiv,
+    Implies,
+    Literal,
+    Not,
+    Or,
+    Variable,
+    Xor,
+    count_models,
+    equivalent,
+    is_tautology,
+    simple_eval,
+    truth_table,
+)
+from tests._formulas import ATOMS, random_bool_formula
+
+
+def _brute_force(expr: BaseExpr[str], atoms: list[str]) -> list[bool]:
+    return [simple_eval(expr, {atom for j, atom in enumerate(atoms) if i >> j & 1}) for i in range(1 << len(atoms))]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_matches_simple_eval(seed: int) -> None:
+    expr = random_bool_formula(random.Random(seed), 6)
+    expected = _brute_force(expr, ATOMS)
+    table = truth_table(expr, ATOMS)
+    assert [bool(table >> i & 1) for i in range(1 << len(ATOMS))] == expected
+    assert table >> (1 << len(ATOMS)) == 0
+    assert count_models(expr, ATOMS) == sum(expected)
+    assert is_tautology(expr) == all(expected)
+
+
+def test_default_atoms() -> None:
+    expr = logic_asts.parse_expr("b & !a")
+    # ``b`` is the first atom, so it is the lowest bit of the row index.
+    assert truth_table(expr) == 0b0010
+    assert truth_table(expr, ["a", "b"]) == 0b0100
+    assert count_models(expr) == 1
+    assert count_models(expr, ["a", "b", "c"]) == 2
+    # Atoms that are not listed are false.
+    assert truth_table(expr, ["b"]) == 0b10
+
+
+def test_literals_and_no_atoms() -> None:
+    assert truth_table(Literal(True)) == 1
+    assert truth_table(Literal(False)) == 0
+    assert truth_table(Literal(True), ["a", "b"]) == 0b1111
+    assert is_tautology(Literal(True))
+    assert not is_tautology(Literal(False))
+    assert count_models(Or((Variable("a"), Literal(True)))) == 2
+
+
+def test_tautologies_and_equivalences() -> None:
+    p, q, r = Variable("p"), Variable("q"), Variable("r")
+    assert is_tautology(Or((p, Not(p))))
+    assert is_tautology(Implies(And((Implies(p, q), Implies(q, r))), Implies(p, r)))
+    assert not is_tautology(Implies(p, q))
+    assert equivalent(Not(And((p, q))), Or((Not(p), Not(q))))
+    assert equivalent(Xor(p, q), Not(Equiv(p, q)))
+    assert equivalent(Or((p, And((p, q)))), p)
+    assert not equivalent(p, q)
+    assert not equivalent(Implies(p, q), Implies(q, p))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_nnf_is_equivalent(seed: int) -> None:
+    expr = random_bool_formula(random.Random(seed), 7)
+    assert equivalent(expr, expr.to_nnf())
+    assert equivalent(Not(expr), expr.to_nnf(negate=True))
+
+
+def test_many_atoms() -> None:
+    atoms = [f"x{i}" for i in range(20)]
+    variables = [Variable(atom) for atom in atoms]
+    parity: BaseExpr[str] = variables[0]
+    for var in variables[1:]:
+        parity = Xor(parity, var)
+    assert count_models(parity) == 1 << 19
+    clause: BaseExpr[str] = Or(tuple(variables))
+    assert count_models(clause) == (1 << 20) - 1
+    assert not is_tautology(clause)
+    assert is_tautology(Or((clause, *(Not(var) for var in variables))))
+    assert count_models(And((Variable("x0"), Variable("x1"))), atoms) == 1 << 18
+
+
+def test_limits_and_errors() -> None:
+    with pytest.raises(ValueError, match="30 atoms"):
+        _ = truth_table(Variable("a"), [f"x{i}" for i in range(31)])
+    with pytest.raises(TypeError):
+        _ = truth_table(logic_asts.parse_expr("a & X b", syntax="ltl"))  # type: ignore[arg-type]
+    for atoms in itertools.permutations(["a", "b", "c"]):
+        assert count_models(logic_asts.parse_expr("a -> b"), atoms) == 6